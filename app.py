@@ -0,0 +1,73 @@
+"""Aplikasi Pabrik Kerupuk DHN: satu entry untuk admin dan sales.
+
+    streamlit run app.py
+
+Isi tiap menu ada di dhn/halaman/ dan baru diimpor ketika menu dipilih.
+Akun awal bisa dibuat dengan: python -m dhn.auth buat-user NAMA [--admin]
+"""
+import io
+import os
+
+import streamlit as st
+
+from dhn import db, halaman, kinerja
+
+COVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Cover.jpg")
+LEBAR_COVER = 2 * 730  # lebar maksimum gambar di Streamlit
+
+
+@st.cache_resource
+def cover():
+    """Cover yang sudah diperkecil sekali per proses.
+
+    Gambar yang lebih lebar dari LEBAR_COVER di-decode dan di-resize ulang
+    oleh st.image pada setiap rerun (~50 ms untuk Cover.jpg).
+    """
+    from PIL import Image
+
+    gambar = Image.open(COVER)
+    if gambar.width <= LEBAR_COVER:
+        with open(COVER, "rb") as f:
+            return f.read()
+    gambar = gambar.resize((LEBAR_COVER, gambar.height * LEBAR_COVER // gambar.width), Image.BILINEAR)
+    keluaran = io.BytesIO()
+    gambar.save(keluaran, format="JPEG", quality=90)
+    return keluaran.getvalue()
+
+
+st.set_page_config(page_title="Pabrik Kerupuk DHN", layout="centered")
+if os.path.exists(COVER):
+    st.image(cover(), width="stretch")
+st.title("Pabrik Kerupuk DHN 🍘")
+st.markdown("---")
+
+# Pool dibuat sekali per proses; tabel disiapkan oleh migrasi di dhn.db.
+db.get_pool()
+
+if "logged_in" not in st.session_state:
+    st.session_state.logged_in = False
+    st.session_state.username = ""
+    st.session_state.is_admin = False
+
+if not st.session_state.logged_in:
+    from dhn.halaman import akun
+
+    akun.tampilkan()
+    st.stop()
+
+st.sidebar.markdown(f"**Login sebagai:** {st.session_state.username}")
+if st.sidebar.button("Logout"):
+    st.session_state.logged_in = False
+    st.session_state.username = ""
+    st.session_state.is_admin = False
+    st.rerun()
+
+is_admin = st.session_state.is_admin
+menu = st.sidebar.selectbox("Menu", halaman.daftar_menu(is_admin))
+if is_admin:
+    from dhn import cache
+
+    cache.tampilkan_statistik(db.get_pool().cache)
+
+with kinerja.halaman(menu):
+    halaman.tampilkan(menu, is_admin)
@@ -0,0 +1,116 @@
+"""Uji beban API dhn.api: latensi p50/p99 dan insert/detik.
+
+Tanpa ``--url`` sebuah server lokal dijalankan pada database sementara dan
+user uji dibuat otomatis. Setiap klien memakai satu koneksi keep-alive dan
+mengirim permintaan berturut-turut.
+
+    python benchmarks/bench_api.py --clients 16 --requests 200 --batch 1
+    python benchmarks/bench_api.py --url http://127.0.0.1:8502 --user sopir1 --password ...
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def persentil(data, p):
+    data = sorted(data)
+    return data[min(len(data) - 1, int(len(data) * p / 100))]
+
+
+def klien(host, port, token, jumlah, batch, seed, latensi, gagal):
+    rnd = random.Random(seed)
+    conn = http.client.HTTPConnection(host, port, timeout=60)
+    header = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+    for _ in range(jumlah):
+        rows = []
+        for _ in range(batch):
+            kirim = rnd.randrange(10, 100)
+            rows.append({"warung": f"Warung {rnd.randrange(300)}", "jumlah_kirim": kirim,
+                         "jumlah_terjual": rnd.randrange(kirim + 1), "harga_satuan": 5000})
+        # bytes agar header dan body terkirim dalam satu send().
+        body = json.dumps(rows if batch > 1 else rows[0]).encode()
+        mulai = time.perf_counter()
+        conn.request("POST", "/kirim", body, header)
+        resp = conn.getresponse()
+        resp.read()
+        latensi.append((time.perf_counter() - mulai) * 1000)
+        if resp.status != 201:
+            gagal.append(resp.status)
+    conn.close()
+
+
+def login(host, port, user, password):
+    conn = http.client.HTTPConnection(host, port, timeout=60)
+    conn.request("POST", "/login", json.dumps({"username": user, "password": password}),
+                 {"Content-Type": "application/json"})
+    resp = conn.getresponse()
+    data = json.loads(resp.read())
+    conn.close()
+    if resp.status != 200:
+        sys.exit(f"login gagal: {data}")
+    return data["token"]
+
+
+def jalankan(host, port, args):
+    token = login(host, port, args.user, args.password)
+    latensi, gagal = [], []
+    threads = [threading.Thread(target=klien, args=(host, port, token, args.requests, args.batch,
+                                                     i, latensi, gagal))
+               for i in range(args.clients)]
+    mulai = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    detik = time.perf_counter() - mulai
+
+    baris = (len(latensi) - len(gagal)) * args.batch
+    print(f"{args.clients} klien x {args.requests} permintaan x {args.batch} baris")
+    print(f"latensi  p50 {statistics.median(latensi):7.2f} ms   p99 {persentil(latensi, 99):7.2f} ms"
+          f"   maks {max(latensi):7.2f} ms")
+    print(f"insert   {baris / detik:10,.0f} baris/detik   ({len(latensi) / detik:,.0f} permintaan/detik)")
+    if gagal:
+        print(f"gagal    {len(gagal)} permintaan (status {sorted(set(gagal))})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="server yang sudah berjalan (default: server lokal sementara)")
+    parser.add_argument("--user", default="uji-beban")
+    parser.add_argument("--password", default="uji-beban")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=200, help="permintaan per klien")
+    parser.add_argument("--batch", type=int, default=1, help="baris per permintaan")
+    args = parser.parse_args()
+
+    if args.url:
+        url = urlparse(args.url)
+        jalankan(url.hostname, url.port or 80, args)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["KERUPUK_DB"] = os.path.join(tmp, "kerupuk.db")
+        from dhn import api, auth
+
+        auth.daftar(args.user, args.password, is_admin=False)
+        server = api.Server(("127.0.0.1", 0))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            jalankan("127.0.0.1", server.server_address[1], args)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Laporan tren per warung 5 tahun: SQLite vs arsip Parquet (dhn.arsip).
+
+Database sintetis ``--tahun`` tahun dibuat dengan dhn.sintetis, bulan yang
+sudah lewat diarsipkan, lalu total per (bulan, warung) dihitung dengan:
+
+- SELECT * dari kirim ke pandas lalu groupby (cara halaman lama);
+- GROUP BY di SQLite atas tabel kirim;
+- GROUP BY di SQLite atas rekap_harian;
+- arsip Parquet + bulan berjalan dari SQLite, lewat pyarrow dan DuckDB.
+
+Cache query dikosongkan sebelum setiap ulangan. Semua hasil dicek sama.
+
+    python benchmarks/bench_arsip.py --tahun 5 --warung 300
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SQL_KIRIM = """
+    SELECT substr(tanggal, 1, 7) AS bulan, COALESCE(warung_id, 0) AS warung_id,
+           SUM(jumlah_kirim) AS jumlah_kirim, SUM(jumlah_terjual) AS jumlah_terjual,
+           SUM(jumlah_terjual * harga_satuan) AS pendapatan
+    FROM kirim
+    WHERE tanggal >= ?
+    GROUP BY 1, 2
+"""
+
+
+def ukur(fungsi, ulang, pool):
+    hasil, df = [], None
+    for _ in range(ulang):
+        pool.cache.clear()
+        mulai = time.perf_counter()
+        df = fungsi()
+        hasil.append((time.perf_counter() - mulai) * 1000)
+    return statistics.median(hasil), df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tahun", type=float, default=5)
+    parser.add_argument("--warung", type=int, default=300)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "kerupuk.db")
+        os.environ["KERUPUK_DB"] = path
+        from dhn import arsip, db, sintetis
+
+        print("membuat database sintetis ...")
+        info = sintetis.buat(path, args.users, args.warung, args.tahun)
+        dari, sampai = info["mulai"][:7], date.today().isoformat()[:7]
+        pool = db.get_pool()
+
+        mulai = time.perf_counter()
+        ditulis, _ = arsip.snapshot()
+        detik = time.perf_counter() - mulai
+        ukuran = sum(os.path.getsize(os.path.join(d, f))
+                     for d, _, files in os.walk(arsip.path_arsip(path)) for f in files)
+        print(f"{info['baris']:,} baris kirim, {info['hari']} hari; {len(ditulis)} bulan diarsipkan "
+              f"dalam {detik:.1f} detik ({ukuran / 1e6:.1f} MB Parquet, "
+              f"{os.path.getsize(path) / 1e6:.1f} MB SQLite)")
+
+        def pandas_lama():
+            df = db.read_sql("SELECT * FROM kirim WHERE tanggal >= ?", (info["mulai"],))
+            df["bulan"] = df["tanggal"].str[:7]
+            df["pendapatan"] = df["jumlah_terjual"] * df["harga_satuan"]
+            return df.groupby(["bulan", "warung_id"], as_index=False)[list(arsip.NILAI)].sum()
+
+        cara = {
+            "SELECT * + pandas": pandas_lama,
+            "SQLite GROUP BY kirim": lambda: db.read_sql(SQL_KIRIM, (info["mulai"],)),
+            "SQLite rekap_harian": lambda: arsip.tren_per_warung(dari, sampai, analitik="sqlite"),
+            "arsip pyarrow": lambda: arsip.tren_per_warung(dari, sampai, analitik="pyarrow"),
+        }
+        if arsip.mesin() == "duckdb":
+            cara["arsip DuckDB"] = lambda: arsip.tren_per_warung(dari, sampai, analitik="duckdb")
+
+        acuan = None
+        for nama, fungsi in cara.items():
+            ms, df = ukur(fungsi, args.repeat, pool)
+            df = df.sort_values(["bulan", "warung_id"], ignore_index=True)
+            total = df["pendapatan"].sum()
+            acuan = total if acuan is None else acuan
+            cek = "" if abs(total - acuan) < 1e-6 * abs(acuan) else "  BEDA!"
+            print(f"{nama:<24} {ms:9.1f} ms  {len(df):>7,} baris hasil{cek}")
+
+
+if __name__ == "__main__":
+    main()
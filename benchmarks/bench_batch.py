@@ -0,0 +1,68 @@
+"""Baris/detik simpan pengiriman: satu INSERT + commit per baris vs batch.
+
+Jalur lama menyimpan satu baris per tombol "Simpan" (satu transaksi per
+baris). Jalur batch memakai dhn.pengiriman.simpan_banyak (executemany dalam
+satu transaksi). Jika pandas tersedia, validasi_batch juga diukur.
+
+    python benchmarks/bench_batch.py --rows 100 --rounds 20
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def buat_baris(n, rnd):
+    hasil = []
+    for i in range(n):
+        kirim = rnd.randrange(10, 100)
+        hasil.append((date.today(), f"Warung {i}", kirim, rnd.randrange(kirim + 1), 5000, "sopir1"))
+    return hasil
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100, help="baris per daftar sopir")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["KERUPUK_DB"] = os.path.join(tmp, "kerupuk.db")
+        from dhn import pengiriman
+
+        rnd = random.Random(3)
+        daftar = [buat_baris(args.rows, rnd) for _ in range(args.rounds)]
+        total = args.rows * args.rounds
+
+        mulai = time.perf_counter()
+        for rows in daftar:
+            for row in rows:
+                pengiriman.simpan(*row)
+        lama = total / (time.perf_counter() - mulai)
+
+        mulai = time.perf_counter()
+        for rows in daftar:
+            pengiriman.simpan_banyak(rows)
+        batch = total / (time.perf_counter() - mulai)
+
+        print(f"per baris : {lama:>10,.0f} baris/detik")
+        print(f"batch     : {batch:>10,.0f} baris/detik  ({batch / lama:.1f}x)")
+
+        try:
+            import pandas as pd
+        except ImportError:
+            return
+        df = pd.DataFrame([r[:5] for rows in daftar for r in rows], columns=pengiriman.KOLOM)
+        mulai = time.perf_counter()
+        valid, ditolak = pengiriman.validasi_batch(df)
+        detik = time.perf_counter() - mulai
+        print(f"validasi  : {len(df) / detik:>10,.0f} baris/detik ({len(valid)} valid, {len(ditolak)} ditolak)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Peak RSS ekspor rekap: DataFrame + to_csv().encode() vs dhn.ekspor bertahap.
+
+Setiap mode dijalankan di subprocess sendiri supaya ru_maxrss terpisah.
+
+    python benchmarks/bench_ekspor.py --rows 3000000 --modes lama csv xlsx parquet
+"""
+import argparse
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def isi_data(path, rows):
+    from dhn import db
+
+    pool = db.Pool(path, size=1)
+    rnd = random.Random(5)
+    mulai = date(2020, 1, 1)
+    with pool.transaction() as conn:
+        conn.executemany(
+            "INSERT INTO kirim (tanggal, warung, jumlah_kirim, jumlah_terjual, harga_satuan, user)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            ((mulai + timedelta(days=i * 1800 // rows), f"Warung {rnd.randrange(300)}", 50,
+              rnd.randrange(51), 5000, f"sales{rnd.randrange(30)}") for i in range(rows)))
+    pool.close()
+
+
+def ukur(mode, path):
+    """Dijalankan di subprocess: cetak 'detik peak_rss_mb ukuran_file_mb'."""
+    os.environ["KERUPUK_DB"] = path
+    from dhn import db, ekspor
+
+    mulai = time.perf_counter()
+    if mode == "lama":
+        df = db.read_sql("SELECT * FROM kirim")
+        df["Pendapatan"] = df["jumlah_terjual"] * df["harga_satuan"]
+        data = df.to_csv(index=False).encode()
+        ukuran = len(data)
+    else:
+        format = {"csv": "CSV", "xlsx": "Excel (XLSX)", "parquet": "Parquet"}[mode]
+        hasil = ekspor.buat_file(ekspor.SQL_KIRIM, (), format)
+        ukuran = os.path.getsize(hasil)
+        os.remove(hasil)
+    detik = time.perf_counter() - mulai
+    print(detik, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, ukuran / 2**20)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=3_000_000)
+    parser.add_argument("--modes", nargs="+", default=["lama", "csv", "xlsx", "parquet"])
+    parser.add_argument("--_ukur", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args._ukur:
+        ukur(*args._ukur)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "kerupuk.db")
+        print(f"membuat {args.rows:,} baris sintetis ...")
+        isi_data(path, args.rows)
+        print(f"{'mode':>8} {'waktu':>9} {'peak RSS':>10} {'file':>10}")
+        for mode in args.modes:
+            proses = subprocess.run([sys.executable, __file__, "--_ukur", mode, path],
+                                    capture_output=True, text=True)
+            if proses.returncode:
+                print(f"{mode:>8} gagal: {proses.stderr.strip().splitlines()[-1]}")
+                continue
+            detik, rss, ukuran = map(float, proses.stdout.split())
+            print(f"{mode:>8} {detik:>8.1f}s {rss:>8.1f}MB {ukuran:>8.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
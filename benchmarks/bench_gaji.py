@@ -0,0 +1,82 @@
+"""Waktu hitung gaji dengan aturan margin berjangka (dhn.gaji).
+
+Data sintetis: ``--staff`` karyawan x satu tahun penjualan harian, aturan
+margin umum yang berganti tiap kuartal dan aturan khusus untuk sebagian
+karyawan. Diukur: GROUP BY seluruh riwayat x margin tetap (cara lama), hitung
+satu tahun penuh dengan aturan, dan rekap setelah 11 bulan ditutup (hanya
+periode terbuka yang dihitung). Cache query dikosongkan sebelum tiap ulangan.
+
+    python benchmarks/bench_gaji.py --staff 200
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TAHUN = 2024
+SQL_LAMA = """
+    SELECT tanggal, user, SUM(jumlah_terjual) AS total_terjual
+    FROM rekap_harian
+    GROUP BY tanggal, user
+    ORDER BY tanggal, user
+"""
+
+
+def ukur(fungsi, ulang, pool):
+    hasil = []
+    for _ in range(ulang):
+        pool.cache.clear()
+        mulai = time.perf_counter()
+        fungsi()
+        hasil.append((time.perf_counter() - mulai) * 1000)
+    return statistics.median(hasil)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--staff", type=int, default=200)
+    parser.add_argument("--warung", type=int, default=3, help="warung per karyawan per hari")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["KERUPUK_DB"] = os.path.join(tmp, "kerupuk.db")
+        from dhn import db, gaji, pengiriman
+
+        rnd = random.Random(11)
+        rows = []
+        for hari in range(366):
+            tanggal = date(TAHUN, 1, 1) + timedelta(days=hari)
+            for s in range(args.staff):
+                for w in range(args.warung):
+                    kirim = rnd.randrange(20, 80)
+                    rows.append((tanggal, f"Warung {s * args.warung + w}", kirim,
+                                 rnd.randrange(kirim + 1), 5000, f"sales{s}"))
+        print(f"mengisi {len(rows):,} baris kirim ...")
+        pengiriman.simpan_banyak(rows)
+        for bulan in (4, 7, 10):
+            gaji.tambah_aturan(date(TAHUN, bulan, 1), 1000 + bulan * 50)
+        for s in range(0, args.staff, 10):
+            gaji.tambah_aturan(date(TAHUN, rnd.randrange(1, 12), 1), 1500, user=f"sales{s}")
+
+        pool = db.get_pool()
+        lama = ukur(lambda: db.read_sql(SQL_LAMA)["total_terjual"] * 1000, args.repeat, pool)
+        penuh = ukur(gaji.hitung, args.repeat, pool)
+        harian = gaji.hitung()
+        print(f"{len(harian):,} baris harian, {harian['user'].nunique()} karyawan")
+        print(f"cara lama (margin tetap)   : {lama:8.1f} ms")
+        print(f"aturan, satu tahun terbuka : {penuh:8.1f} ms")
+
+        gaji.tutup_periode(f"{TAHUN}-11")
+        terbuka = ukur(gaji.rekap_gaji, args.repeat, pool)
+        print(f"setelah 11 bulan ditutup   : {terbuka:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
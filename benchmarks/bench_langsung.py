@@ -0,0 +1,70 @@
+"""Biaya satu penyegaran Dashboard: baca ulang sehari penuh vs baris baru saja.
+
+Database diisi ``--baris`` pengiriman untuk hari ini. Cara lama membaca
+semua baris hari ini ke DataFrame plus total per warung dari rekap_harian
+(tanpa cache, seperti sesudah ada tulisan baru). Cara baru (dhn.langsung)
+hanya membaca baris dengan id > terakhir_id. Diukur untuk beberapa jumlah
+baris baru per penyegaran.
+
+    python benchmarks/bench_langsung.py --baris 20000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baris", type=int, default=20_000, help="baris kirim hari ini")
+    parser.add_argument("--warung", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["KERUPUK_DB"] = os.path.join(tmp, "kerupuk.db")
+        from dhn import db, langsung, pengiriman, rekap
+
+        rnd = random.Random(3)
+        hari_ini = date.today()
+
+        def baris(n):
+            return [(hari_ini, f"Warung {rnd.randrange(args.warung)}", 50, rnd.randrange(51), 5000,
+                     f"sales{rnd.randrange(20)}") for _ in range(n)]
+
+        pengiriman.simpan_banyak(baris(args.baris))
+
+        def lama():
+            db.read_sql("SELECT * FROM kirim WHERE tanggal = ?", (hari_ini,))
+            return rekap.pendapatan_per_warung(hari_ini)
+
+        waktu = []
+        for _ in range(args.repeat):
+            db.get_pool().cache.clear()
+            mulai = time.perf_counter()
+            lama()
+            waktu.append((time.perf_counter() - mulai) * 1000)
+        print(f"{args.baris:,} baris hari ini, {args.warung} warung")
+        print(f"baca ulang sehari penuh       : {statistics.median(waktu):8.2f} ms")
+
+        total = langsung.total_harian(hari_ini)
+        for n in (0, 1, 10, 100, 1000):
+            waktu = []
+            for _ in range(args.repeat):
+                pengiriman.simpan_banyak(baris(n))
+                mulai = time.perf_counter()
+                total.perbarui()
+                waktu.append((time.perf_counter() - mulai) * 1000)
+            print(f"id > terakhir_id, {n:>4} baris baru : {statistics.median(waktu):8.2f} ms")
+        cek = db.fetchone("SELECT SUM(pendapatan) FROM rekap_harian WHERE tanggal = ?", (hari_ini,))[0]
+        print("total cocok dengan rekap_harian" if cek == total.total()[2] else "TOTAL BEDA!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Latensi login dengan password ber-hash dan biaya penolakan pembatas.
+
+Mengukur waktu dhn.auth.login (berhasil, password salah, user tidak ada)
+untuk beberapa nilai biaya hash, serta waktu menolak percobaan yang sudah
+diblokir pembatas (tanpa menghitung hash).
+
+    python benchmarks/bench_login.py --rounds 20
+    python benchmarks/bench_login.py --hash pbkdf2 --cost 200000 600000
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def ukur(fungsi, ulang):
+    hasil = []
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        fungsi()
+        hasil.append((time.perf_counter() - mulai) * 1000)
+    return statistics.median(hasil), max(hasil)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hash", choices=["scrypt", "pbkdf2"], default="scrypt")
+    parser.add_argument("--cost", type=int, nargs="+",
+                        help="scrypt N atau iterasi PBKDF2 (default: beberapa nilai umum)")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    biaya = args.cost or ([2 ** 13, 2 ** 14, 2 ** 15] if args.hash == "scrypt" else [200_000, 600_000])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["KERUPUK_DB"] = os.path.join(tmp, "kerupuk.db")
+        from dhn import auth
+
+        auth.ALGORITMA = args.hash
+        # Batas longgar agar pengukuran password salah tidak ikut diblokir.
+        auth.pembatas_user.batas = auth.pembatas_ip.batas = 10 ** 9
+
+        print(f"{'biaya':>8} {'berhasil':>14} {'salah':>14} {'tak ada':>14}   (median / maks ms)")
+        for n in biaya:
+            if args.hash == "scrypt":
+                auth.SCRYPT_N = n
+            else:
+                auth.PBKDF2_ITER = n
+            auth._HASH_TIRUAN = None
+            nama = f"sopir{n}"
+            auth.daftar(nama, "rahasia", is_admin=False)
+            baris = [ukur(lambda: auth.login(nama, "rahasia"), args.rounds),
+                     ukur(lambda: auth.login(nama, "keliru"), args.rounds),
+                     ukur(lambda: auth.login("tidak-ada", "keliru"), args.rounds)]
+            print(f"{n:>8} " + " ".join(f"{med:6.1f} / {maks:5.1f}" for med, maks in baris))
+
+        pembatas = auth.Pembatas(batas=3)
+        auth.pembatas_user = pembatas
+        for _ in range(3):
+            auth.login("sasaran", "tebakan")
+        med, maks = ukur(lambda: auth.login("sasaran", "tebakan"), args.rounds * 50)
+        print(f"ditolak pembatas: {med * 1000:.1f} / {maks * 1000:.1f} µs (tanpa hash)")
+
+
+if __name__ == "__main__":
+    main()
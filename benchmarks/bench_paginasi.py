@@ -0,0 +1,77 @@
+"""Peak RSS halaman Rekap Penjualan: SELECT * penuh vs paginasi keyset.
+
+Setiap ukuran tabel diukur di subprocess terpisah supaya ru_maxrss tidak
+tercampur. Mode "lama" memuat seluruh kirim ke DataFrame seperti Rekap
+sebelumnya; mode "halaman" memakai dhn.paginasi + total dari rekap.
+
+    python benchmarks/bench_paginasi.py --sizes 10000 100000 1000000 10000000
+"""
+import argparse
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def isi_data(path, rows):
+    from dhn import db
+
+    pool = db.Pool(path, size=1)
+    rnd = random.Random(1)
+    mulai = date(2020, 1, 1)
+    with pool.transaction() as conn:
+        conn.executemany(
+            "INSERT INTO kirim (tanggal, warung, jumlah_kirim, jumlah_terjual, harga_satuan, user)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            ((mulai + timedelta(days=i * 1800 // rows), f"Warung {rnd.randrange(300)}", 50,
+              rnd.randrange(51), 5000, f"sales{rnd.randrange(30)}") for i in range(rows)))
+    pool.close()
+
+
+def ukur(mode, path):
+    """Dijalankan di subprocess: cetak 'detik peak_rss_mb'."""
+    os.environ["KERUPUK_DB"] = path
+    from dhn import db, paginasi, rekap
+
+    mulai = time.perf_counter()
+    if mode == "lama":
+        df = db.read_sql("SELECT * FROM kirim")
+        df["Pendapatan"] = df["jumlah_terjual"] * df["harga_satuan"]
+        df["Pendapatan"].sum()
+    else:
+        rekap.ringkasan()
+        df, berikut = paginasi.ambil_halaman(ukuran=50)
+        paginasi.ambil_halaman(kursor=berikut, ukuran=50)
+    detik = time.perf_counter() - mulai
+    print(detik, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--_ukur", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args._ukur:
+        ukur(*args._ukur)
+        return
+
+    print(f"{'baris':>12} {'mode':>8} {'waktu':>10} {'peak RSS':>10}")
+    for rows in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "kerupuk.db")
+            isi_data(path, rows)
+            for mode in ("lama", "halaman"):
+                out = subprocess.run([sys.executable, __file__, "--_ukur", mode, path],
+                                     check=True, capture_output=True, text=True).stdout.split()
+                print(f"{rows:>12,} {mode:>8} {float(out[0]) * 1000:>8.1f}ms {float(out[1]):>8.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
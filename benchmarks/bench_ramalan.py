@@ -0,0 +1,78 @@
+"""Waktu fit model ramalan (dhn.ramalan) dan uji mundur saran kirim.
+
+Database sintetis dibuat dengan dhn.sintetis. Model di-fit penuh sampai
+``--uji`` hari sebelum hari ini, lalu setiap hari uji: saran dihitung untuk
+warung yang dikunjungi, dibandingkan dengan jumlah terjual sebenarnya, dan
+model di-fit inkremental satu hari. Dilaporkan juga waktu fit penuh, fit
+satu hari dan satu panggilan saran.
+
+    python benchmarks/bench_ramalan.py --warung 300 --tahun 2
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--warung", type=int, default=300)
+    parser.add_argument("--tahun", type=float, default=2)
+    parser.add_argument("--uji", type=int, default=28, help="hari terakhir untuk uji mundur")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "kerupuk.db")
+        os.environ["KERUPUK_DB"] = path
+        from dhn import db, ramalan, sintetis
+
+        print("membuat database sintetis ...")
+        info = sintetis.buat(path, warung=args.warung, tahun=args.tahun)
+        awal_uji = date.today() - timedelta(days=args.uji)
+
+        mulai = time.perf_counter()
+        ramalan.fit(penuh=True, hari_ini=awal_uji)
+        penuh = (time.perf_counter() - mulai) * 1000
+
+        galat, sisa_data, sisa_saran, kirim_data, kirim_saran, habis = [], 0, 0, 0, 0, 0
+        waktu_fit, waktu_saran = [], []
+        for i in range(args.uji):
+            hari = awal_uji + timedelta(days=i)
+            for wid, kirim, terjual in db.fetchall(
+                    "SELECT warung_id, SUM(jumlah_kirim), SUM(jumlah_terjual) FROM kirim"
+                    " WHERE tanggal = ? GROUP BY warung_id", (hari,)):
+                mulai = time.perf_counter()
+                s = ramalan.saran(wid, hari)
+                waktu_saran.append((time.perf_counter() - mulai) * 1000)
+                if s is None:
+                    continue
+                galat.append(abs(s["perkiraan"] - terjual))
+                kirim_data += kirim
+                kirim_saran += s["kirim"]
+                sisa_data += kirim - terjual
+                # Data sintetis tidak pernah habis, jadi terjual = permintaan.
+                sisa_saran += max(s["kirim"] - terjual, 0)
+                habis += s["kirim"] < terjual
+            mulai = time.perf_counter()
+            ramalan.fit(hari_ini=hari + timedelta(days=1))
+            waktu_fit.append((time.perf_counter() - mulai) * 1000)
+
+        n = len(galat)
+        print(f"{info['baris']:,} baris kirim, {info['warung']} warung, {info['hari']} hari")
+        print(f"fit penuh              : {penuh:8.1f} ms")
+        print(f"fit inkremental 1 hari : {statistics.median(waktu_fit):8.1f} ms (median)")
+        print(f"saran per warung       : {statistics.median(waktu_saran):8.3f} ms (median)")
+        print(f"uji mundur {args.uji} hari, {n:,} kunjungan:")
+        print(f"  galat absolut rata-rata  {statistics.fmean(galat):6.1f} kerupuk")
+        print(f"  total kirim   data {kirim_data:>9,}   saran {kirim_saran:>9,}")
+        print(f"  tidak laku    data {sisa_data:>9,}   saran {sisa_saran:>9,}")
+        print(f"  kunjungan kurang stok dengan saran: {habis / n:.1%}")
+
+
+if __name__ == "__main__":
+    main()
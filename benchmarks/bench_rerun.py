@@ -0,0 +1,105 @@
+"""Benchmark kerja database per rerun Streamlit: pola lama vs pool bersama.
+
+Pola lama (sebelum dhn.db): setiap rerun membuka koneksi baru, menjalankan
+CREATE TABLE IF NOT EXISTS + commit, membaca data Dashboard lalu menutup
+koneksi. Pola baru: meminjam koneksi dari pool yang sudah dimigrasi.
+
+    python benchmarks/bench_rerun.py --rows 50000 --seconds 3
+
+Dengan --apptest SKRIP, skrip Streamlit dijalankan penuh lewat AppTest
+(butuh streamlit) sehingga hasilnya bisa dibandingkan antar commit.
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dhn import db  # noqa: E402
+
+DDL_LAMA = (
+    """CREATE TABLE IF NOT EXISTS users (
+        username TEXT PRIMARY KEY, password TEXT, is_admin INTEGER DEFAULT 0)""",
+    """CREATE TABLE IF NOT EXISTS kirim (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, tanggal DATE, warung TEXT,
+        jumlah_kirim INTEGER, jumlah_terjual INTEGER, harga_satuan INTEGER,
+        user TEXT)""",
+)
+QUERY = "SELECT * FROM kirim WHERE tanggal = ? AND user = ?"
+
+
+def isi_data(path, rows):
+    pool = db.Pool(path, size=1)
+    hari = date.today()
+    with pool.transaction() as conn:
+        conn.executemany(
+            "INSERT INTO kirim (tanggal, warung, jumlah_kirim, jumlah_terjual, harga_satuan, user)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            ((hari - timedelta(days=i % 365), f"Warung {i % 200}", 50, 40, 5000, f"sales{i % 20}")
+             for i in range(rows)))
+    pool.close()
+
+
+def rerun_lama(path):
+    conn = sqlite3.connect(path, check_same_thread=False)
+    c = conn.cursor()
+    for ddl in DDL_LAMA:
+        c.execute(ddl)
+    conn.commit()
+    c.execute(QUERY, (date.today(), "sales1")).fetchall()
+    conn.close()
+
+
+def rerun_baru(pool):
+    with pool.connection() as conn:
+        conn.execute(QUERY, (date.today(), "sales1")).fetchall()
+
+
+def ukur(fn, detik):
+    n = 0
+    mulai = time.perf_counter()
+    batas = mulai + detik
+    while time.perf_counter() < batas:
+        fn()
+        n += 1
+    return n / (time.perf_counter() - mulai)
+
+
+def ukur_apptest(skrip, detik):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(skrip, default_timeout=30)
+    at.run()  # cold start tidak dihitung
+    return ukur(at.run, detik)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--apptest", metavar="SKRIP")
+    args = parser.parse_args()
+
+    if args.apptest:
+        print(f"{args.apptest}: {ukur_apptest(args.apptest, args.seconds):,.1f} rerun/detik")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "kerupuk.db")
+        isi_data(path, args.rows)
+        lama = ukur(lambda: rerun_lama(path), args.seconds)
+        pool = db.Pool(path)
+        baru = ukur(lambda: rerun_baru(pool), args.seconds)
+        pool.close()
+
+    print(f"data        : {args.rows:,} baris kirim")
+    print(f"pola lama   : {lama:,.1f} rerun/detik")
+    print(f"pool (baru) : {baru:,.1f} rerun/detik  ({baru / lama:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Uji throughput sinkron offline-first (dhn.klien_sinkron -> POST /sinkron).
+
+Server lokal dijalankan pada database sementara. Setiap sopir mencatat
+``--baris`` pengiriman ke antrean lokal (tanpa jaringan), lalu semua sopir
+sinkron bersamaan lewat jaringan simulasi: setiap permintaan ditambah
+``--latensi`` ms round trip, dan dengan peluang ``--putus`` permintaan atau
+balasannya hilang (klien mencoba lagi). Hasil dibandingkan dengan pola lama
+satu POST /kirim per pengiriman pada latensi yang sama, dan dicek bahwa
+tidak ada baris ganda walau balasan hilang.
+
+    python benchmarks/bench_sinkron.py --sopir 8 --baris 2000 --latensi 150 --putus 0.1
+"""
+import argparse
+import gzip
+import http.client
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dhn.klien_sinkron import KlienSinkron  # noqa: E402
+
+
+class KlienLatensi(KlienSinkron):
+    """KlienSinkron dengan latensi dan koneksi putus simulasi."""
+
+    def __init__(self, *args, latensi=0.0, putus=0.0, seed=0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.latensi, self.putus = latensi, putus
+        self.rnd = random.Random(seed)
+        self.hilang = 0
+
+    def _http(self, method, path, body, header):
+        time.sleep(self.latensi / 2)
+        if self.rnd.random() < self.putus / 2:
+            self.hilang += 1
+            raise ConnectionError("simulasi: permintaan hilang")
+        hasil = super()._http(method, path, body, header)
+        time.sleep(self.latensi / 2)
+        if self.rnd.random() < self.putus / 2:
+            self.hilang += 1
+            raise ConnectionError("simulasi: balasan hilang")  # server sudah menyimpan
+        return hasil
+
+
+def isi_antrean(klien, jumlah, rnd):
+    mulai = time.perf_counter()
+    for _ in range(jumlah):
+        kirim = rnd.randrange(10, 100)
+        klien.catat(f"Warung {rnd.randrange(300)}", kirim, rnd.randrange(kirim + 1), 5000)
+    return (time.perf_counter() - mulai) / jumlah * 1e6
+
+
+def sinkron_sampai_habis(klien, hasil):
+    percobaan = 0
+    while True:
+        percobaan += 1
+        try:
+            ringkas = klien.sinkron()
+        except ConnectionError:
+            continue
+        hasil.append((percobaan, ringkas["permintaan"], klien.hilang))
+        return
+
+
+def satu_per_permintaan(host, port, token, jumlah, latensi, rnd):
+    """Pola lama: satu POST /kirim per pengiriman; baris/detik."""
+    conn = http.client.HTTPConnection(host, port, timeout=60)
+    header = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+    mulai = time.perf_counter()
+    for _ in range(jumlah):
+        kirim = rnd.randrange(10, 100)
+        body = json.dumps({"warung": f"Warung {rnd.randrange(300)}", "jumlah_kirim": kirim,
+                           "jumlah_terjual": rnd.randrange(kirim + 1), "harga_satuan": 5000}).encode()
+        time.sleep(latensi / 2)
+        conn.request("POST", "/kirim", body, header)
+        conn.getresponse().read()
+        time.sleep(latensi / 2)
+    conn.close()
+    return jumlah / (time.perf_counter() - mulai)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sopir", type=int, default=8, help="klien bersamaan")
+    parser.add_argument("--baris", type=int, default=2000, help="pengiriman dicatat per sopir")
+    parser.add_argument("--batch", type=int, default=500, help="baris per permintaan /sinkron")
+    parser.add_argument("--latensi", type=float, default=150, help="round trip simulasi (ms)")
+    parser.add_argument("--putus", type=float, default=0.1, help="peluang permintaan/balasan hilang")
+    parser.add_argument("--banding", type=int, default=40, help="baris untuk pola satu-per-permintaan")
+    args = parser.parse_args()
+    latensi = args.latensi / 1000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["KERUPUK_DB"] = os.path.join(tmp, "kerupuk.db")
+        from dhn import api, auth, db
+
+        for i in range(args.sopir):
+            auth.daftar(f"sopir{i}", "rahasia", is_admin=False)
+        auth.daftar("sopir-lama", "rahasia", is_admin=False)
+        server = api.Server(("127.0.0.1", 0))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            klien = [KlienLatensi(url, f"sopir{i}", "rahasia", os.path.join(tmp, f"klien{i}.db"),
+                                  batch=args.batch, latensi=latensi, putus=args.putus, seed=i)
+                     for i in range(args.sopir)]
+            rnd = random.Random(0)
+            catat_us = [isi_antrean(k, args.baris, rnd) for k in klien]
+
+            contoh = [json.loads(d) for (d,) in klien[0].lokal.execute(
+                "SELECT data FROM antrean LIMIT ?", (args.batch,))]
+            mentah = json.dumps({"watermark": None, "kirim": contoh}).encode()
+
+            hasil = []
+            threads = [threading.Thread(target=sinkron_sampai_habis, args=(k, hasil)) for k in klien]
+            mulai = time.perf_counter()
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            detik = time.perf_counter() - mulai
+
+            total = args.sopir * args.baris
+            tersimpan, unik = db.fetchone(
+                "SELECT COUNT(*), COUNT(DISTINCT uuid) FROM kirim WHERE uuid IS NOT NULL")
+            salinan = [k.salinan() for k in klien]
+
+            # Token lewat /login milik klien; pengirimannya memakai /kirim biasa.
+            pembanding = KlienSinkron(url, "sopir-lama", "rahasia", ":memory:")
+            lama = satu_per_permintaan("127.0.0.1", server.server_address[1], pembanding._login(),
+                                       args.banding, latensi, rnd)
+            pembanding.tutup()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    print(f"{args.sopir} sopir x {args.baris} baris, batch {args.batch}, latensi {args.latensi:.0f} ms, "
+          f"putus {args.putus:.0%}")
+    print(f"catat lokal     {sum(catat_us) / len(catat_us):8.1f} us/baris (tanpa jaringan)")
+    print(f"sinkron         {total / detik:8,.0f} baris/detik   ({detik:.2f} s, "
+          f"{sum(h[1] for h in hasil)} permintaan berhasil, {sum(h[2] for h in hasil)} hilang, "
+          f"{sum(h[0] - 1 for h in hasil)} sinkron diulang)")
+    print(f"satu per POST   {lama * args.sopir:8,.0f} baris/detik   ({args.sopir} sopir x {lama:.1f})")
+    print(f"body batch      {len(mentah) / 1024:8.1f} KB -> {len(gzip.compress(mentah, 5)) / 1024:.1f} KB gzip")
+    ok = tersimpan == unik == total and all(n == args.baris for n in salinan)
+    print(f"cek             {tersimpan:,} tersimpan, {unik:,} uuid unik, salinan klien "
+          f"{min(salinan):,}..{max(salinan):,} -> {'OK' if ok else 'TIDAK COCOK'}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Waktu start dingin dan rerun per halaman, plus modul berat yang dimuat.
+
+Tiap halaman dijalankan di interpreter baru (subprocess) lewat Streamlit
+AppTest: "dingin" adalah run pertama sesudah login (impor modul halaman,
+cache query kosong), "rerun" adalah median ``--repeat`` run berikutnya.
+Kolom "impor" menghitung waktu sejak interpreter mulai sampai run pertama
+selesai, termasuk impor streamlit.
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --skrip /checkout-lama/aplikasi_admin.py
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+HALAMAN = ["Kirim ke Warung", "Rekap Penjualan", "Dashboard", "Laporan Bulanan", "Gaji Karyawan",
+           "Kelola User", "Performance"]
+MODUL_BERAT = ["pandas", "numpy", "altair", "pyarrow", "openpyxl"]
+
+_ANAK = r"""
+import json, statistics, sys, time
+mulai = time.perf_counter()
+sys.path.insert(0, {root!r})
+from dhn import db
+from streamlit.testing.v1 import AppTest
+
+at = AppTest.from_file({skrip!r}, default_timeout=120)
+at.session_state["logged_in"] = True
+at.session_state["username"] = "admin"
+at.session_state["is_admin"] = True
+at.run()
+menu = [w for w in at.sidebar.selectbox if w.label == "Menu"][0]
+if {menu!r} not in menu.options:
+    print(json.dumps(None))
+    sys.exit()
+menu.set_value({menu!r})
+t = time.perf_counter()
+at.run()
+dingin = (time.perf_counter() - t) * 1000
+total = (time.perf_counter() - mulai) * 1000
+if at.exception:
+    raise SystemExit(at.exception[0].value)
+rerun = []
+for _ in range({ulang}):
+    t = time.perf_counter()
+    at.run()
+    rerun.append((time.perf_counter() - t) * 1000)
+print(json.dumps({{"impor_ms": total, "dingin_ms": dingin, "rerun_ms": statistics.median(rerun),
+                  "modul": [m for m in {berat!r} if m in sys.modules]}}))
+"""
+
+
+def ukur_halaman(skrip, menu, ulang):
+    kode = _ANAK.format(root=ROOT, skrip=skrip, menu=menu, ulang=ulang, berat=MODUL_BERAT)
+    keluaran = subprocess.run([sys.executable, "-c", kode], capture_output=True, text=True,
+                              cwd=os.path.dirname(skrip))
+    if keluaran.returncode:
+        raise RuntimeError(f"{menu}: {keluaran.stderr.strip().splitlines()[-1:]}")
+    return json.loads(keluaran.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", help="pakai database yang sudah ada (default: buat sintetis)")
+    parser.add_argument("--skrip", default=os.path.join(ROOT, "app.py"))
+    parser.add_argument("--warung", type=int, default=300)
+    parser.add_argument("--tahun", type=float, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    skrip = os.path.abspath(args.skrip)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.db or os.path.join(tmp, "kerupuk.db")
+        if not args.db:
+            from dhn import sintetis
+
+            print("membuat database sintetis ...", file=sys.stderr)
+            sintetis.buat(path, warung=args.warung, tahun=args.tahun)
+        os.environ["KERUPUK_DB"] = path
+
+        print(f"{os.path.basename(skrip)}")
+        print(f"{'halaman':<18} {'impor ms':>9} {'dingin ms':>10} {'rerun ms':>9}  modul berat")
+        for menu in HALAMAN:
+            hasil = ukur_halaman(skrip, menu, args.repeat)
+            if hasil is None:
+                print(f"{menu:<18} {'-':>9} {'-':>10} {'-':>9}  (tidak ada di skrip)")
+                continue
+            print(f"{menu:<18} {hasil['impor_ms']:>9.0f} {hasil['dingin_ms']:>10.1f} "
+                  f"{hasil['rerun_ms']:>9.1f}  {', '.join(hasil['modul']) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Benchmark dan cek EXPLAIN QUERY PLAN untuk filter tanggal pada tabel kirim.
+
+Membandingkan filter lama ``strftime('%m'/'%Y', tanggal) = ?`` (tanpa
+indeks) dengan rentang ``tanggal >= ? AND tanggal < ?`` setelah migrasi
+indeks dhn.db pada tabel sintetis berisi jutaan baris.
+
+    python benchmarks/bench_tanggal.py --rows 3000000
+    python benchmarks/bench_tanggal.py --check     # cek rencana query saja
+
+Keluar dengan status 1 jika salah satu query laporan tidak memakai indeks,
+sehingga bisa dipasang sebagai cek regresi.
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dhn import db  # noqa: E402
+
+BULAN, TAHUN = 6, 2024
+USER = "sales7"
+
+QUERY_LAMA = {
+    "Laporan Bulanan (admin)": (
+        "SELECT * FROM kirim WHERE strftime('%m', tanggal) = ? AND strftime('%Y', tanggal) = ?",
+        (f"{BULAN:02}", str(TAHUN))),
+    "Laporan Bulanan (user)": (
+        "SELECT * FROM kirim WHERE strftime('%m', tanggal) = ? AND strftime('%Y', tanggal) = ? AND user = ?",
+        (f"{BULAN:02}", str(TAHUN), USER)),
+}
+AWAL, AKHIR = db.month_range(TAHUN, BULAN)
+# Halaman membaca view kirim_aktif (baris yang belum dikoreksi); indeks
+# kirim parsial WHERE diganti IS NULL hanya dipakai lewat view itu.
+QUERY_BARU = {
+    "Laporan Bulanan (admin)": (
+        "SELECT * FROM kirim_aktif WHERE tanggal >= ? AND tanggal < ?", (AWAL, AKHIR)),
+    "Laporan Bulanan (user)": (
+        "SELECT * FROM kirim_aktif WHERE user = ? AND tanggal >= ? AND tanggal < ?", (USER, AWAL, AKHIR)),
+    "Dashboard (user)": (
+        "SELECT * FROM kirim_aktif WHERE tanggal = ? AND user = ?", (AWAL, USER)),
+    "Rekap per warung": (
+        "SELECT * FROM kirim_aktif WHERE warung_id = ? AND tanggal >= ?", (17, AWAL)),
+}
+
+
+def buat_tabel(path, rows):
+    """Tabel kirim skema lama (tanpa indeks) dengan data harian beberapa tahun."""
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE kirim (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, tanggal DATE, warung TEXT,
+            jumlah_kirim INTEGER, jumlah_terjual INTEGER, harga_satuan INTEGER,
+            user TEXT)""")
+    rnd = random.Random(42)
+    mulai = date(TAHUN - 4, 1, 1)
+    hari = (date(TAHUN + 1, 1, 1) - mulai).days
+    per_hari = max(1, rows // hari)
+    conn.executemany(
+        "INSERT INTO kirim (tanggal, warung, jumlah_kirim, jumlah_terjual, harga_satuan, user)"
+        " VALUES (?, ?, ?, ?, ?, ?)",
+        (((mulai + timedelta(days=i // per_hari)).isoformat(), f"Warung {rnd.randrange(500)}",
+          50, rnd.randrange(51), 5000, f"sales{rnd.randrange(40)}")
+         for i in range(rows)))
+    conn.commit()
+    conn.close()
+
+
+def rencana(conn, sql, params):
+    return " | ".join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params))
+
+
+def pakai_indeks(plan):
+    return "USING INDEX" in plan or "USING COVERING INDEX" in plan
+
+
+def waktu(conn, sql, params, ulang):
+    mulai = time.perf_counter()
+    for _ in range(ulang):
+        conn.execute(sql, params).fetchall()
+    return (time.perf_counter() - mulai) / ulang * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=3_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--check", action="store_true",
+                        help="hanya cek EXPLAIN QUERY PLAN pada tabel kecil")
+    args = parser.parse_args()
+    rows = 20_000 if args.check else args.rows
+
+    gagal = False
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "kerupuk.db")
+        print(f"membuat {rows:,} baris sintetis ...")
+        buat_tabel(path, rows)
+
+        hasil_lama = {}
+        if not args.check:
+            conn = sqlite3.connect(path)
+            for nama, (sql, params) in QUERY_LAMA.items():
+                hasil_lama[nama] = waktu(conn, sql, params, args.repeat)
+            conn.close()
+
+        pool = db.Pool(path, size=1)  # menjalankan migrasi indeks
+        with pool.connection() as conn:
+            for nama, (sql, params) in QUERY_BARU.items():
+                plan = rencana(conn, sql, params)
+                status = "OK" if pakai_indeks(plan) else "FULL SCAN"
+                gagal |= not pakai_indeks(plan)
+                baris = f"{nama:<26} {status:<9} {plan}"
+                if not args.check:
+                    ms = waktu(conn, sql, params, args.repeat)
+                    lama = hasil_lama.get(nama)
+                    baris += f"\n{'':<26} {ms:8.2f} ms" + (f"  (lama {lama:8.2f} ms, {lama / ms:.0f}x)" if lama else "")
+                print(baris)
+        pool.close()
+
+    sys.exit(1 if gagal else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""Suite benchmark halaman lewat Streamlit AppTest, hasil dalam JSON.
+
+Setiap skenario login sebagai admin, memilih menu (Rekap, Dashboard,
+Laporan Bulanan, Gaji) lalu menjalankan skrip penuh: sekali dingin (cache
+query kosong) dan ``--repeat`` kali hangat. Rincian waktu per query/bagian
+diambil dari dhn.kinerja. Database sintetis dibuat dengan dhn.sintetis
+kecuali ``--db`` diberikan.
+
+    python benchmarks/suite.py --out hasil.json
+    python benchmarks/suite.py --users 40 --warung 600 --tahun 3 --out besar.json
+    python benchmarks/suite.py --banding hasil-lama.json --ambang 20
+
+Dengan --banding, keluar berstatus 1 jika median hangat atau waktu dingin
+suatu skenario lebih lambat dari ``--ambang`` persen.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+BULAN_LALU = (date.today().replace(day=1) - timedelta(days=1))
+# nama: (menu, [(jenis widget, label, nilai)])
+SKENARIO = {
+    "rekap": ("Rekap Penjualan", []),
+    "rekap_user": ("Rekap Penjualan", [("selectbox", "Filter berdasarkan User", "sales01")]),
+    "dashboard": ("Dashboard", []),
+    "laporan_bulanan": ("Laporan Bulanan", [("selectbox", "Pilih Bulan", BULAN_LALU.month),
+                                            ("number_input", "Tahun", BULAN_LALU.year)]),
+    "gaji": ("Gaji Karyawan", []),
+}
+
+
+def _widget(at, jenis, label):
+    daftar = [w for w in getattr(at, jenis) if w.label == label]
+    daftar += [w for w in getattr(at.sidebar, jenis) if w.label == label]
+    if not daftar:
+        raise LookupError(f"{jenis} {label!r} tidak ditemukan")
+    return daftar[0]
+
+
+def jalankan(at):
+    mulai = time.perf_counter()
+    at.run()
+    ms = (time.perf_counter() - mulai) * 1000
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return ms
+
+
+def skenario(skrip, menu, aksi, ulang):
+    from streamlit.testing.v1 import AppTest
+
+    from dhn import db, kinerja
+
+    at = AppTest.from_file(skrip, default_timeout=120)
+    at.session_state["logged_in"] = True
+    at.session_state["username"] = "admin"
+    at.session_state["is_admin"] = True
+    at.run()
+    _widget(at, "selectbox", "Menu").set_value(menu)
+    for jenis, label, nilai in aksi:
+        jalankan(at)
+        _widget(at, jenis, label).set_value(nilai)
+
+    db.get_pool().cache.clear()
+    kinerja.STAT.reset()
+    dingin = jalankan(at)
+    hangat = [jalankan(at) for _ in range(ulang)]
+    bagian = {r["nama"]: round(r["total ms"] / r["jumlah"], 3) for r in kinerja.STAT.ringkasan()}
+    return {
+        "dingin_ms": round(dingin, 2),
+        "p50_ms": round(statistics.median(hangat), 2),
+        "p95_ms": round(sorted(hangat)[min(len(hangat) - 1, len(hangat) * 95 // 100)], 2),
+        "rata_ms": round(statistics.fmean(hangat), 2),
+        "n": len(hangat),
+        "bagian_rata_ms": bagian,
+    }
+
+
+def commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def banding(lama, baru, ambang):
+    """Cetak perbandingan; True jika ada regresi melebihi ambang persen."""
+    regresi = False
+    print(f"\n{'skenario':<18} {'metrik':<10} {'lama':>10} {'baru':>10} {'selisih':>9}")
+    for nama, hasil in baru["hasil"].items():
+        sebelum = lama["hasil"].get(nama)
+        if not sebelum:
+            continue
+        for metrik in ("dingin_ms", "p50_ms"):
+            persen = (hasil[metrik] - sebelum[metrik]) / sebelum[metrik] * 100
+            tanda = "  REGRESI" if persen > ambang else ""
+            regresi |= persen > ambang
+            print(f"{nama:<18} {metrik:<10} {sebelum[metrik]:>10.1f} {hasil[metrik]:>10.1f} {persen:>+8.1f}%{tanda}")
+    return regresi
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", help="pakai database yang sudah ada (default: buat sintetis)")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--warung", type=int, default=300)
+    parser.add_argument("--tahun", type=float, default=2)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skrip", default=os.path.join(ROOT, "app.py"))
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--hanya", nargs="+", choices=list(SKENARIO), help="jalankan skenario tertentu")
+    parser.add_argument("--out", help="tulis hasil JSON ke file (default: stdout)")
+    parser.add_argument("--banding", metavar="JSON", help="hasil lama untuk dibandingkan")
+    parser.add_argument("--ambang", type=float, default=20.0, help="persen perlambatan yang dianggap regresi")
+    args = parser.parse_args()
+    # Path relatif milik direktori pemanggil; di bawah ada os.chdir ke folder skrip.
+    for kunci in ("db", "skrip", "out", "banding"):
+        if getattr(args, kunci):
+            setattr(args, kunci, os.path.abspath(getattr(args, kunci)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.db or os.path.join(tmp, "kerupuk.db")
+        os.environ["KERUPUK_DB"] = path
+        # dhn diimpor sebelum streamlit: pool memakai lru_cache dan sama
+        # dengan yang dipakai skrip di dalam AppTest.
+        from dhn import sintetis
+
+        data = {"db": args.db}
+        if not args.db:
+            print("membuat database sintetis ...", file=sys.stderr)
+            data = sintetis.buat(path, args.users, args.warung, args.tahun, args.seed)
+
+        # Skrip memuat gambar cover dengan path relatif.
+        os.chdir(os.path.dirname(args.skrip))
+        hasil = {}
+        for nama in args.hanya or SKENARIO:
+            menu, aksi = SKENARIO[nama]
+            print(f"{nama} ...", file=sys.stderr)
+            hasil[nama] = skenario(args.skrip, menu, aksi, args.repeat)
+
+    laporan = {
+        "commit": commit(),
+        "waktu": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "skrip": os.path.basename(args.skrip),
+        "data": data,
+        "hasil": hasil,
+    }
+    teks = json.dumps(laporan, indent=2, ensure_ascii=False)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(teks + "\n")
+    else:
+        print(teks)
+
+    if args.banding:
+        with open(args.banding, encoding="utf-8") as f:
+            sys.exit(1 if banding(json.load(f), laporan, args.ambang) else 0)
+
+
+if __name__ == "__main__":
+    main()
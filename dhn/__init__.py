@@ -0,0 +1 @@
+"""Modul bersama aplikasi Pabrik Kerupuk DHN."""
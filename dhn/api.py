@@ -0,0 +1,357 @@
+"""API HTTP/JSON ringan untuk mencatat pengiriman tanpa membuka Streamlit.
+
+Hanya memakai pustaka standar (http.server). Validasi sama dengan menu
+"Kirim ke Warung" (dhn.pengiriman) dan login memakai tabel users lewat
+dhn.auth. Semua tulisan masuk ke satu antrean yang dikerjakan satu thread
+penulis; permintaan yang datang bersamaan digabung ke satu transaksi
+sehingga penulis banyak tidak saling berebut kunci SQLite.
+
+    python -m dhn.api --port 8502
+
+    POST /login   {"username": "...", "password": "..."}  -> {"token": "..."}
+    POST /kirim   Authorization: Bearer <token>
+                  {"warung": "...", "jumlah_kirim": 50, "jumlah_terjual": 40,
+                   "harga_satuan": 5000, "tanggal": "2024-06-01"}  atau daftar objek
+                  -> 201 {"disimpan": n} / 422 {"ditolak": [{"baris": i, "alasan": ...}]}
+    POST /sinkron Authorization: Bearer <token>   (body boleh Content-Encoding: gzip)
+                  {"watermark": "123:4" atau null, "kirim": [{"uuid": "...", ...baris /kirim}]}
+                  -> 200 {"diterima": n, "duplikat": n, "ditolak": [{"uuid": ..., "alasan": ...}],
+                          "baru": [...], "dihapus": [...], "watermark": "...", "lagi": false,
+                          "ulang": false}
+    GET  /sehat   -> {"ok": true, "antrean": n}
+
+/sinkron dipakai klien offline-first (dhn.klien_sinkron); lihat dhn.sinkron
+untuk UUID dan watermark. Balasan dikompres gzip bila klien mengirim
+Accept-Encoding: gzip.
+"""
+import argparse
+import functools
+import gzip
+import json
+import os
+import queue
+import secrets
+import threading
+import time
+import zlib
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from dhn import auth, db, pengiriman, sinkron
+
+TOKEN_TTL = int(os.environ.get("KERUPUK_TOKEN_TTL", str(12 * 3600)))  # detik
+MAKS_BODY = 1 << 20     # byte per permintaan
+MAKS_URAI = 8 << 20     # byte body gzip setelah diurai
+MIN_GZIP = 1024         # balasan lebih kecil dari ini tidak dikompres
+MAKS_BARIS = 1000       # baris per permintaan
+MAKS_GABUNG = 5000      # baris per transaksi penulis
+BATAS_TUNGGU = 30       # detik menunggu penulis sebelum 503
+DIBALAS = object()      # _baca_json: kesalahan sudah dibalas, pemanggil cukup berhenti
+
+
+class PenulisTunggal:
+    """Satu thread yang menjalankan semua INSERT kirim.
+
+    Permintaan yang menumpuk di antrean digabung menjadi satu transaksi
+    (group commit). Jika transaksi gabungan gagal, tiap permintaan dicoba
+    sendiri-sendiri agar satu kiriman buruk tidak menggagalkan yang lain.
+    Tugas dari jalankan() tidak digabung: masing-masing transaksinya sendiri.
+    """
+
+    def __init__(self, maks_gabung=MAKS_GABUNG):
+        self.maks_gabung = maks_gabung
+        self._antrean = queue.Queue()
+        self._thread = threading.Thread(target=self._jalan, name="penulis-kirim", daemon=True)
+        self._thread.start()
+
+    def kirim(self, rows):
+        """Future berisi jumlah baris tersimpan untuk ``rows``."""
+        hasil = Future()
+        self._antrean.put((rows, hasil))
+        return hasil
+
+    def jalankan(self, fungsi, *args):
+        """Future berisi hasil ``fungsi(*args)`` yang dijalankan di thread penulis."""
+        hasil = Future()
+        self._antrean.put((functools.partial(fungsi, *args), hasil))
+        return hasil
+
+    def panjang_antrean(self):
+        return self._antrean.qsize()
+
+    def tutup(self):
+        self._antrean.put(None)
+        self._thread.join()
+
+    def _jalan(self):
+        selesai, tunda = False, None
+        while not selesai:
+            item, tunda = tunda or self._antrean.get(), None
+            if item is None:
+                return
+            if callable(item[0]):
+                self._tugas(*item)
+                continue
+            kelompok, jumlah = [item], len(item[0])
+            while jumlah < self.maks_gabung:
+                try:
+                    item = self._antrean.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    selesai = True
+                    break
+                if callable(item[0]):
+                    tunda = item  # dikerjakan sesudah kelompok ini, sesuai urutan antrean
+                    break
+                kelompok.append(item)
+                jumlah += len(item[0])
+            self._tulis(kelompok)
+
+    def _tugas(self, fungsi, hasil):
+        try:
+            hasil.set_result(fungsi())
+        except Exception as e:
+            hasil.set_exception(e)
+
+    def _tulis(self, kelompok):
+        try:
+            pengiriman.simpan_banyak([row for rows, _ in kelompok for row in rows])
+        except Exception:
+            for rows, hasil in kelompok:
+                try:
+                    hasil.set_result(pengiriman.simpan_banyak(rows))
+                except Exception as e:
+                    hasil.set_exception(e)
+            return
+        for rows, hasil in kelompok:
+            hasil.set_result(len(rows))
+
+
+class Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, alamat, tenang=True):
+        super().__init__(alamat, Handler)
+        self.tenang = tenang
+        self.penulis = PenulisTunggal()
+        self._token = {}
+        self._lock = threading.Lock()
+
+    def buat_token(self, username):
+        token = secrets.token_urlsafe(32)
+        with self._lock:
+            sekarang = time.monotonic()
+            for t in [t for t, (_, habis) in self._token.items() if habis < sekarang]:
+                del self._token[t]
+            self._token[token] = (username, sekarang + TOKEN_TTL)
+        return token
+
+    def user_untuk(self, token):
+        with self._lock:
+            username, habis = self._token.get(token, (None, 0))
+        return username if habis >= time.monotonic() else None
+
+    def server_close(self):
+        super().server_close()
+        self.penulis.tutup()
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive untuk klien yang mengirim berulang
+    server_version = "KerupukAPI/1.0"
+    # Header dan body dikirim terpisah; tanpa ini Nagle + delayed ACK
+    # menambah ~40 ms per balasan.
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        if not self.server.tenang:
+            super().log_message(format, *args)
+
+    def _balas(self, status, data):
+        body = json.dumps(data).encode()
+        gz = len(body) >= MIN_GZIP and "gzip" in self.headers.get("Accept-Encoding", "")
+        if gz:
+            body = gzip.compress(body, compresslevel=5)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if gz:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _baca_json(self):
+        """Body JSON permintaan, atau DIBALAS jika balasan kesalahan sudah dikirim."""
+        try:
+            panjang = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            panjang = -1
+        if panjang < 0:
+            self.close_connection = True  # body tidak bisa dibaca
+            self._balas(400, {"error": "Content-Length tidak valid."})
+            return DIBALAS
+        if panjang > MAKS_BODY:
+            self.close_connection = True
+            self._balas(413, {"error": f"Body maksimal {MAKS_BODY} byte."})
+            return DIBALAS
+        body = self.rfile.read(panjang)
+        if self.headers.get("Content-Encoding", "").lower() == "gzip":
+            try:
+                urai = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                body = urai.decompress(body, MAKS_URAI)
+            except zlib.error:
+                self._balas(400, {"error": "Body gzip rusak."})
+                return DIBALAS
+            if urai.unconsumed_tail:
+                self._balas(413, {"error": f"Body maksimal {MAKS_URAI} byte setelah diurai."})
+                return DIBALAS
+        try:
+            data = json.loads(body) if body else None
+        except ValueError:
+            self._balas(400, {"error": "Body bukan JSON yang valid."})
+            return DIBALAS
+        if data is None:
+            self._balas(400, {"error": "Body JSON wajib diisi."})
+            return DIBALAS
+        return data
+
+    def do_GET(self):
+        if self.path == "/sehat":
+            self._balas(200, {"ok": True, "antrean": self.server.penulis.panjang_antrean()})
+        else:
+            self._balas(404, {"error": "Tidak ditemukan."})
+
+    def do_POST(self):
+        if self.path == "/login":
+            self._login()
+        elif self.path == "/kirim":
+            self._kirim()
+        elif self.path == "/sinkron":
+            self._sinkron()
+        else:
+            self.close_connection = True
+            self._balas(404, {"error": "Tidak ditemukan."})
+
+    def _login(self):
+        data = self._baca_json()
+        if data is DIBALAS:
+            return
+        if not isinstance(data, dict):
+            self._balas(400, {"error": "Body harus berupa objek."})
+            return
+        user, pesan = auth.login(str(data.get("username", "")), str(data.get("password", "")),
+                                 self.client_address[0])
+        if not user:
+            self._balas(401, {"error": pesan})
+            return
+        self._balas(200, {"token": self.server.buat_token(user[0]), "kedaluwarsa": TOKEN_TTL})
+
+    def _user(self):
+        jenis, _, token = self.headers.get("Authorization", "").partition(" ")
+        username = self.server.user_untuk(token.strip()) if jenis.lower() == "bearer" else None
+        if not username:
+            self.close_connection = True  # body tidak dibaca
+            self._balas(401, {"error": "Token tidak valid atau kedaluwarsa. Login lewat POST /login."})
+        return username
+
+    def _kirim(self):
+        username = self._user()
+        if not username:
+            return
+        data = self._baca_json()
+        if data is DIBALAS:
+            return
+        daftar = data if isinstance(data, list) else [data]
+        if not daftar or len(daftar) > MAKS_BARIS:
+            self._balas(400, {"error": f"Kirim 1 sampai {MAKS_BARIS} baris per permintaan."})
+            return
+
+        rows, ditolak = [], []
+        for i, item in enumerate(daftar):
+            row, pesan = pengiriman.validasi_baris(item)
+            if pesan:
+                ditolak.append({"baris": i, "alasan": pesan})
+            else:
+                rows.append((*row, username))
+        if ditolak:
+            self._balas(422, {"ditolak": ditolak})
+            return
+
+        try:
+            jumlah = self.server.penulis.kirim(rows).result(timeout=BATAS_TUNGGU)
+        except FutureTimeout:
+            self._balas(503, {"error": "Database sibuk; baris mungkin tetap tersimpan, periksa sebelum mengirim ulang."})
+            return
+        except Exception as e:
+            self._balas(500, {"error": f"Gagal menyimpan: {e}"})
+            return
+        self._balas(201, {"disimpan": jumlah})
+
+    def _sinkron(self):
+        # Satu batch = satu tugas di thread penulis dengan transaksinya
+        # sendiri (tidak digabung dengan /kirim). Baris yang ditolak tidak
+        # menggagalkan batch: mengirim ulang tidak akan memperbaikinya.
+        username = self._user()
+        if not username:
+            return
+        data = self._baca_json()
+        if data is DIBALAS:
+            return
+        daftar = (data.get("kirim") or []) if isinstance(data, dict) else None
+        if not isinstance(daftar, list) or len(daftar) > MAKS_BARIS:
+            self._balas(400, {"error": f"Body berisi objek dengan daftar \"kirim\" (maksimal {MAKS_BARIS})."})
+            return
+        try:
+            sinkron.baca_watermark(data.get("watermark"))
+        except ValueError as e:
+            self._balas(400, {"error": str(e)})
+            return
+
+        rows, ditolak = [], []
+        for item in daftar:
+            uuid, row, pesan = sinkron.validasi(item)
+            if pesan:
+                ditolak.append({"uuid": uuid, "alasan": pesan})
+            else:
+                rows.append((uuid, *row))
+        try:
+            duplikat, tutup = [], []
+            if rows:
+                duplikat, tutup = self.server.penulis.jalankan(sinkron.terapkan, rows, username).result(
+                    timeout=BATAS_TUNGGU)
+            hasil = sinkron.tarik(username, data.get("watermark"))
+        except FutureTimeout:
+            self._balas(503, {"error": "Database sibuk; kirim ulang batch yang sama (UUID mencegah baris ganda)."})
+            return
+        except Exception as e:
+            self._balas(500, {"error": f"Gagal sinkron: {e}"})
+            return
+        ditolak += [{"uuid": uuid, "alasan": pesan} for uuid, pesan in tutup]
+        self._balas(200, {"diterima": len(rows) - len(duplikat) - len(tutup), "duplikat": len(duplikat),
+                          "ditolak": ditolak, **hasil})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API JSON pencatatan pengiriman kerupuk.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--db", default=None, help="path database (default: kerupuk.db)")
+    parser.add_argument("--log", action="store_true", help="catat setiap permintaan ke stderr")
+    args = parser.parse_args()
+
+    if args.db:
+        db.DB_PATH = args.db
+    db.get_pool()
+    server = Server((args.host, args.port), tenang=not args.log)
+    print(f"API kerupuk di http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+"""Arsip kolumnar (Parquet) bulan yang sudah lewat, untuk laporan multi-tahun.
+
+Baris kirim setiap bulan yang sudah selesai disalin ke
+
+    <db>-arsip/kirim/tahun=YYYY/bulan=MM/kirim.parquet
+
+dan dicatat di ``manifest.json`` bersama sidik (hash rekap_harian bulan itu)
+dan ringkasan (jumlah baris, pendapatan, ID log koreksi terakhir bulan itu).
+Laporan tren per warung membaca bulan yang terarsip lewat DuckDB (atau
+pyarrow.compute bila DuckDB tidak terpasang), sedangkan bulan berjalan dan
+bulan yang datanya berubah sesudah diarsip dibaca dari rekap SQLite. Kedua
+hasil digabung, jadi pemanggil tidak perlu tahu sumbernya.
+
+    python -m dhn.arsip snapshot        # arsipkan/perbarui bulan yang sudah lewat
+    python -m dhn.arsip status
+
+pyarrow wajib untuk arsip, DuckDB opsional. Tanpa pyarrow semua laporan tetap
+dihitung dari SQLite. KERUPUK_ANALITIK=sqlite|pyarrow|duckdb memaksa satu mesin.
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+from datetime import date, datetime
+
+from dhn import db, kinerja, koreksi
+
+MESIN = ("duckdb", "pyarrow", "sqlite")
+KOLOM = ("tanggal", "bulan", "user", "warung_id", "jumlah_kirim", "jumlah_terjual", "harga_satuan",
+         "pendapatan")
+# Sama dengan kunci dan nilai rekap_harian (lihat dhn.rekap).
+SQL_BULAN = """
+    SELECT tanggal, substr(tanggal, 1, 7), COALESCE(user, ''), COALESCE(warung_id, 0),
+           COALESCE(jumlah_kirim, 0), COALESCE(jumlah_terjual, 0), COALESCE(harga_satuan, 0),
+           COALESCE(jumlah_terjual, 0) * COALESCE(harga_satuan, 0)
+    FROM kirim_aktif
+    WHERE tanggal >= ? AND tanggal < ?
+"""
+SQL_SIDIK = """
+    SELECT tanggal, user, warung_id, jumlah_kirim, jumlah_terjual, pendapatan, jumlah_baris
+    FROM rekap_harian
+    WHERE tanggal >= ? AND tanggal < ?
+    ORDER BY tanggal, user, warung_id
+"""
+SQL_RINGKAS = """
+    SELECT bulan, SUM(jumlah_baris), SUM(pendapatan)
+    FROM rekap_bulanan
+    GROUP BY bulan
+"""
+SQL_TREN = """
+    SELECT substr(tanggal, 1, 7) AS bulan, warung_id,
+           SUM(jumlah_kirim) AS jumlah_kirim, SUM(jumlah_terjual) AS jumlah_terjual,
+           SUM(pendapatan) AS pendapatan
+    FROM rekap_harian
+    WHERE tanggal >= ? AND tanggal < ?{filter_user}
+    GROUP BY 1, 2
+"""
+NILAI = ("jumlah_kirim", "jumlah_terjual", "pendapatan")
+
+
+def path_arsip(db_path):
+    return os.environ.get("KERUPUK_ARSIP") or os.path.splitext(db_path)[0] + "-arsip"
+
+
+def mesin():
+    """Mesin analitik yang tersedia: duckdb, pyarrow atau sqlite."""
+    pilihan = os.environ.get("KERUPUK_ANALITIK")
+    if pilihan in MESIN:
+        return pilihan
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return "sqlite"
+    try:
+        import duckdb  # noqa: F401
+    except ImportError:
+        return "pyarrow"
+    return "duckdb"
+
+
+def _rentang(bulan):
+    return db.month_range(int(bulan[:4]), int(bulan[5:]))
+
+
+def _bulan_berikut(bulan):
+    return _rentang(bulan)[1].isoformat()[:7]
+
+
+# === MANIFEST ===
+
+def baca_manifest(folder):
+    try:
+        with open(os.path.join(folder, "manifest.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"bulan": {}}
+
+
+def _tulis_manifest(folder, manifest):
+    sementara = os.path.join(folder, "manifest.json.baru")
+    with open(sementara, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(sementara, os.path.join(folder, "manifest.json"))
+
+
+def _file_bulan(bulan):
+    return os.path.join("kirim", f"tahun={bulan[:4]}", f"bulan={bulan[5:]}", "kirim.parquet")
+
+
+# === SNAPSHOT ===
+
+def _ringkas(cache=False):
+    """{bulan: [jumlah baris, pendapatan, ID log koreksi terakhir]}."""
+    log = koreksi.log_per_bulan(cache=cache)
+    return {b: [n, p, log.get(b, 0)] for b, n, p in db.fetchall(SQL_RINGKAS, cache=cache)}
+
+
+def _sidik(conn, awal, akhir):
+    h = hashlib.blake2b(digest_size=16)
+    for row in conn.execute(SQL_SIDIK, (awal, akhir)):
+        h.update(repr(row).encode())
+    return h.hexdigest()
+
+
+def _tulis_parquet(rows, path):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    kolom = list(zip(*rows)) or [()] * len(KOLOM)
+    tabel = pa.table({
+        "tanggal": pa.array(kolom[0], pa.string()).cast(pa.date32()),
+        "bulan": pa.array(kolom[1], pa.string()),
+        "user": pa.array(kolom[2], pa.string()),
+        "warung_id": pa.array(kolom[3], pa.int32()),
+        "jumlah_kirim": pa.array(kolom[4], pa.int64()),
+        "jumlah_terjual": pa.array(kolom[5], pa.int64()),
+        "harga_satuan": pa.array(kolom[6], pa.int64()),
+        "pendapatan": pa.array(kolom[7], pa.int64()),
+    })
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    sementara = path + ".baru"
+    pq.write_table(tabel, sementara, compression="zstd")
+    os.replace(sementara, path)
+
+
+@kinerja.ukur("arsip.snapshot")
+def snapshot(folder=None, sampai=None, paksa=False):
+    """Arsipkan bulan sebelum ``sampai`` (default bulan ini) yang baru/berubah.
+
+    Mengembalikan (bulan ditulis, bulan dihapus). Bulan dianggap berubah
+    bila sidik rekap_harian atau ringkasannya tidak sama dengan yang
+    tercatat (koreksi yang tidak mengubah rekap tetap ditulis ulang).
+    """
+    pool = db.get_pool()
+    folder = folder or path_arsip(pool.path)
+    batas = (sampai or date.today()).isoformat()[:7]
+    os.makedirs(folder, exist_ok=True)
+    manifest = baca_manifest(folder)
+    tercatat = manifest["bulan"]
+    ringkas = {b: r for b, r in _ringkas().items() if b < batas and r[0]}
+    ditulis = []
+    for bulan in sorted(ringkas):
+        awal, akhir = _rentang(bulan)
+        with pool.connection() as conn:
+            # Satu transaksi baca: sidik dan baris berasal dari versi data yang sama.
+            conn.execute("BEGIN")
+            sidik = _sidik(conn, awal, akhir)
+            lama = tercatat.get(bulan, {})
+            if not paksa and lama.get("sidik") == sidik and lama.get("ringkas") == ringkas[bulan]:
+                continue
+            rows = conn.execute(SQL_BULAN, (awal, akhir)).fetchall()
+            conn.execute("COMMIT")
+        _tulis_parquet(rows, os.path.join(folder, _file_bulan(bulan)))
+        tercatat[bulan] = {"sidik": sidik, "ringkas": ringkas[bulan], "baris": len(rows),
+                           "file": _file_bulan(bulan),
+                           "dibuat": datetime.now().isoformat(" ", "seconds")}
+        ditulis.append(bulan)
+    dihapus = [b for b in tercatat if b not in ringkas and b < batas]
+    for bulan in dihapus:
+        shutil.rmtree(os.path.dirname(os.path.join(folder, tercatat.pop(bulan)["file"])),
+                      ignore_errors=True)
+    if ditulis or dihapus:
+        _tulis_manifest(folder, manifest)
+    return ditulis, dihapus
+
+
+def bulan_terarsip(folder=None):
+    """{bulan: path file} untuk bulan yang arsipnya masih cocok dengan SQLite.
+
+    Dicek lewat jumlah baris dan pendapatan di rekap_bulanan serta ID log
+    koreksi terakhir bulan itu; bulan yang berubah sesudah snapshot
+    (termasuk koreksi warung atau jumlah kirim) dibaca dari SQLite.
+    """
+    folder = folder or path_arsip(db.get_pool().path)
+    tercatat = baca_manifest(folder)["bulan"]
+    if not tercatat:
+        return {}
+    ringkas = _ringkas(cache=True)
+    return {b: os.path.join(folder, info["file"]) for b, info in tercatat.items()
+            if ringkas.get(b) == info["ringkas"] and os.path.exists(os.path.join(folder, info["file"]))}
+
+
+# === LAPORAN TREN ===
+
+def _tren_duckdb(files, user):
+    import duckdb
+
+    sql = f"""
+        SELECT bulan, warung_id, SUM(jumlah_kirim)::BIGINT AS jumlah_kirim,
+               SUM(jumlah_terjual)::BIGINT AS jumlah_terjual, SUM(pendapatan)::BIGINT AS pendapatan
+        FROM read_parquet(?, hive_partitioning = false)
+        {"WHERE user = ?" if user is not None else ""}
+        GROUP BY 1, 2
+    """
+    params = [files] + ([user] if user is not None else [])
+    with duckdb.connect() as conn:
+        return conn.execute(sql, params).df()
+
+
+def _tren_pyarrow(files, user):
+    import pyarrow.dataset as ds
+
+    kolom = ["bulan", "warung_id", *NILAI]
+    tabel = ds.dataset(files, format="parquet").to_table(
+        columns=kolom, filter=(ds.field("user") == user) if user is not None else None)
+    hasil = tabel.group_by(["bulan", "warung_id"]).aggregate([(k, "sum") for k in NILAI])
+    return hasil.rename_columns([k.removesuffix("_sum") for k in hasil.column_names]).to_pandas()
+
+
+def _tren_sqlite(dari, sampai, user):
+    awal, akhir = _rentang(dari)[0], _rentang(sampai)[1]
+    params = [awal, akhir] + ([user] if user is not None else [])
+    return db.read_sql(SQL_TREN.format(filter_user=" AND user = ?" if user is not None else ""), params,
+                       cache=True)
+
+
+def tren_per_warung(dari, sampai, user=None, analitik=None):
+    """Total per (bulan, warung) dari bulan ``dari`` s/d ``sampai`` ("YYYY-MM").
+
+    Kolom: bulan, warung_id, warung, jumlah_kirim, jumlah_terjual,
+    pendapatan. Atribut ``df.attrs["sumber"]`` mencatat bulan per mesin.
+    """
+    import pandas as pd
+
+    analitik = analitik or mesin()
+    arsip = {}
+    if analitik != "sqlite":
+        arsip = {b: f for b, f in bulan_terarsip().items() if dari <= b <= sampai}
+
+    # Bulan yang tidak terarsip dibaca dari SQLite per rentang berurutan.
+    bagian, rentang, bulan = [], [], dari
+    while bulan <= sampai:
+        if bulan not in arsip:
+            if rentang and _bulan_berikut(rentang[-1][1]) == bulan:
+                rentang[-1][1] = bulan
+            else:
+                rentang.append([bulan, bulan])
+        bulan = _bulan_berikut(bulan)
+    if rentang:
+        with kinerja.ukur("arsip.tren: sqlite"):
+            bagian += [_tren_sqlite(awal, akhir, user) for awal, akhir in rentang]
+    if arsip:
+        baca = _tren_duckdb if analitik == "duckdb" else _tren_pyarrow
+        with kinerja.ukur(f"arsip.tren: {analitik}"):
+            bagian.append(baca(sorted(arsip.values()), user))
+
+    kosong = pd.DataFrame({"bulan": pd.Series(dtype=str), "warung_id": pd.Series(dtype="int64"),
+                           **{k: pd.Series(dtype="int64") for k in NILAI}})
+    df = pd.concat([kosong, *[b for b in bagian if not b.empty]], ignore_index=True)
+    # Rupiah dan jumlah selalu bulat; arsip lama (float64) ikut dikembalikan ke int64.
+    df = df.astype({"warung_id": "int64", **dict.fromkeys(NILAI, "int64")})
+    nama = dict(db.fetchall("SELECT id, nama FROM warung", cache=True))
+    df.insert(2, "warung", df["warung_id"].map(nama).fillna(""))
+    df = df.sort_values(["bulan", "warung_id"], ignore_index=True)
+    df.attrs["sumber"] = {"arsip": sorted(arsip), "mesin": analitik if arsip else "sqlite"}
+    return df
+
+
+# === CLI ===
+
+def main():
+    parser = argparse.ArgumentParser(description="Arsip Parquet bulan yang sudah lewat.")
+    parser.add_argument("perintah", choices=["snapshot", "status"])
+    parser.add_argument("--db", default=None, help="path database (default: kerupuk.db)")
+    parser.add_argument("--folder", default=None, help="folder arsip (default: <db>-arsip)")
+    parser.add_argument("--paksa", action="store_true", help="tulis ulang semua bulan")
+    args = parser.parse_args()
+
+    if args.db:
+        db.DB_PATH = args.db
+    folder = args.folder or path_arsip(db.get_pool().path)
+    if args.perintah == "snapshot":
+        ditulis, dihapus = snapshot(folder, paksa=args.paksa)
+        print(f"{len(ditulis)} bulan ditulis, {len(dihapus)} dihapus -> {folder}")
+        return
+    tercatat = baca_manifest(folder)["bulan"]
+    cocok = bulan_terarsip(folder)
+    for bulan, info in sorted(tercatat.items()):
+        print(f"{bulan}  {info['baris']:>8,} baris  {info['dibuat']}  {'' if bulan in cocok else 'BERUBAH'}")
+    print(f"{len(cocok)}/{len(tercatat)} bulan cocok dengan SQLite; mesin: {mesin()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""Login, pendaftaran dan penyimpanan password.
+
+Password disimpan sebagai hash ber-salt (scrypt, atau PBKDF2-SHA256 bila
+``KERUPUK_HASH=pbkdf2``) dengan biaya yang bisa diatur lewat environment.
+Baris lama yang masih berisi password polos di-hash ulang otomatis saat
+login berikutnya berhasil. Percobaan login dibatasi per user dan per IP di
+memori; percobaan yang sudah diblokir ditolak sebelum hash dihitung.
+
+    python -m dhn.auth buat-user NAMA [--admin]
+"""
+import argparse
+import base64
+import getpass
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from collections import deque
+
+from dhn import db, kinerja
+
+ALGORITMA = os.environ.get("KERUPUK_HASH", "scrypt")
+SCRYPT_N = int(os.environ.get("KERUPUK_SCRYPT_N", str(2 ** 14)))
+SCRYPT_R = int(os.environ.get("KERUPUK_SCRYPT_R", "8"))
+SCRYPT_P = int(os.environ.get("KERUPUK_SCRYPT_P", "1"))
+PBKDF2_ITER = int(os.environ.get("KERUPUK_PBKDF2_ITER", "600000"))
+
+BATAS_USER = 5      # gagal per user dalam JENDELA detik
+BATAS_IP = 20       # gagal per IP dalam JENDELA detik
+JENDELA = 300
+
+
+def _b64(data):
+    return base64.b64encode(data).decode("ascii")
+
+
+def _scrypt(password, salt, n, r, p):
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p,
+                          maxmem=256 * n * r + 2 ** 20, dklen=32)
+
+
+def hash_password(password):
+    """String hash siap simpan, mis. ``scrypt$16384$8$1$<salt>$<hash>``."""
+    salt = secrets.token_bytes(16)
+    if ALGORITMA == "pbkdf2":
+        dk = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, PBKDF2_ITER)
+        return f"pbkdf2_sha256${PBKDF2_ITER}${_b64(salt)}${_b64(dk)}"
+    dk = _scrypt(password, salt, SCRYPT_N, SCRYPT_R, SCRYPT_P)
+    return f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${_b64(salt)}${_b64(dk)}"
+
+
+def _parameter_sekarang(tersimpan):
+    if ALGORITMA == "pbkdf2":
+        return tersimpan.startswith(f"pbkdf2_sha256${PBKDF2_ITER}$")
+    return tersimpan.startswith(f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}$")
+
+
+def verify_password(password, tersimpan):
+    """(cocok, perlu_rehash) untuk password terhadap nilai kolom users.password."""
+    tersimpan = tersimpan or ""
+    bagian = tersimpan.split("$")
+    if bagian[0] == "scrypt" and len(bagian) == 6:
+        n, r, p = map(int, bagian[1:4])
+        dk = _scrypt(password, base64.b64decode(bagian[4]), n, r, p)
+        cocok = hmac.compare_digest(dk, base64.b64decode(bagian[5]))
+    elif bagian[0] == "pbkdf2_sha256" and len(bagian) == 4:
+        dk = hashlib.pbkdf2_hmac("sha256", password.encode(), base64.b64decode(bagian[2]), int(bagian[1]))
+        cocok = hmac.compare_digest(dk, base64.b64decode(bagian[3]))
+    else:
+        # Baris lama: password polos.
+        return hmac.compare_digest(tersimpan.encode(), password.encode()), True
+    return cocok, cocok and not _parameter_sekarang(tersimpan)
+
+
+# Hash tiruan supaya user yang tidak ada butuh waktu sama dengan password salah.
+_HASH_TIRUAN = None
+
+
+def _hash_tiruan():
+    global _HASH_TIRUAN
+    if _HASH_TIRUAN is None:
+        _HASH_TIRUAN = hash_password(secrets.token_hex(8))
+    return _HASH_TIRUAN
+
+
+# === PEMBATAS PERCOBAAN LOGIN ===
+
+class Pembatas:
+    """Jendela geser jumlah login gagal per kunci (user / IP) di memori."""
+
+    def __init__(self, batas, jendela=JENDELA, maks_kunci=10_000):
+        self.batas = batas
+        self.jendela = jendela
+        self.maks_kunci = maks_kunci
+        self._gagal = {}
+        self._lock = threading.Lock()
+
+    def _bersihkan(self, kunci, sekarang):
+        antrean = self._gagal.get(kunci)
+        while antrean and antrean[0] <= sekarang - self.jendela:
+            antrean.popleft()
+        if antrean is not None and not antrean:
+            del self._gagal[kunci]
+        return antrean
+
+    def sisa_blokir(self, kunci):
+        """Detik sampai kunci boleh mencoba lagi (0 jika tidak diblokir)."""
+        sekarang = time.monotonic()
+        with self._lock:
+            antrean = self._bersihkan(kunci, sekarang)
+            if not antrean or len(antrean) < self.batas:
+                return 0
+            return antrean[0] + self.jendela - sekarang
+
+    def catat_gagal(self, kunci):
+        sekarang = time.monotonic()
+        with self._lock:
+            if kunci not in self._gagal and len(self._gagal) >= self.maks_kunci:
+                # Buang kunci yang paling lama tidak gagal agar memori terbatas.
+                self._gagal.pop(min(self._gagal, key=lambda k: self._gagal[k][-1]))
+            self._gagal.setdefault(kunci, deque(maxlen=self.batas)).append(sekarang)
+
+    def reset(self, kunci):
+        with self._lock:
+            self._gagal.pop(kunci, None)
+
+
+pembatas_user = Pembatas(BATAS_USER)
+pembatas_ip = Pembatas(BATAS_IP)
+
+
+def alamat_ip():
+    """IP klien sesi Streamlit saat ini, jika bisa diketahui."""
+    try:
+        import streamlit as st
+
+        ip = getattr(st.context, "ip_address", None)
+        if ip:
+            return ip
+        terusan = st.context.headers.get("X-Forwarded-For", "")
+        return terusan.split(",")[0].strip() or None
+    except Exception:
+        return None
+
+
+@kinerja.ukur("auth.login")
+def login(username, password, ip=None):
+    """(baris users atau None, pesan kesalahan atau None)."""
+    tunggu = max(pembatas_user.sisa_blokir(username), pembatas_ip.sisa_blokir(ip) if ip else 0)
+    if tunggu:
+        return None, f"Terlalu banyak percobaan gagal. Coba lagi dalam {int(tunggu) + 1} detik."
+
+    user = db.fetchone("SELECT username, password, is_admin FROM users WHERE username = ?", (username,))
+    cocok, perlu_rehash = verify_password(password, user[1] if user else _hash_tiruan())
+    if not user or not cocok:
+        pembatas_user.catat_gagal(username)
+        if ip:
+            pembatas_ip.catat_gagal(ip)
+        return None, "Username atau password salah."
+
+    pembatas_user.reset(username)
+    if perlu_rehash:
+        db.execute("UPDATE users SET password = ? WHERE username = ?", (hash_password(password), username))
+    return user, None
+
+
+def daftar(username, password, is_admin=None):
+    """Buat user baru; user pertama otomatis admin. Pesan kesalahan atau None."""
+    if not username or not password:
+        return "Username dan password wajib diisi."
+    # Hash dihitung sebelum transaksi supaya kunci tulis tidak ditahan lama.
+    hashed = hash_password(password)
+    with db.get_pool().transaction() as conn:
+        if conn.execute("SELECT 1 FROM users WHERE username = ?", (username,)).fetchone():
+            return "Username sudah digunakan."
+        if is_admin is None:
+            is_admin = conn.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 0
+        conn.execute("INSERT INTO users (username, password, is_admin) VALUES (?, ?, ?)",
+                     (username, hashed, int(is_admin)))
+    return None
+
+
+def ganti_password(username, lama, baru, ip=None):
+    """Ganti password setelah password lama dicek. Pesan kesalahan atau None."""
+    if not baru:
+        return "Password baru wajib diisi."
+    user, pesan = login(username, lama, ip)
+    if not user:
+        return pesan
+    db.execute("UPDATE users SET password = ? WHERE username = ?", (hash_password(baru), username))
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kelola akun pengguna kerupuk.db.")
+    sub = parser.add_subparsers(dest="perintah", required=True)
+    buat = sub.add_parser("buat-user", help="buat user baru (password ditanyakan)")
+    buat.add_argument("username")
+    buat.add_argument("--admin", action="store_true")
+    args = parser.parse_args()
+
+    password = getpass.getpass("Password: ")
+    pesan = daftar(args.username, password, is_admin=args.admin)
+    print(pesan or f"User {args.username} dibuat.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Cache hasil query per proses dengan batas ukuran (LRU).
+
+Setiap entri dicatat bersama versi data saat dibaca. Versi data naik pada
+setiap transaksi tulis (Simpan, Daftar, Jadikan Admin, ...) dan ketika file
+database berubah oleh proses lain, sehingga entri lama otomatis tidak
+dipakai lagi. Selama versi tidak berubah, halaman tidak menyentuh SQLite.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+CACHE_SIZE = int(os.environ.get("KERUPUK_CACHE_SIZE", "256"))
+
+
+class QueryCache:
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._versi = None
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def get_or_load(self, key, versi, load):
+        """Nilai untuk ``key`` pada ``versi`` data; ``load()`` dipanggil jika belum ada."""
+        with self._lock:
+            if versi != self._versi:
+                if self._data:
+                    self.invalidations += 1
+                self._data.clear()
+                self._versi = versi
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+        nilai = load()
+        with self._lock:
+            if versi == self._versi:
+                self._data[key] = nilai
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+                    self.evictions += 1
+        return nilai
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entri": len(self._data),
+                "maks": self.maxsize,
+                "hit": self.hits,
+                "miss": self.misses,
+                "hit rate": self.hits / total if total else 0.0,
+                "eviction": self.evictions,
+                "invalidasi": self.invalidations,
+            }
+
+
+def tampilkan_statistik(cache):
+    """Ringkasan hit/miss cache di sidebar (khusus admin)."""
+    import streamlit as st
+
+    s = cache.stats()
+    with st.sidebar.expander("📊 Cache Query"):
+        st.write(f"Hit: {s['hit']:,} · Miss: {s['miss']:,} · Hit rate: {s['hit rate']:.0%}")
+        st.write(f"Entri: {s['entri']}/{s['maks']} · Eviction: {s['eviction']:,} · "
+                 f"Invalidasi: {s['invalidasi']:,}")
+        if st.button("Kosongkan cache"):
+            cache.clear()
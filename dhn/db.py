@@ -0,0 +1,608 @@
+"""Akses database SQLite bersama untuk semua halaman aplikasi.
+
+Satu pool koneksi dibuat per proses (bukan per rerun Streamlit). Pragma
+WAL/busy_timeout dipasang saat koneksi dibuka dan migrasi skema hanya
+dijalankan sekali ketika pool pertama kali dibuat.
+"""
+import functools
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+
+from dhn import kinerja
+from dhn.cache import QueryCache
+
+DB_PATH = os.environ.get("KERUPUK_DB", "kerupuk.db")
+POOL_SIZE = int(os.environ.get("KERUPUK_DB_POOL", "4"))
+POOL_TIMEOUT = 30  # detik menunggu koneksi bebas sebelum menyerah
+
+# Simpan tanggal sebagai teks ISO (YYYY-MM-DD), sama seperti data lama.
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_adapter(datetime, lambda d: d.isoformat(" "))
+
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -16000",
+    "PRAGMA mmap_size = 134217728",
+)
+
+
+# === MIGRASI SKEMA ===
+# Setiap langkah dijalankan tepat sekali; nomor versi disimpan di
+# PRAGMA user_version. Tambahkan langkah baru di akhir daftar MIGRASI.
+
+def _skema_awal(conn):
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS users (
+        username TEXT PRIMARY KEY,
+        password TEXT,
+        is_admin INTEGER DEFAULT 0
+    )
+    """)
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS kirim (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        tanggal DATE,
+        warung TEXT,
+        jumlah_kirim INTEGER,
+        jumlah_terjual INTEGER,
+        harga_satuan INTEGER,
+        user TEXT
+    )
+    """)
+    # kerupuk.py dan KERUPUKKK.PY dulu membuat kirim tanpa kolom user.
+    kolom = {row[1] for row in conn.execute("PRAGMA table_info(kirim)")}
+    if "user" not in kolom:
+        conn.execute("ALTER TABLE kirim ADD COLUMN user TEXT")
+
+
+def _indeks_tanggal(conn):
+    # Laporan Bulanan memfilter rentang tanggal, Dashboard memfilter
+    # (user, tanggal) dan Rekap per warung; tanpa indeks semuanya full scan.
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_kirim_tanggal ON kirim (tanggal)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_kirim_user_tanggal ON kirim (user, tanggal)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_kirim_warung_tanggal ON kirim (warung, tanggal)")
+    conn.execute("ANALYZE kirim")
+
+
+# Tambah/kurangi satu baris kirim (NEW/OLD) ke tabel rekap. {wk} adalah
+# kolom kunci warung di rekap_harian dan {wv} nilainya dari baris kirim.
+_REKAP_TAMBAH = """
+    INSERT INTO rekap_harian VALUES (
+        {r}.tanggal, COALESCE({r}.user, ''), {wv},
+        COALESCE({r}.jumlah_kirim, 0), COALESCE({r}.jumlah_terjual, 0),
+        COALESCE({r}.jumlah_terjual, 0) * COALESCE({r}.harga_satuan, 0), 1)
+    ON CONFLICT (tanggal, user, {wk}) DO UPDATE SET
+        jumlah_kirim = jumlah_kirim + excluded.jumlah_kirim,
+        jumlah_terjual = jumlah_terjual + excluded.jumlah_terjual,
+        pendapatan = pendapatan + excluded.pendapatan,
+        jumlah_baris = jumlah_baris + 1;
+    INSERT INTO rekap_bulanan VALUES (
+        substr({r}.tanggal, 1, 7), COALESCE({r}.user, ''),
+        COALESCE({r}.jumlah_kirim, 0), COALESCE({r}.jumlah_terjual, 0),
+        COALESCE({r}.jumlah_terjual, 0) * COALESCE({r}.harga_satuan, 0), 1)
+    ON CONFLICT (bulan, user) DO UPDATE SET
+        jumlah_kirim = jumlah_kirim + excluded.jumlah_kirim,
+        jumlah_terjual = jumlah_terjual + excluded.jumlah_terjual,
+        pendapatan = pendapatan + excluded.pendapatan,
+        jumlah_baris = jumlah_baris + 1;
+"""
+_REKAP_KURANG = """
+    UPDATE rekap_harian SET
+        jumlah_kirim = jumlah_kirim - COALESCE({r}.jumlah_kirim, 0),
+        jumlah_terjual = jumlah_terjual - COALESCE({r}.jumlah_terjual, 0),
+        pendapatan = pendapatan - COALESCE({r}.jumlah_terjual, 0) * COALESCE({r}.harga_satuan, 0),
+        jumlah_baris = jumlah_baris - 1
+    WHERE tanggal = {r}.tanggal AND user = COALESCE({r}.user, '') AND {wk} = {wv};
+    DELETE FROM rekap_harian
+    WHERE tanggal = {r}.tanggal AND user = COALESCE({r}.user, '') AND {wk} = {wv}
+      AND jumlah_baris = 0;
+    UPDATE rekap_bulanan SET
+        jumlah_kirim = jumlah_kirim - COALESCE({r}.jumlah_kirim, 0),
+        jumlah_terjual = jumlah_terjual - COALESCE({r}.jumlah_terjual, 0),
+        pendapatan = pendapatan - COALESCE({r}.jumlah_terjual, 0) * COALESCE({r}.harga_satuan, 0),
+        jumlah_baris = jumlah_baris - 1
+    WHERE bulan = substr({r}.tanggal, 1, 7) AND user = COALESCE({r}.user, '');
+    DELETE FROM rekap_bulanan
+    WHERE bulan = substr({r}.tanggal, 1, 7) AND user = COALESCE({r}.user, '') AND jumlah_baris = 0;
+"""
+
+
+def _trigger_rekap(conn, kolom_warung, nilai_warung, aktif=None):
+    """Buat trigger kirim -> rekap; ``nilai_warung`` memakai {r} untuk NEW/OLD.
+
+    ``aktif`` (juga memakai {r}) membatasi baris yang dihitung; UPDATE lalu
+    dipecah jadi dua trigger supaya baris yang diganti hanya dikurangi.
+    """
+    def tambah(r):
+        return _REKAP_TAMBAH.format(r=r, wk=kolom_warung, wv=nilai_warung.format(r=r))
+
+    def kurang(r):
+        return _REKAP_KURANG.format(r=r, wk=kolom_warung, wv=nilai_warung.format(r=r))
+
+    def saat(r):
+        return f"WHEN {aktif.format(r=r)} " if aktif else ""
+
+    conn.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_kirim_rekap_insert AFTER INSERT ON kirim {saat("NEW")}BEGIN
+        {tambah("NEW")}
+    END
+    """)
+    conn.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_kirim_rekap_delete AFTER DELETE ON kirim {saat("OLD")}BEGIN
+        {kurang("OLD")}
+    END
+    """)
+    if aktif:
+        conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_kirim_rekap_update AFTER UPDATE ON kirim {saat("OLD")}BEGIN
+            {kurang("OLD")}
+        END
+        """)
+        conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_kirim_rekap_update_baru AFTER UPDATE ON kirim {saat("NEW")}BEGIN
+            {tambah("NEW")}
+        END
+        """)
+        return
+    conn.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_kirim_rekap_update AFTER UPDATE ON kirim BEGIN
+        {kurang("OLD")}
+        {tambah("NEW")}
+    END
+    """)
+
+
+def _tabel_rekap(conn):
+    # Total harian/bulanan dijaga trigger dalam transaksi yang sama dengan
+    # perubahan pada kirim; lihat dhn.rekap untuk rebuild/verify. Isi awal
+    # rekap dihitung di _tabel_warung yang selalu ikut berjalan setelahnya.
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS rekap_harian (
+        tanggal DATE NOT NULL,
+        user TEXT NOT NULL,
+        warung TEXT NOT NULL,
+        jumlah_kirim INTEGER NOT NULL,
+        jumlah_terjual INTEGER NOT NULL,
+        pendapatan INTEGER NOT NULL,
+        jumlah_baris INTEGER NOT NULL,
+        PRIMARY KEY (tanggal, user, warung)
+    ) WITHOUT ROWID
+    """)
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS rekap_bulanan (
+        bulan TEXT NOT NULL,
+        user TEXT NOT NULL,
+        jumlah_kirim INTEGER NOT NULL,
+        jumlah_terjual INTEGER NOT NULL,
+        pendapatan INTEGER NOT NULL,
+        jumlah_baris INTEGER NOT NULL,
+        PRIMARY KEY (bulan, user)
+    ) WITHOUT ROWID
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_rekap_harian_user ON rekap_harian (user, tanggal)")
+    _trigger_rekap(conn, "warung", "COALESCE({r}.warung, '')")
+
+
+def _tabel_warung(conn):
+    # Master warung berkunci integer + indeks FTS5 trigram untuk
+    # autocomplete. kirim.warung_id dan rekap_harian memakai ID ini, jadi
+    # salah ketik nama tidak lagi memecah pendapatan satu warung.
+    from dhn import master_warung, rekap
+
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS warung (
+        id INTEGER PRIMARY KEY,
+        nama TEXT NOT NULL,
+        kunci TEXT NOT NULL UNIQUE
+    )
+    """)
+    conn.execute("""
+    CREATE VIRTUAL TABLE IF NOT EXISTS warung_cari USING fts5(
+        nama, content='warung', content_rowid='id', tokenize='trigram'
+    )
+    """)
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_warung_cari_insert AFTER INSERT ON warung BEGIN
+        INSERT INTO warung_cari (rowid, nama) VALUES (NEW.id, NEW.nama);
+    END
+    """)
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_warung_cari_delete AFTER DELETE ON warung BEGIN
+        INSERT INTO warung_cari (warung_cari, rowid, nama) VALUES ('delete', OLD.id, OLD.nama);
+    END
+    """)
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_warung_cari_update AFTER UPDATE ON warung BEGIN
+        INSERT INTO warung_cari (warung_cari, rowid, nama) VALUES ('delete', OLD.id, OLD.nama);
+        INSERT INTO warung_cari (rowid, nama) VALUES (NEW.id, NEW.nama);
+    END
+    """)
+    conn.execute("ALTER TABLE kirim ADD COLUMN warung_id INTEGER REFERENCES warung (id)")
+
+    # Trigger rekap lama dilepas dulu supaya pengisian warung_id tidak
+    # memperbarui rekap baris per baris; rekap dihitung ulang di akhir.
+    for nama in ("insert", "delete", "update"):
+        conn.execute(f"DROP TRIGGER IF EXISTS trg_kirim_rekap_{nama}")
+    master_warung.isi_dari_kirim(conn)
+
+    conn.execute("DROP INDEX IF EXISTS idx_kirim_warung_tanggal")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_kirim_warung_id_tanggal ON kirim (warung_id, tanggal)")
+    conn.execute("DROP TABLE rekap_harian")
+    conn.execute("""
+    CREATE TABLE rekap_harian (
+        tanggal DATE NOT NULL,
+        user TEXT NOT NULL,
+        warung_id INTEGER NOT NULL,
+        jumlah_kirim INTEGER NOT NULL,
+        jumlah_terjual INTEGER NOT NULL,
+        pendapatan INTEGER NOT NULL,
+        jumlah_baris INTEGER NOT NULL,
+        PRIMARY KEY (tanggal, user, warung_id)
+    ) WITHOUT ROWID
+    """)
+    conn.execute("CREATE INDEX idx_rekap_harian_user ON rekap_harian (user, tanggal)")
+    conn.execute("CREATE INDEX idx_rekap_harian_warung ON rekap_harian (warung_id, tanggal)")
+    _trigger_rekap(conn, "warung_id", "COALESCE({r}.warung_id, 0)")
+    rekap.rebuild(conn, sumber="kirim")
+    conn.execute("ANALYZE")
+
+
+def _tabel_gaji(conn):
+    # Aturan margin per kerupuk terjual dengan rentang tanggal berlaku
+    # [mulai, sampai); user NULL berarti berlaku untuk semua karyawan.
+    # Periode gaji yang sudah ditutup dibekukan di gaji_periode.
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS aturan_margin (
+        id INTEGER PRIMARY KEY,
+        mulai DATE NOT NULL,
+        sampai DATE,
+        user TEXT,
+        margin INTEGER NOT NULL,
+        keterangan TEXT,
+        CHECK (sampai IS NULL OR sampai > mulai)
+    )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_aturan_margin_user ON aturan_margin (user, mulai)")
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS periode_tutup (
+        periode TEXT PRIMARY KEY,
+        ditutup_pada TEXT NOT NULL
+    )
+    """)
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS gaji_periode (
+        periode TEXT NOT NULL REFERENCES periode_tutup (periode),
+        user TEXT NOT NULL,
+        total_terjual INTEGER NOT NULL,
+        gaji INTEGER NOT NULL,
+        PRIMARY KEY (periode, user)
+    ) WITHOUT ROWID
+    """)
+    # Nilai yang dulu ditulis langsung di menu Gaji: selisih harga jual ke
+    # warung (5000) dan harga dari pabrik (4000).
+    if not conn.execute("SELECT 1 FROM aturan_margin").fetchone():
+        conn.execute("INSERT INTO aturan_margin (mulai, margin, keterangan) VALUES (?, ?, ?)",
+                     ("2000-01-01", 1000, "Selisih harga jual ke warung dan harga pabrik"))
+
+
+def _tabel_ramalan(conn):
+    # Status model permintaan per warung (dhn.ramalan): level, faktor hari
+    # Senin..Minggu dan galat, sudah memuat semua hari sampai ramalan_status.sampai.
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS ramalan (
+        warung_id INTEGER PRIMARY KEY,
+        level REAL NOT NULL,
+        galat REAL NOT NULL,
+        musim TEXT NOT NULL,
+        n INTEGER NOT NULL,
+        terakhir DATE NOT NULL
+    )
+    """)
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS ramalan_status (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        sampai DATE,
+        diperbarui TEXT
+    )
+    """)
+    conn.execute("INSERT OR IGNORE INTO ramalan_status (id) VALUES (1)")
+
+
+def _tabel_tugas(conn):
+    # Antrean tugas latar (dhn.pekerja); status: antre, jalan, selesai, gagal.
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS tugas (
+        id INTEGER PRIMARY KEY,
+        jenis TEXT NOT NULL,
+        jadwal TEXT NOT NULL,
+        status TEXT NOT NULL DEFAULT 'antre',
+        dibuat TEXT NOT NULL,
+        mulai TEXT,
+        durasi_ms REAL,
+        pesan TEXT
+    )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_tugas_status ON tugas (status, jadwal)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_tugas_jenis ON tugas (jenis, id)")
+
+
+def _tabel_koreksi(conn):
+    # Koreksi kirim (dhn.koreksi) tidak menimpa baris lama: baris pengganti
+    # disisipkan dan kirim.diganti baris lama diisi ID-nya (0 untuk hapus).
+    # Baris aktif adalah diganti IS NULL; indeks kirim dibuat parsial supaya
+    # laporan lewat view kirim_aktif tidak memindai baris yang sudah diganti.
+    conn.execute("ALTER TABLE kirim ADD COLUMN diganti INTEGER")
+    for nama, kolom in (("idx_kirim_tanggal", "tanggal"),
+                        ("idx_kirim_user_tanggal", "user, tanggal"),
+                        ("idx_kirim_warung_id_tanggal", "warung_id, tanggal")):
+        conn.execute(f"DROP INDEX IF EXISTS {nama}")
+        conn.execute(f"CREATE INDEX {nama} ON kirim ({kolom}) WHERE diganti IS NULL")
+    conn.execute("""
+    CREATE VIEW IF NOT EXISTS kirim_aktif AS
+    SELECT id, tanggal, warung, jumlah_kirim, jumlah_terjual, harga_satuan, user, warung_id
+    FROM kirim WHERE diganti IS NULL
+    """)
+    for nama in ("insert", "delete", "update"):
+        conn.execute(f"DROP TRIGGER IF EXISTS trg_kirim_rekap_{nama}")
+    _trigger_rekap(conn, "warung_id", "COALESCE({r}.warung_id, 0)", aktif="{r}.diganti IS NULL")
+
+    # Log audit hanya ditambah; diff berisi kolom yang berubah saja,
+    # {kolom: [lama, baru]} untuk ubah dan {kolom: lama} untuk hapus.
+    # Log lama dilipat ke kirim_log_ringkas oleh koreksi.padatkan().
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS kirim_log (
+        id INTEGER PRIMARY KEY,
+        waktu TEXT NOT NULL,
+        user TEXT NOT NULL,
+        aksi TEXT NOT NULL CHECK (aksi IN ('ubah', 'hapus')),
+        kirim_id INTEGER NOT NULL,
+        baru_id INTEGER,
+        diff TEXT NOT NULL
+    )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_kirim_log_kirim ON kirim_log (kirim_id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_kirim_log_baru ON kirim_log (baru_id)")
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_kirim_log_tetap BEFORE UPDATE ON kirim_log BEGIN
+        SELECT RAISE(ABORT, 'kirim_log hanya boleh ditambah');
+    END
+    """)
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS kirim_log_ringkas (
+        bulan TEXT NOT NULL,
+        user TEXT NOT NULL,
+        aksi TEXT NOT NULL,
+        jumlah INTEGER NOT NULL,
+        kolom TEXT NOT NULL,
+        PRIMARY KEY (bulan, user, aksi)
+    ) WITHOUT ROWID
+    """)
+
+
+def _kolom_uuid(conn):
+    # UUID buatan klien untuk sinkron offline (dhn.sinkron): kiriman ulang
+    # batch yang sama ditolak oleh indeks unik, bukan disimpan dua kali.
+    # Baris dari Streamlit, API /kirim dan koreksi tetap NULL.
+    conn.execute("ALTER TABLE kirim ADD COLUMN uuid TEXT")
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_kirim_uuid ON kirim (uuid)")
+
+
+def _kolom_ramalan_watermark(conn):
+    # ID kirim dan kirim_log terakhir yang sudah masuk model ramalan: baris
+    # sinkron terlambat, entri mundur tanggal dan koreksi untuk hari yang
+    # sudah di-fit terdeteksi lewat ID di atasnya. Nilai awal 0 membuat fit
+    # berikutnya menghitung ulang semua warung sekali.
+    conn.execute("ALTER TABLE ramalan_status ADD COLUMN kirim_id INTEGER NOT NULL DEFAULT 0")
+    conn.execute("ALTER TABLE ramalan_status ADD COLUMN log_id INTEGER NOT NULL DEFAULT 0")
+
+
+MIGRASI = [
+    _skema_awal,
+    _indeks_tanggal,
+    _tabel_rekap,
+    _tabel_warung,
+    _tabel_gaji,
+    _tabel_ramalan,
+    _tabel_tugas,
+    _tabel_koreksi,
+    _kolom_uuid,
+    _kolom_ramalan_watermark,
+]
+
+
+def migrate(conn):
+    """Jalankan langkah migrasi yang belum diterapkan pada database."""
+    versi = conn.execute("PRAGMA user_version").fetchone()[0]
+    if versi >= len(MIGRASI):
+        return
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # Baca ulang di dalam transaksi: proses lain mungkin sudah migrasi.
+        versi = conn.execute("PRAGMA user_version").fetchone()[0]
+        for nomor in range(versi, len(MIGRASI)):
+            MIGRASI[nomor](conn)
+            conn.execute(f"PRAGMA user_version = {nomor + 1}")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+# === POOL KONEKSI ===
+
+class Pool:
+    """Pool koneksi SQLite yang aman dipakai bersama oleh banyak sesi."""
+
+    def __init__(self, path=DB_PATH, size=POOL_SIZE):
+        self.path = path
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._all = []
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.cache = QueryCache()
+        with self.connection() as conn:
+            migrate(conn)
+
+    def _open(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False,
+                               isolation_level=None)
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def _checkout(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._all) < self.size:
+                conn = self._open()
+                self._all.append(conn)
+                return conn
+        try:
+            return self._idle.get(timeout=POOL_TIMEOUT)
+        except queue.Empty:
+            raise RuntimeError("Semua koneksi database sedang dipakai.") from None
+
+    @contextmanager
+    def connection(self):
+        """Pinjam satu koneksi (autocommit) lalu kembalikan ke pool."""
+        conn = self._checkout()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            self._idle.put(conn)
+
+    @contextmanager
+    def transaction(self):
+        """Pinjam koneksi di dalam satu transaksi tulis (BEGIN IMMEDIATE)."""
+        # Durasi termasuk menunggu kunci tulis dari proses lain.
+        with self.connection() as conn, kinerja.ukur("db: transaksi"):
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            with self._lock:
+                self._writes += 1
+
+    def data_version(self):
+        """Versi data untuk cache query.
+
+        Berubah setiap commit dari proses ini, atau ketika file database/WAL
+        diubah proses lain (API, worker). Cukup os.stat, tanpa query SQLite.
+        """
+        tanda = [self._writes]
+        for akhiran in ("", "-wal"):
+            try:
+                info = os.stat(self.path + akhiran)
+                tanda.append((info.st_mtime_ns, info.st_size))
+            except OSError:
+                tanda.append(None)
+        return tuple(tanda)
+
+    def close(self):
+        with self._lock:
+            for conn in self._all:
+                conn.close()
+            self._all.clear()
+            self._idle = queue.LifoQueue()
+
+
+def _cache_resource(fn):
+    # Di dalam Streamlit pool disimpan lewat st.cache_resource; skrip CLI,
+    # benchmark dan API berjalan tanpa Streamlit dan cukup memakai lru_cache.
+    st = sys.modules.get("streamlit")
+    if st is not None and hasattr(st, "cache_resource"):
+        return st.cache_resource(show_spinner=False)(fn)
+    return functools.lru_cache(maxsize=None)(fn)
+
+
+@_cache_resource
+def _pool_for(path):
+    return Pool(path)
+
+
+def get_pool(path=None):
+    """Pool bersama untuk proses ini (dibuat dan dimigrasi sekali saja)."""
+    return _pool_for(path or DB_PATH)
+
+
+# === HELPER QUERY ===
+
+def month_range(tahun, bulan):
+    """Rentang setengah terbuka [awal, akhir) untuk satu bulan.
+
+    Dipakai sebagai ``tanggal >= ? AND tanggal < ?`` supaya SQLite bisa
+    memakai indeks tanggal (strftime() pada kolom selalu full scan).
+    """
+    awal = date(int(tahun), int(bulan), 1)
+    if awal.month == 12:
+        return awal, date(awal.year + 1, 1, 1)
+    return awal, date(awal.year, awal.month + 1, 1)
+
+
+def _terukur(sql, params, jalankan):
+    # Durasi setiap query dicatat di dhn.kinerja (cache hit tidak dihitung).
+    mulai = time.perf_counter()
+    try:
+        return jalankan()
+    finally:
+        kinerja.catat_query(sql, params, (time.perf_counter() - mulai) * 1000, get_pool().path)
+
+
+def _baca(jenis, sql, params, cache, scope, load):
+    # cache=True: pakai hasil tersimpan selama versi data belum berubah.
+    # ``scope`` memisahkan entri per user bila hasil bergantung pada sesi.
+    if not cache:
+        return _terukur(sql, params, load)
+    pool = get_pool()
+    return pool.cache.get_or_load((jenis, sql, tuple(params), scope), pool.data_version(),
+                                  lambda: _terukur(sql, params, load))
+
+
+def fetchone(sql, params=(), cache=False, scope=None):
+    def load():
+        with get_pool().connection() as conn:
+            return conn.execute(sql, params).fetchone()
+    return _baca("one", sql, params, cache, scope, load)
+
+
+def fetchall(sql, params=(), cache=False, scope=None):
+    def load():
+        with get_pool().connection() as conn:
+            return conn.execute(sql, params).fetchall()
+    return list(_baca("all", sql, params, cache, scope, load))
+
+
+def execute(sql, params=()):
+    """Jalankan satu perintah tulis di dalam transaksinya sendiri."""
+    with get_pool().transaction() as conn:
+        return _terukur(sql, params, lambda: conn.execute(sql, params).rowcount)
+
+
+def read_sql(sql, params=(), cache=False, scope=None):
+    """DataFrame hasil query; dengan cache=True yang dikembalikan salinan."""
+    import pandas as pd
+
+    def load():
+        with get_pool().connection() as conn:
+            return pd.read_sql_query(sql, conn, params=params)
+    df = _baca("df", sql, params, cache, scope, load)
+    return df.copy() if cache else df
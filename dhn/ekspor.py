@@ -0,0 +1,176 @@
+"""Ekspor hasil query ke CSV, XLSX atau Parquet secara bertahap.
+
+Baris dibaca dari SQLite per potongan (fetchmany) dan langsung ditulis ke
+file sementara, jadi tidak pernah ada DataFrame atau bytes berisi seluruh
+hasil di memori. File hanya dibuat ketika pengguna menekan "Siapkan Ekspor";
+file di EKSPOR_DIR yang lebih tua dari UMUR_FILE dihapus setiap kali ekspor
+baru dimulai, jadi sesi yang ditinggal tidak menumpuk file.
+XLSX butuh openpyxl dan Parquet butuh pyarrow; keduanya opsional.
+"""
+import csv
+import os
+import tempfile
+import time
+
+from dhn import db
+
+CHUNK = 10_000
+# Kolom ekspor kirim sama dengan tabel di layar (termasuk Pendapatan).
+SQL_KIRIM = "SELECT *, jumlah_terjual * harga_satuan AS Pendapatan FROM kirim_aktif"
+FORMAT = {
+    "CSV": (".csv", "text/csv"),
+    "Excel (XLSX)": (".xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "Parquet": (".parquet", "application/vnd.apache.parquet"),
+}
+EKSPOR_DIR = os.path.join(tempfile.gettempdir(), "kerupuk-ekspor")
+UMUR_FILE = 3600  # detik file ekspor disimpan untuk diunduh
+
+
+def iter_chunks(sql, params=(), chunk=CHUNK):
+    """Hasilkan nama kolom lalu potongan baris berukuran paling banyak `chunk`."""
+    with db.get_pool().connection() as conn:
+        cur = conn.execute(sql, params)
+        yield [d[0] for d in cur.description]
+        while True:
+            rows = cur.fetchmany(chunk)
+            if not rows:
+                break
+            yield rows
+
+
+def iter_chunks_df(df, chunk=CHUNK):
+    """Seperti iter_chunks, untuk hasil yang sudah berupa DataFrame kecil."""
+    yield [str(k) for k in df.columns]
+    for awal in range(0, len(df), chunk):
+        # tolist() memberi skalar Python biasa, bukan numpy.
+        potong = df.iloc[awal:awal + chunk]
+        yield list(zip(*(potong[k].tolist() for k in df.columns)))
+
+
+def tulis_csv(chunks, path):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(next(chunks))
+        for rows in chunks:
+            writer.writerows(rows)
+
+
+def tulis_xlsx(chunks, path):
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise RuntimeError("Ekspor Excel butuh paket openpyxl.") from None
+    # write_only: baris langsung dialirkan ke file, tidak disimpan per sel.
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Data")
+    ws.append(next(chunks))
+    for rows in chunks:
+        for row in rows:
+            ws.append(row)
+    wb.save(path)
+
+
+def tulis_parquet(chunks, path):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Ekspor Parquet butuh paket pyarrow.") from None
+    kolom = next(chunks)
+    writer = None
+    try:
+        for rows in chunks:
+            batch = pa.Table.from_pydict({k: list(v) for k, v in zip(kolom, zip(*rows))})
+            if writer is None:
+                # Kolom yang seluruhnya NULL di potongan pertama (mis. user
+                # data lama) bertipe null dan tidak bisa menerima nilai di
+                # potongan berikutnya; jadikan string.
+                skema = pa.schema([f.with_type(pa.string()) if pa.types.is_null(f.type) else f
+                                   for f in batch.schema])
+                writer = pq.ParquetWriter(path, skema)
+            writer.write_table(batch.cast(writer.schema))
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        pq.write_table(pa.table({k: [] for k in kolom}), path)
+
+
+PENULIS = {"CSV": tulis_csv, "Excel (XLSX)": tulis_xlsx, "Parquet": tulis_parquet}
+
+
+def _bersihkan():
+    batas = time.time() - UMUR_FILE
+    with os.scandir(EKSPOR_DIR) as isi:
+        for entri in isi:
+            try:
+                if entri.is_file() and entri.stat().st_mtime < batas:
+                    os.remove(entri.path)
+            except OSError:
+                pass  # sudah dihapus proses/sesi lain
+
+
+def _tulis_file(chunks, format):
+    os.makedirs(EKSPOR_DIR, exist_ok=True)
+    _bersihkan()
+    fd, path = tempfile.mkstemp(suffix=FORMAT[format][0], dir=EKSPOR_DIR)
+    os.close(fd)
+    try:
+        PENULIS[format](chunks, path)
+    except BaseException:
+        os.remove(path)
+        raise
+    return path
+
+
+def buat_file(sql, params=(), format="CSV"):
+    """Tulis hasil query ke file sementara dan kembalikan path-nya."""
+    return _tulis_file(iter_chunks(sql, params), format)
+
+
+def buat_file_df(df, format="CSV"):
+    return _tulis_file(iter_chunks_df(df), format)
+
+
+def tombol_ekspor(sql, params, nama_file, key, label="Ekspor ke Excel", siap=None):
+    """Pilihan format + tombol "Siapkan Ekspor" + tombol unduh di Streamlit.
+
+    ``siap`` ({format: path}) berisi file yang sudah dibuat pekerja latar
+    untuk query yang sama; format itu langsung bisa diunduh.
+    """
+    _tombol(lambda format: buat_file(sql, params, format), nama_file, key, label, siap)
+
+
+def tombol_ekspor_df(df, nama_file, key, label="Ekspor ke Excel"):
+    """tombol_ekspor untuk hasil hitungan pandas yang tidak berasal dari satu query."""
+    _tombol(lambda format: buat_file_df(df, format), nama_file, key, label)
+
+
+def _tombol(buat, nama_file, key, label, siap=None):
+    import streamlit as st
+
+    kol_format, kol_tombol = st.columns([2, 1])
+    format = kol_format.selectbox("Format ekspor", list(FORMAT), key=f"{key}_format")
+    state_key = f"{key}_file"
+    if siap and format in siap:
+        with open(siap[format], "rb") as f:
+            if kol_tombol.download_button(label, f, nama_file + FORMAT[format][0], FORMAT[format][1],
+                                          key=f"{key}_unduh_siap"):
+                st.success("Berhasil diekspor.")
+        return
+    if kol_tombol.button("Siapkan Ekspor", key=f"{key}_siapkan"):
+        lama = st.session_state.pop(state_key, None)
+        if lama and os.path.exists(lama[0]):
+            os.remove(lama[0])
+        try:
+            with st.spinner("Menyiapkan file ..."):
+                st.session_state[state_key] = (buat(format), format)
+        except RuntimeError as e:
+            st.error(str(e))
+
+    siap = st.session_state.get(state_key)
+    if siap and siap[1] == format and os.path.exists(siap[0]):
+        akhiran, mime = FORMAT[format]
+        with open(siap[0], "rb") as f:
+            if st.download_button(label, f, nama_file + akhiran, mime, key=f"{key}_unduh"):
+                st.success("Berhasil diekspor.")
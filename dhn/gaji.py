@@ -0,0 +1,284 @@
+"""Perhitungan gaji karyawan dari aturan margin berjangka waktu.
+
+Gaji = jumlah kerupuk terjual x margin per kerupuk yang berlaku pada tanggal
+penjualan. Aturan margin ada di tabel aturan_margin dengan rentang
+[mulai, sampai); aturan khusus satu karyawan mengalahkan aturan umum.
+Aturan dicocokkan ke data terjual harian sekaligus dengan
+``pandas.merge_asof``, tanpa loop per baris.
+
+Periode gaji adalah bulan kalender. Periode yang sudah ditutup dibekukan di
+tabel gaji_periode, jadi yang dihitung ulang hanya periode yang masih terbuka.
+"""
+from datetime import date, datetime
+
+from dhn import db, kinerja
+
+SQL_HARIAN = """
+    SELECT tanggal, substr(tanggal, 1, 7) AS periode, user, SUM(jumlah_terjual) AS total_terjual
+    FROM rekap_harian
+    WHERE tanggal >= ? AND tanggal < ?
+    GROUP BY tanggal, user
+"""
+SQL_ATURAN = "SELECT id, mulai, sampai, user, margin, keterangan FROM aturan_margin ORDER BY mulai, id"
+SQL_TERTUTUP = "SELECT periode, user, total_terjual, gaji FROM gaji_periode ORDER BY periode, user"
+# Batas rentang tanggal teks ISO jika tidak dibatasi.
+AWAL, AKHIR = "0000-01-01", "9999-12-31"
+PERIODE_TUTUP = "Periode gaji {} sudah ditutup; pengiriman tidak bisa diubah."
+KOLOM_TAMPIL = {"periode": "Periode", "user": "Karyawan", "total_terjual": "Terjual",
+                "gaji": "Gaji", "status": "Status"}
+
+
+# === PERIODE ===
+
+def periode_dari(tanggal):
+    return f"{tanggal.year:04}-{tanggal.month:02}"
+
+
+def _periode_berikut(periode):
+    tahun, bulan = int(periode[:4]), int(periode[5:7])
+    return f"{tahun + bulan // 12:04}-{bulan % 12 + 1:02}"
+
+
+def _awal_periode(periode):
+    return date(int(periode[:4]), int(periode[5:7]), 1)
+
+
+def awal_periode_terbuka(conn=None):
+    """Tanggal pertama yang belum dibekukan (None jika belum ada periode ditutup)."""
+    sql = "SELECT MAX(periode) FROM periode_tutup"
+    terakhir = (conn.execute(sql).fetchone() if conn else db.fetchone(sql, cache=True))[0]
+    return _awal_periode(_periode_berikut(terakhir)) if terakhir else None
+
+
+def cek_periode(tanggal, conn=None):
+    """Pesan kesalahan jika ``tanggal`` (date atau teks ISO) di periode tertutup, atau None.
+
+    Gaji periode tertutup sudah dibekukan di gaji_periode; pengiriman baru
+    atau koreksi di sana tidak akan pernah ikut dibayar.
+    """
+    awal = awal_periode_terbuka(conn)
+    if awal is not None and str(tanggal) < awal.isoformat():
+        return PERIODE_TUTUP.format(str(tanggal)[:7])
+    return None
+
+
+# === PERHITUNGAN ===
+
+def terapkan_aturan(harian, aturan):
+    """Tambahkan kolom margin dan gaji pada data terjual harian.
+
+    ``harian`` berkolom tanggal, user, total_terjual; ``aturan`` berkolom
+    seperti tabel aturan_margin. Hari tanpa aturan yang berlaku bermargin 0.
+    """
+    import pandas as pd
+
+    # Satu resolusi untuk semua kolom tanggal: pandas 3 menebak resolusi dari
+    # data (kolom kosong jadi [s], teks ISO jadi [us]) dan merge_asof menolak
+    # kunci yang resolusinya berbeda.
+    def waktu(kolom):
+        return pd.to_datetime(kolom, format="ISO8601").astype("datetime64[ns]")
+
+    harian = (harian.assign(tanggal=waktu(harian["tanggal"]))
+              .sort_values("tanggal", kind="stable").reset_index(drop=True))
+    if harian.empty:
+        return harian.assign(margin=pd.Series(dtype="int64"),
+                             gaji=pd.Series(dtype=harian["total_terjual"].dtype))
+    aturan = (aturan.assign(mulai=waktu(aturan["mulai"]), sampai=waktu(aturan["sampai"]))
+              .sort_values("mulai", kind="stable"))
+
+    def cocokkan(kanan, by=None):
+        # Aturan terakhir yang mulai <= tanggal, lalu buang jika sudah berakhir.
+        kunci = [by] if by else []
+        kanan = kanan[["mulai", "sampai", "margin"] + kunci].astype({k: harian[k].dtype for k in kunci})
+        m = pd.merge_asof(harian[["tanggal"] + kunci], kanan, left_on="tanggal", right_on="mulai",
+                          by=by, direction="backward")
+        return m["margin"].where(m["sampai"].isna() | (m["tanggal"] < m["sampai"]))
+
+    khusus = aturan["user"].notna()
+    margin = cocokkan(aturan[khusus], "user").fillna(cocokkan(aturan[~khusus]))
+    harian["margin"] = margin.fillna(0).astype("int64")
+    harian["gaji"] = harian["total_terjual"] * harian["margin"]
+    return harian
+
+
+def hitung(dari=None, sampai=None, conn=None):
+    """Gaji harian per karyawan untuk tanggal [dari, sampai)."""
+    import pandas as pd
+
+    params = (dari or AWAL, sampai or AKHIR)
+    if conn is None:
+        harian = db.read_sql(SQL_HARIAN, params, cache=True)
+        aturan = db.read_sql(SQL_ATURAN, cache=True)
+    else:
+        harian = pd.read_sql_query(SQL_HARIAN, conn, params=params)
+        aturan = pd.read_sql_query(SQL_ATURAN, conn)
+    return terapkan_aturan(harian, aturan)
+
+
+def ringkas(harian):
+    """Total terjual dan gaji per periode dan karyawan."""
+    return (harian.groupby(["periode", "user"], as_index=False, sort=True)[["total_terjual", "gaji"]]
+            .sum())
+
+
+@kinerja.ukur("gaji.rekap_gaji")
+def rekap_gaji():
+    """(ringkasan per periode dan karyawan, rincian harian periode terbuka).
+
+    Periode tertutup dibaca dari snapshot; hanya periode terbuka yang dihitung.
+    """
+    import pandas as pd
+
+    tertutup = db.read_sql(SQL_TERTUTUP, cache=True).assign(status="Ditutup")
+    harian = hitung(awal_periode_terbuka())
+    terbuka = ringkas(harian).assign(status="Berjalan")
+    bagian = [df for df in (tertutup, terbuka) if len(df)]
+    ringkasan = pd.concat(bagian, ignore_index=True) if bagian else terbuka
+    return ringkasan, harian
+
+
+def tutup_periode(periode):
+    """Bekukan gaji semua periode terbuka sampai dengan ``periode`` (YYYY-MM).
+
+    Pesan kesalahan atau None.
+    """
+    if periode >= periode_dari(date.today()):
+        return "Periode berjalan belum bisa ditutup."
+    with db.get_pool().transaction() as conn:
+        dari = awal_periode_terbuka(conn)
+        if dari and periode < periode_dari(dari):
+            return f"Periode {periode} sudah ditutup."
+        hasil = ringkas(hitung(dari, _awal_periode(_periode_berikut(periode)), conn))
+        # Bulan tanpa penjualan ikut ditutup supaya periode terbuka berurutan.
+        p = periode_dari(dari) if dari else min(hasil["periode"].min() if len(hasil) else periode, periode)
+        semua = []
+        while p <= periode:
+            semua.append(p)
+            p = _periode_berikut(p)
+        ditutup_pada = datetime.now().isoformat(" ", "seconds")
+        conn.executemany("INSERT INTO periode_tutup (periode, ditutup_pada) VALUES (?, ?)",
+                         [(p, ditutup_pada) for p in semua])
+        conn.executemany(
+            "INSERT INTO gaji_periode (periode, user, total_terjual, gaji) VALUES (?, ?, ?, ?)",
+            zip(hasil["periode"].tolist(), hasil["user"].tolist(),
+                hasil["total_terjual"].tolist(), hasil["gaji"].tolist()))
+    return None
+
+
+# === ATURAN MARGIN ===
+
+def tambah_aturan(mulai, margin, sampai=None, user=None, keterangan=None):
+    """Tambah aturan margin. Pesan kesalahan atau None.
+
+    Aturan tanpa tanggal akhir yang masih berjalan pada ``mulai`` untuk
+    cakupan yang sama (user yang sama / umum) otomatis diakhiri di ``mulai``;
+    jika aturan baru punya tanggal akhir, aturan lama berlanjut setelahnya.
+    """
+    if margin < 0:
+        return "Margin tidak boleh negatif."
+    if sampai and sampai <= mulai:
+        return "Tanggal akhir harus setelah tanggal mulai."
+    mulai, sampai = mulai.isoformat(), sampai.isoformat() if sampai else None
+    with db.get_pool().transaction() as conn:
+        dari = awal_periode_terbuka(conn)
+        if dari and mulai < dari.isoformat():
+            return f"Periode sebelum {dari:%d-%m-%Y} sudah ditutup; aturan harus mulai setelahnya."
+        bentrok = conn.execute(
+            "SELECT id, mulai, sampai FROM aturan_margin"
+            " WHERE user IS ? AND (sampai IS NULL OR sampai > ?) AND (? IS NULL OR mulai < ?)",
+            (user, mulai, sampai, sampai)).fetchall()
+        # Cek semua dulu: keluar dari blok with berarti commit.
+        for id_, m, s in bentrok:
+            if s is not None or m >= mulai:
+                return f"Rentang tanggal bertabrakan dengan aturan #{id_}."
+        for id_, _, _ in bentrok:
+            conn.execute("UPDATE aturan_margin SET sampai = ? WHERE id = ?", (mulai, id_))
+            if sampai:
+                conn.execute(
+                    "INSERT INTO aturan_margin (mulai, user, margin, keterangan)"
+                    " SELECT ?, user, margin, keterangan FROM aturan_margin WHERE id = ?",
+                    (sampai, id_))
+        conn.execute(
+            "INSERT INTO aturan_margin (mulai, sampai, user, margin, keterangan) VALUES (?, ?, ?, ?, ?)",
+            (mulai, sampai, user, margin, keterangan or None))
+    return None
+
+
+def hapus_aturan(id_):
+    """Hapus aturan yang belum dipakai periode tertutup. Pesan kesalahan atau None."""
+    with db.get_pool().transaction() as conn:
+        row = conn.execute("SELECT mulai FROM aturan_margin WHERE id = ?", (id_,)).fetchone()
+        if row is None:
+            return f"Aturan #{id_} tidak ditemukan."
+        dari = awal_periode_terbuka(conn)
+        if dari and row[0] < dari.isoformat():
+            return "Aturan ini dipakai periode yang sudah ditutup."
+        conn.execute("DELETE FROM aturan_margin WHERE id = ?", (id_,))
+    return None
+
+
+# === TAMPILAN ===
+
+def tampilkan(karyawan):
+    """Menu "Gaji Karyawan": aturan margin, gaji per periode, tutup periode."""
+    import streamlit as st
+
+    from dhn import ekspor
+
+    st.subheader("Aturan Margin per Kerupuk")
+    aturan = db.read_sql(SQL_ATURAN, cache=True)
+    st.dataframe(aturan.fillna({"user": "(semua)", "sampai": "-", "keterangan": ""}), hide_index=True)
+    with st.expander("Ubah aturan margin"):
+        kol1, kol2 = st.columns(2)
+        mulai = kol1.date_input("Berlaku mulai", date.today(), key="aturan_mulai")
+        pakai_akhir = kol2.checkbox("Ada tanggal akhir", key="aturan_pakai_akhir")
+        sampai = kol2.date_input("Sampai (tidak termasuk)", date.today(), key="aturan_sampai",
+                                 disabled=not pakai_akhir)
+        user = st.selectbox("Berlaku untuk", [None] + list(karyawan), key="aturan_user",
+                            format_func=lambda u: "Semua karyawan" if u is None else u)
+        margin = st.number_input("Margin per kerupuk (Rp)", min_value=0, value=1000, step=100,
+                                 key="aturan_margin")
+        keterangan = st.text_input("Keterangan", key="aturan_keterangan")
+        if st.button("Tambah Aturan"):
+            pesan = tambah_aturan(mulai, int(margin), sampai if pakai_akhir else None, user, keterangan)
+            if pesan:
+                st.error(pesan)
+            else:
+                st.success("Aturan ditambahkan.")
+                st.rerun()
+        if len(aturan):
+            id_ = st.selectbox("Hapus aturan", aturan["id"].tolist(), key="aturan_hapus",
+                               format_func=lambda i: f"#{i}")
+            if st.button("Hapus"):
+                pesan = hapus_aturan(id_)
+                if pesan:
+                    st.error(pesan)
+                else:
+                    st.rerun()
+
+    ringkasan, harian = rekap_gaji()
+    if ringkasan.empty:
+        st.info("Belum ada data.")
+        return
+    st.subheader("Gaji per Periode")
+    st.dataframe(ringkasan.rename(columns=KOLOM_TAMPIL), hide_index=True)
+    st.subheader(f"Total Gaji Keseluruhan: Rp {ringkasan['gaji'].sum():,.0f}")
+    if len(harian):
+        with st.expander("Rincian harian periode berjalan"):
+            st.dataframe(harian.rename(columns={"total_terjual": "Terjual", "gaji": "Gaji Hari Itu"}),
+                         hide_index=True)
+
+    bisa_ditutup = sorted(p for p in ringkasan.loc[ringkasan["status"] == "Berjalan", "periode"].unique()
+                          if p < periode_dari(date.today()))
+    if bisa_ditutup:
+        kol_periode, kol_tombol = st.columns([2, 1])
+        periode = kol_periode.selectbox("Tutup periode sampai dengan", bisa_ditutup, key="gaji_tutup")
+        if kol_tombol.button("Tutup Periode"):
+            pesan = tutup_periode(periode)
+            if pesan:
+                st.error(pesan)
+            else:
+                st.success(f"Gaji sampai {periode} dibekukan.")
+                st.rerun()
+    ekspor.tombol_ekspor_df(ringkasan.rename(columns=KOLOM_TAMPIL), "gaji_karyawan",
+                            key="ekspor_gaji", label="Ekspor Gaji")
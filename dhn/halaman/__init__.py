@@ -0,0 +1,55 @@
+"""Halaman aplikasi, satu modul per menu.
+
+Modul halaman baru diimpor ketika menunya dipilih, jadi pandas, grafik dan
+modul berat lain hanya dimuat oleh halaman yang membutuhkannya.
+"""
+import importlib
+
+# Nama menu -> (modul di dhn.halaman, khusus admin)
+MENU = {
+    "Kirim ke Warung": ("kirim", False),
+    "Rekap Penjualan": ("rekap_penjualan", False),
+    "Dashboard": ("dashboard", False),
+    "Laporan Bulanan": ("laporan_bulanan", False),
+    "Tren Warung": ("tren_warung", False),
+    "Gaji Karyawan": ("gaji_karyawan", True),
+    "Kelola User": ("kelola_user", True),
+    "Performance": ("performance", True),
+    "Tugas Latar": ("tugas_latar", True),
+}
+
+
+def daftar_menu(is_admin):
+    return [nama for nama, (_, khusus_admin) in MENU.items() if is_admin or not khusus_admin]
+
+
+def tampilkan(menu, is_admin):
+    """Impor modul halaman untuk ``menu`` (sekali per proses) lalu tampilkan."""
+    import streamlit as st
+
+    modul, khusus_admin = MENU[menu]
+    if khusus_admin and not is_admin:
+        st.error("Menu ini khusus admin.")
+        return
+    importlib.import_module(f"dhn.halaman.{modul}").tampilkan()
+
+
+def user_sesi():
+    """Filter user untuk query: None (semua data) untuk admin."""
+    import streamlit as st
+
+    return None if st.session_state.is_admin else st.session_state.username
+
+
+def tabel_kirim(df):
+    """Tabel baris kirim dengan kolom Pendapatan dan tanggal dd-mm-yyyy."""
+    import pandas as pd
+    import streamlit as st
+
+    from dhn import kinerja
+
+    df["Pendapatan"] = df["jumlah_terjual"] * df["harga_satuan"]
+    with kinerja.ukur("format tanggal"):
+        df["tanggal"] = pd.to_datetime(df["tanggal"], format="ISO8601").dt.strftime("%d-%m-%Y")
+    with kinerja.ukur("st.dataframe"):
+        st.dataframe(df)
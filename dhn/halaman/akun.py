@@ -0,0 +1,46 @@
+"""Login, pendaftaran dan ganti password (sebelum login)."""
+import streamlit as st
+
+from dhn import auth, db
+
+
+def tampilkan():
+    if db.fetchone("SELECT COUNT(*) FROM users WHERE is_admin = 1", cache=True)[0] == 0:
+        st.info("Belum ada admin. User pertama yang mendaftar akan jadi admin otomatis.")
+
+    pilihan = st.sidebar.selectbox("Login / Daftar", ["Login", "Daftar", "Ganti Password"])
+    if pilihan == "Login":
+        st.subheader("Login")
+        username = st.text_input("Username")
+        password = st.text_input("Password", type="password")
+        if st.button("Masuk"):
+            user, pesan = auth.login(username, password, auth.alamat_ip())
+            if user:
+                st.session_state.logged_in = True
+                st.session_state.username = username
+                st.session_state.is_admin = bool(user[2])
+                st.success("Login berhasil!")
+                st.rerun()
+            else:
+                st.error(pesan)
+    elif pilihan == "Daftar":
+        st.subheader("Buat Akun Baru")
+        username = st.text_input("Username Baru")
+        password = st.text_input("Password Baru", type="password")
+        if st.button("Daftar"):
+            pesan = auth.daftar(username, password)
+            if pesan:
+                st.error(pesan)
+            else:
+                st.success("Akun berhasil dibuat. Silakan login.")
+    else:
+        st.subheader("Ganti Password")
+        username = st.text_input("Username")
+        lama = st.text_input("Password Lama", type="password")
+        baru = st.text_input("Password Baru", type="password")
+        if st.button("Update Password"):
+            pesan = auth.ganti_password(username, lama, baru, auth.alamat_ip())
+            if pesan:
+                st.error(pesan)
+            else:
+                st.success("Password berhasil diperbarui.")
@@ -0,0 +1,51 @@
+"""Menu "Dashboard": pengiriman hari ini dan pendapatan per warung.
+
+Metrik, grafik dan daftar pengiriman terbaru ada di dalam st.fragment yang
+dijalankan ulang tiap INTERVAL detik; hanya bagian itu yang digambar ulang
+dan datanya hanya baris kirim baru (dhn.langsung).
+"""
+from datetime import date
+
+import streamlit as st
+
+from dhn import db, langsung
+from dhn.halaman import tabel_kirim, user_sesi
+
+INTERVAL = 5  # detik
+KOLOM_TERBARU = ["id", "warung_id", "warung", "jumlah_kirim", "jumlah_terjual", "Pendapatan", "user"]
+
+
+def _langsung(hari_ini, user):
+    total = langsung.total_harian(hari_ini, user)
+    sebelum = total.total()
+    baru = total.perbarui()
+    kirim, terjual, pendapatan, baris = total.total()
+    if not baris:
+        st.info("Belum ada data hari ini.")
+        return
+    kol = st.columns(3)
+    kol[0].metric("Pendapatan Hari Ini", f"Rp {pendapatan:,.0f}",
+                  f"Rp {pendapatan - sebelum[2]:,.0f}" if baru else None)
+    kol[1].metric("Kerupuk Terjual", f"{terjual:,}", f"{terjual - sebelum[1]:,}" if baru else None)
+    kol[2].metric("Tidak Laku", f"{kirim - terjual:,}", f"{baris:,} pengiriman", delta_color="off")
+    st.bar_chart(total.tabel().set_index("warung")["Pendapatan"])
+    st.subheader("Pengiriman Terbaru")
+    st.dataframe([dict(zip(KOLOM_TERBARU, row)) for row in reversed(total.terbaru)], hide_index=True)
+
+
+def tampilkan():
+    st.header("Dashboard Harian")
+    hari_ini = date.today()
+    user = user_sesi()
+    otomatis = st.toggle("Perbarui otomatis", value=True, help=f"Cek pengiriman baru tiap {INTERVAL} detik.")
+    st.fragment(run_every=INTERVAL if otomatis else None)(_langsung)(hari_ini, user)
+
+    if st.toggle("Tampilkan semua baris hari ini"):
+        sql = "SELECT * FROM kirim_aktif WHERE tanggal = ?"
+        params = [hari_ini]
+        if user is not None:
+            sql += " AND user = ?"
+            params.append(user)
+        df = db.read_sql(sql, params, cache=True)
+        if not df.empty:
+            tabel_kirim(df)
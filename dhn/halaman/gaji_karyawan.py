@@ -0,0 +1,16 @@
+"""Menu "Gaji Karyawan" (admin)."""
+import streamlit as st
+
+from dhn import db, gaji
+
+
+def tampilkan():
+    st.header("Perhitungan Gaji Karyawan")
+    st.subheader("Daftar Karyawan")
+    karyawan = [u for (u,) in db.fetchall("SELECT username FROM users WHERE is_admin = 0 ORDER BY username",
+                                          cache=True)]
+    if karyawan:
+        st.dataframe({"Nama Karyawan": karyawan})
+    else:
+        st.info("Belum ada karyawan terdaftar.")
+    gaji.tampilkan(karyawan)
@@ -0,0 +1,19 @@
+"""Menu "Kelola User" (admin): daftar user dan hak akses admin."""
+import streamlit as st
+
+from dhn import db
+
+
+def tampilkan():
+    st.header("Manajemen User")
+    users = db.fetchall("SELECT username, is_admin FROM users ORDER BY username", cache=True)
+    st.dataframe({"username": [u for u, _ in users], "admin": [bool(a) for _, a in users]})
+    bukan_admin = [u for u, a in users if not a]
+    if not bukan_admin:
+        st.info("Tidak ada user biasa untuk dipromosikan.")
+        return
+    pilihan = st.selectbox("Pilih user untuk jadi admin", bukan_admin)
+    if st.button("Jadikan Admin"):
+        db.execute("UPDATE users SET is_admin = 1 WHERE username = ?", (pilihan,))
+        st.success(f"{pilihan} sekarang admin!")
+        st.rerun()
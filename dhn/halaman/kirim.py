@@ -0,0 +1,44 @@
+"""Menu "Kirim ke Warung": input satu per satu atau batch."""
+from datetime import date
+
+import streamlit as st
+
+from dhn import gaji, master_warung, pengiriman, ramalan
+
+
+def _saran(tgl, warung):
+    """Isi awal Jumlah Dikirim dari ramalan setiap kali warung/tanggal berganti."""
+    if not ramalan.fit_jika_perlu():
+        return None
+    saran = ramalan.saran_untuk_nama(warung, tgl)
+    kunci = (tgl, master_warung.normalisasi(warung or ""))
+    if st.session_state.get("saran_untuk") != kunci:
+        st.session_state.saran_untuk = kunci
+        if saran:
+            st.session_state.jumlah_kirim = saran["kirim"]
+    return saran
+
+
+def tampilkan():
+    st.header("Input Pengiriman")
+    mode = st.radio("Mode input", ["Satu per satu", "Batch (banyak warung)"], horizontal=True)
+    if mode != "Satu per satu":
+        pengiriman.tampilkan_batch(st.session_state.username)
+        return
+    tgl = st.date_input("Tanggal", date.today())
+    warung = master_warung.input_nama()
+    saran = _saran(tgl, warung)
+    kirim = st.number_input("Jumlah Dikirim", min_value=0, key="jumlah_kirim")
+    if saran:
+        st.caption(f"Saran {saran['kirim']} · perkiraan terjual {saran['perkiraan']:.0f} · "
+                   f"perkiraan tidak laku untuk {kirim}: "
+                   f"{ramalan.tidak_laku(kirim, saran['perkiraan'], saran['sigma']):.0f}")
+    jual = st.number_input("Jumlah Terjual", min_value=0)
+    harga = st.number_input("Harga Satuan (Rp)", min_value=0)
+    if st.button("Simpan"):
+        pesan = gaji.cek_periode(tgl) or pengiriman.validasi(warung, kirim, jual)
+        if pesan:
+            st.warning(pesan)
+        else:
+            pengiriman.simpan(tgl, warung, kirim, jual, harga, st.session_state.username)
+            st.success("Data disimpan!")
@@ -0,0 +1,29 @@
+"""Menu "Laporan Bulanan": baris kirim satu bulan, total dan ekspor."""
+from datetime import date
+
+import streamlit as st
+
+from dhn import db, ekspor, pekerja, rekap
+from dhn.halaman import tabel_kirim, user_sesi
+
+
+def tampilkan():
+    st.header("Laporan Bulanan")
+    bulan = st.selectbox("Pilih Bulan", list(range(1, 13)), format_func=lambda x: f"{x:02}")
+    tahun = st.number_input("Tahun", value=date.today().year, step=1)
+    user = user_sesi()
+    where = " WHERE tanggal >= ? AND tanggal < ?"
+    params = list(db.month_range(tahun, bulan))
+    if user is not None:
+        where += " AND user = ?"
+        params.append(user)
+    df = db.read_sql("SELECT * FROM kirim_aktif" + where, params, cache=True)
+    if df.empty:
+        st.info(f"Belum ada data untuk bulan {bulan:02}/{tahun}.")
+        return
+    tabel_kirim(df)
+    st.subheader(f"Total Pendapatan Bulan {bulan:02}/{tahun}: Rp {rekap.total_bulanan(tahun, bulan, user):,.0f}")
+    # File semua user disiapkan tiap malam oleh pekerja latar (dhn.pekerja).
+    siap = pekerja.laporan_siap(f"{tahun:04}-{bulan:02}") if user is None else None
+    ekspor.tombol_ekspor(ekspor.SQL_KIRIM + where, params, "laporan_bulanan",
+                         key="ekspor_bulanan", label="Ekspor Excel", siap=siap)
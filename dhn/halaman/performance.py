@@ -0,0 +1,9 @@
+"""Menu "Performance" (admin): waktu per bagian, query lambat, cProfile."""
+import streamlit as st
+
+from dhn import db, kinerja
+
+
+def tampilkan():
+    st.header("Performance")
+    kinerja.tampilkan(db.get_pool().path)
@@ -0,0 +1,26 @@
+"""Menu "Rekap Penjualan": tabel berhalaman, total, ekspor dan koreksi."""
+import streamlit as st
+
+from dhn import ekspor, koreksi, paginasi, rekap
+from dhn.halaman import user_sesi
+
+
+def tampilkan():
+    st.header("Rekap Penjualan")
+    if st.session_state.is_admin:
+        pilihan = st.selectbox("Filter berdasarkan User", ["Semua"] + rekap.daftar_user())
+        user = None if pilihan == "Semua" else pilihan
+    else:
+        user = user_sesi()
+    warung = st.text_input("Filter Nama Warung (opsional)")
+
+    # Hanya halaman yang tampil yang dibaca; total dari tabel rekap.
+    total = paginasi.tampilkan(user, warung)
+    if total is not None:
+        st.subheader(f"Total Pendapatan: Rp {total:,.0f}")
+        # File ekspor dialirkan dari SQLite hanya saat diminta, bukan tiap rerun.
+        where, params = paginasi.filter_kirim(user, warung)
+        ekspor.tombol_ekspor(ekspor.SQL_KIRIM + where, params, "rekap", key="ekspor_rekap")
+
+    # ID pada kolom "id" tabel di atas dipakai untuk ubah/hapus.
+    koreksi.tampilkan(st.session_state.username, st.session_state.is_admin)
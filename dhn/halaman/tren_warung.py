@@ -0,0 +1,51 @@
+"""Menu "Tren Warung": pendapatan per warung per bulan selama beberapa tahun."""
+from datetime import date
+
+import streamlit as st
+
+from dhn import arsip, db, ekspor
+from dhn.halaman import user_sesi
+
+TOP = 10
+
+
+def tampilkan():
+    st.header("Tren Warung")
+    pertama = db.fetchone("SELECT MIN(bulan) FROM rekap_bulanan", cache=True)[0]
+    if pertama is None:
+        st.info("Belum ada data.")
+        return
+    sekarang = date.today().isoformat()[:7]
+    daftar_tahun = list(range(int(pertama[:4]), int(sekarang[:4]) + 1))
+    tahun = st.selectbox("Mulai tahun", daftar_tahun, index=max(0, len(daftar_tahun) - 5))
+
+    df = arsip.tren_per_warung(f"{tahun}-01", sekarang, user_sesi())
+    sumber = df.attrs["sumber"]
+    st.caption(f"{len(sumber['arsip'])} bulan dari arsip Parquet ({sumber['mesin']}), "
+               "sisanya dari SQLite.")
+    if df.empty:
+        st.info("Tidak ada data.")
+        return
+
+    df["tahun"] = df["bulan"].str[:4]
+    per_tahun = df.pivot_table(index="warung", columns="tahun", values="pendapatan", aggfunc="sum",
+                               fill_value=0)
+    per_tahun["Total"] = per_tahun.sum(axis=1)
+    per_tahun = per_tahun.sort_values("Total", ascending=False)
+    st.subheader(f"{TOP} Warung Teratas per Bulan")
+    teratas = df[df["warung"].isin(per_tahun.index[:TOP])]
+    st.line_chart(teratas.pivot_table(index="bulan", columns="warung", values="pendapatan",
+                                      aggfunc="sum"))
+    st.subheader("Pendapatan per Tahun")
+    st.dataframe(per_tahun)
+    ekspor.tombol_ekspor_df(df.drop(columns="tahun"), "tren_warung", key="ekspor_tren")
+
+    if st.session_state.is_admin:
+        if st.button("Perbarui arsip Parquet"):
+            try:
+                with st.spinner("Mengarsipkan bulan yang sudah lewat ..."):
+                    ditulis, dihapus = arsip.snapshot()
+            except ImportError:
+                st.error("Arsip Parquet butuh paket pyarrow.")
+            else:
+                st.success(f"{len(ditulis)} bulan diarsipkan, {len(dihapus)} dihapus.")
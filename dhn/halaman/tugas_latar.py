@@ -0,0 +1,45 @@
+"""Menu "Tugas Latar" (admin): status pekerja, jadwal dan riwayat tugas."""
+import streamlit as st
+
+from dhn import db, pekerja
+
+KOLOM = ["id", "jenis", "status", "jadwal", "mulai", "durasi_ms", "pesan"]
+
+
+def tampilkan():
+    st.header("Tugas Latar")
+    hidup, detak = pekerja.status_pekerja(db.get_pool().path)
+    if hidup:
+        st.success(f"Pekerja berjalan (pid {detak['pid']}, detak terakhir {detak['waktu']}).")
+    else:
+        terakhir = f" Detak terakhir {detak['waktu']}." if detak else ""
+        st.warning("Pekerja latar tidak berjalan. Jalankan: python -m dhn.pekerja." + terakhir)
+
+    kol_jenis, kol_tombol = st.columns([2, 1])
+    jenis = kol_jenis.selectbox("Tugas", list(pekerja.TUGAS))
+    if kol_tombol.button("Antrekan sekarang"):
+        st.success(f"Tugas {jenis} diantrekan (id {pekerja.antrekan(jenis)}).")
+
+    st.subheader("Ringkasan per Tugas")
+    ringkasan = db.fetchall("""
+        SELECT jenis,
+               MAX(CASE WHEN status = 'selesai' THEN mulai END),
+               (SELECT t.status FROM tugas AS t WHERE t.jenis = tugas.jenis AND t.status IN ('selesai', 'gagal')
+                ORDER BY t.id DESC LIMIT 1),
+               AVG(CASE WHEN status = 'selesai' THEN durasi_ms END),
+               MAX(durasi_ms),
+               MIN(CASE WHEN status = 'antre' THEN jadwal END)
+        FROM tugas GROUP BY jenis ORDER BY jenis
+    """, cache=True)
+    if ringkasan:
+        st.dataframe([dict(zip(["jenis", "terakhir sukses", "status terakhir", "rata ms", "maks ms",
+                                "jadwal berikut"], row)) for row in ringkasan],
+                     hide_index=True, width="stretch")
+
+    st.subheader("Riwayat")
+    riwayat = db.fetchall(f"SELECT {', '.join(KOLOM)} FROM tugas WHERE status != 'antre'"
+                          " ORDER BY id DESC LIMIT 100", cache=True)
+    if riwayat:
+        st.dataframe([dict(zip(KOLOM, row)) for row in riwayat], hide_index=True, width="stretch")
+    else:
+        st.info("Belum ada tugas yang dikerjakan.")
@@ -0,0 +1,235 @@
+"""Pengukuran waktu bagian aplikasi: query, cabang menu, transformasi data.
+
+    with kinerja.ukur("format tanggal"):
+        ...
+
+    @kinerja.ukur("auth.login")
+    def login(...): ...
+
+Durasi disimpan per nama dalam jendela bergulir (JENDELA sampel terakhir)
+untuk p50/p95. Semua query lewat dhn.db diukur otomatis; query yang lebih
+lambat dari LAMBAT_MS dicatat ke tabel query_lambat di database terpisah
+(``kerupuk-kinerja.db``) supaya pencatatan tidak dianggap perubahan data dan
+tidak mengosongkan cache query. Admin bisa meminta satu rerun diprofil
+dengan cProfile dari menu Performance.
+"""
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+JENDELA = 500
+LAMBAT_MS = float(os.environ.get("KERUPUK_LAMBAT_MS", "250"))
+SIMPAN_LAMBAT = 1000  # baris query_lambat yang disimpan
+_SPASI = re.compile(r"\s+")
+
+
+class Statistik:
+    """Sampel durasi terakhir per nama, untuk p50/p95."""
+
+    def __init__(self, jendela=JENDELA):
+        self.jendela = jendela
+        self._sampel = {}
+        self._jumlah = {}
+        self._lock = threading.Lock()
+
+    def catat(self, nama, ms):
+        with self._lock:
+            self._sampel.setdefault(nama, deque(maxlen=self.jendela)).append(ms)
+            self._jumlah[nama] = self._jumlah.get(nama, 0) + 1
+
+    def ringkasan(self):
+        """Daftar dict per nama, diurutkan dari total waktu terbesar."""
+        with self._lock:
+            salinan = {nama: sorted(sampel) for nama, sampel in self._sampel.items()}
+            jumlah = dict(self._jumlah)
+        hasil = []
+        for nama, sampel in salinan.items():
+            n = len(sampel)
+            hasil.append({
+                "nama": nama,
+                "jumlah": jumlah[nama],
+                "p50 ms": sampel[n // 2],
+                "p95 ms": sampel[min(n - 1, n * 95 // 100)],
+                "maks ms": sampel[-1],
+                "total ms": sum(sampel),
+            })
+        return sorted(hasil, key=lambda r: r["total ms"], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._sampel.clear()
+            self._jumlah.clear()
+
+
+STAT = Statistik()
+
+
+class ukur:
+    """Context manager / decorator yang mencatat durasi ke STAT."""
+
+    def __init__(self, nama):
+        self.nama = nama
+
+    def __enter__(self):
+        self._mulai = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        STAT.catat(self.nama, (time.perf_counter() - self._mulai) * 1000)
+        return False
+
+    def __call__(self, fn):
+        @functools.wraps(fn)
+        def terukur(*args, **kwargs):
+            with ukur(self.nama):
+                return fn(*args, **kwargs)
+        return terukur
+
+
+# === QUERY LAMBAT ===
+
+def path_log(db_path):
+    return os.path.splitext(db_path)[0] + "-kinerja.db"
+
+
+_log = {}
+_log_lock = threading.Lock()
+
+
+def _koneksi_log(db_path):
+    # Dipanggil dengan _log_lock terkunci.
+    path = path_log(db_path)
+    conn = _log.get(path)
+    if conn is None:
+        conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA busy_timeout=1000")
+        conn.execute("""
+        CREATE TABLE IF NOT EXISTS query_lambat (
+            id INTEGER PRIMARY KEY,
+            waktu TEXT NOT NULL,
+            durasi_ms REAL NOT NULL,
+            sql TEXT NOT NULL,
+            params TEXT
+        )
+        """)
+        _log[path] = conn
+    return conn
+
+
+def ringkas_sql(sql, panjang=90):
+    teks = _SPASI.sub(" ", sql).strip()
+    return teks if len(teks) <= panjang else teks[:panjang - 1] + "…"
+
+
+def catat_query(sql, params, ms, db_path):
+    """Catat durasi satu query; yang lambat juga masuk query_lambat."""
+    STAT.catat("sql: " + ringkas_sql(sql), ms)
+    if ms < LAMBAT_MS:
+        return
+    try:
+        teks_params = json.dumps(list(params), default=str)
+    except TypeError:
+        teks_params = json.dumps({k: str(v) for k, v in dict(params).items()})
+    try:
+        with _log_lock:
+            conn = _koneksi_log(db_path)
+            conn.execute("INSERT INTO query_lambat (waktu, durasi_ms, sql, params) VALUES (?, ?, ?, ?)",
+                         (datetime.now().isoformat(" ", "seconds"), round(ms, 1), sql, teks_params))
+            conn.execute("DELETE FROM query_lambat WHERE id <= (SELECT MAX(id) FROM query_lambat) - ?",
+                         (SIMPAN_LAMBAT,))
+    except sqlite3.Error:
+        # Log kinerja tidak boleh menggagalkan query aplikasi.
+        pass
+
+
+def query_lambat(db_path, batas=100):
+    with _log_lock:
+        conn = _koneksi_log(db_path)
+        return conn.execute(
+            "SELECT waktu, durasi_ms, sql, params FROM query_lambat ORDER BY id DESC LIMIT ?",
+            (batas,)).fetchall()
+
+
+# === PROFIL cProfile ===
+
+PROFIL = deque(maxlen=5)  # (waktu, label, teks pstats) terbaru
+
+
+@contextmanager
+def profil(label):
+    prof = cProfile.Profile()
+    try:
+        prof.enable()
+    except ValueError:
+        # Python 3.12+: hanya satu profiler aktif per proses.
+        yield
+        return
+    try:
+        yield
+    finally:
+        prof.disable()
+        keluaran = io.StringIO()
+        pstats.Stats(prof, stream=keluaran).sort_stats("cumulative").print_stats(40)
+        PROFIL.appendleft((datetime.now().isoformat(" ", "seconds"), label, keluaran.getvalue()))
+
+
+@contextmanager
+def halaman(menu):
+    """Ukur satu cabang menu; diprofil bila admin memintanya untuk rerun ini."""
+    import streamlit as st
+
+    with ukur(f"menu: {menu}"):
+        if st.session_state.pop("kinerja_profil", False):
+            with profil(f"menu: {menu}"):
+                yield
+        else:
+            yield
+
+
+# === TAMPILAN ===
+
+def tampilkan(db_path):
+    """Menu "Performance" (khusus admin)."""
+    import streamlit as st
+
+    st.subheader("Waktu per Bagian")
+    st.caption(f"{JENDELA} sampel terakhir per nama sejak proses dimulai.")
+    ringkasan = STAT.ringkasan()
+    if ringkasan:
+        st.dataframe(ringkasan, hide_index=True, width="stretch",
+                     column_config={k: st.column_config.NumberColumn(format="%.1f")
+                                    for k in ("p50 ms", "p95 ms", "maks ms", "total ms")})
+    else:
+        st.info("Belum ada pengukuran.")
+    if st.button("Reset statistik"):
+        STAT.reset()
+        st.rerun()
+
+    st.subheader(f"Query Lambat (≥ {LAMBAT_MS:.0f} ms)")
+    lambat = query_lambat(db_path)
+    if lambat:
+        st.dataframe([{"waktu": waktu, "durasi ms": ms, "sql": ringkas_sql(sql, 500), "params": params}
+                      for waktu, ms, sql, params in lambat],
+                     hide_index=True, width="stretch")
+    else:
+        st.info("Belum ada query lambat.")
+
+    st.subheader("Profil cProfile")
+    if st.button("Profil rerun berikutnya"):
+        st.session_state.kinerja_profil = True
+    if st.session_state.get("kinerja_profil"):
+        st.info("Rerun berikutnya (mis. setelah memilih menu) akan diprofil.")
+    for waktu, label, teks in PROFIL:
+        with st.expander(f"{waktu} · {label}"):
+            st.code(teks, language=None)
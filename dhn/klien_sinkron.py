@@ -0,0 +1,221 @@
+"""Klien sinkron offline-first: pengganti lokal aplikasi sopir di lapangan.
+
+catat() hanya menulis ke file SQLite lokal (tanpa jaringan), jadi mencatat
+tetap jalan ketika sinyal hilang. sinkron() mengirim antrean per batch ke
+``POST /sinkron`` (body gzip), menghapus baris yang diterima atau sudah ada
+di server, lalu menerapkan perubahan dari server ke salinan lokal dan
+menyimpan watermark-nya. Koneksi yang putus di tengah jalan cukup diulang:
+UUID membuat batch yang sama aman dikirim lagi.
+
+    python -m dhn.klien_sinkron --user sopir1 catat "Warung Bu Sri" 50 40 5000
+    python -m dhn.klien_sinkron --user sopir1 sinkron
+    python -m dhn.klien_sinkron --user sopir1 status
+
+Password diambil dari --password atau variabel lingkungan KERUPUK_PASSWORD.
+"""
+import argparse
+import gzip
+import http.client
+import json
+import os
+import sqlite3
+import uuid as uuidlib
+from datetime import date, datetime
+from urllib.parse import urlparse
+
+BATCH = 500  # baris per permintaan /sinkron (maksimal dhn.api.MAKS_BARIS)
+TIMEOUT = 30  # detik per permintaan
+SKEMA = (
+    # Antrean yang belum diterima server; alasan terisi jika server menolak.
+    """CREATE TABLE IF NOT EXISTS antrean (
+        uuid TEXT PRIMARY KEY, data TEXT NOT NULL, dibuat TEXT NOT NULL, alasan TEXT)""",
+    # Salinan baris server milik user ini.
+    """CREATE TABLE IF NOT EXISTS salinan (
+        id INTEGER PRIMARY KEY, uuid TEXT, tanggal TEXT, warung TEXT,
+        jumlah_kirim INTEGER, jumlah_terjual INTEGER, harga_satuan INTEGER)""",
+    "CREATE TABLE IF NOT EXISTS meta (kunci TEXT PRIMARY KEY, nilai TEXT)",
+)
+KOLOM_SALINAN = ("id", "uuid", "tanggal", "warung", "jumlah_kirim", "jumlah_terjual", "harga_satuan")
+
+
+class GagalSinkron(Exception):
+    """Server menolak permintaan (bukan masalah jaringan)."""
+
+
+class KlienSinkron:
+    """Antrean lokal + sinkron ke server dhn.api untuk satu user."""
+
+    def __init__(self, url, username, password, path="kerupuk-klien.db", batch=BATCH):
+        alamat = urlparse(url)
+        self.host, self.port = alamat.hostname, alamat.port or 80
+        self.username, self.password = username, password
+        self.batch = batch
+        self.lokal = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.lokal.execute("PRAGMA journal_mode = WAL")
+        for sql in SKEMA:
+            self.lokal.execute(sql)
+        self._conn = None
+        self._token = None
+
+    # === LOKAL ===
+
+    def catat(self, warung, jumlah_kirim, jumlah_terjual, harga_satuan, tanggal=None):
+        """Simpan satu pengiriman ke antrean lokal; kembalikan UUID-nya."""
+        kunci = str(uuidlib.uuid4())
+        data = {"uuid": kunci, "tanggal": (tanggal or date.today()).isoformat(), "warung": warung,
+                "jumlah_kirim": jumlah_kirim, "jumlah_terjual": jumlah_terjual, "harga_satuan": harga_satuan}
+        self.lokal.execute("INSERT INTO antrean (uuid, data, dibuat) VALUES (?, ?, ?)",
+                           (kunci, json.dumps(data), datetime.now().isoformat(" ", "seconds")))
+        return kunci
+
+    def tertunda(self):
+        """Jumlah baris antrean yang belum diterima server (tanpa yang ditolak)."""
+        return self.lokal.execute("SELECT COUNT(*) FROM antrean WHERE alasan IS NULL").fetchone()[0]
+
+    def ditolak(self):
+        """[(uuid, data, alasan)] baris yang ditolak server dan perlu diperbaiki."""
+        return [(u, json.loads(d), a) for u, d, a in self.lokal.execute(
+            "SELECT uuid, data, alasan FROM antrean WHERE alasan IS NOT NULL ORDER BY dibuat")]
+
+    def watermark(self):
+        row = self.lokal.execute("SELECT nilai FROM meta WHERE kunci = 'watermark'").fetchone()
+        return row[0] if row else None
+
+    def salinan(self):
+        return self.lokal.execute("SELECT COUNT(*) FROM salinan").fetchone()[0]
+
+    # === JARINGAN ===
+
+    def _http(self, method, path, body, header):
+        """(status, header, body) untuk satu permintaan lewat koneksi keep-alive."""
+        if self._conn is None:
+            self._conn = http.client.HTTPConnection(self.host, self.port, timeout=TIMEOUT)
+        try:
+            self._conn.request(method, path, body, header)
+            resp = self._conn.getresponse()
+            return resp.status, dict(resp.getheaders()), resp.read()
+        except (OSError, http.client.HTTPException):
+            self._conn.close()
+            self._conn = None
+            raise
+
+    def _post(self, path, data, auth=True):
+        body = gzip.compress(json.dumps(data).encode(), compresslevel=5)
+        header = {"Content-Type": "application/json", "Content-Encoding": "gzip",
+                  "Accept-Encoding": "gzip"}
+        for _ in range(2):
+            if auth:
+                header["Authorization"] = f"Bearer {self._token or self._login()}"
+            status, resp_header, isi = self._http("POST", path, body, header)
+            if resp_header.get("Content-Encoding") == "gzip":
+                isi = gzip.decompress(isi)
+            if status != 401 or not auth:
+                break
+            self._token = None  # token kedaluwarsa: login ulang sekali
+        hasil = json.loads(isi or b"null")
+        if status >= 400:
+            raise GagalSinkron(f"{status}: {hasil.get('error') if isinstance(hasil, dict) else hasil}")
+        return hasil
+
+    def _login(self):
+        self._token = self._post("/login", {"username": self.username, "password": self.password},
+                                 auth=False)["token"]
+        return self._token
+
+    # === SINKRON ===
+
+    def sinkron(self):
+        """Kirim seluruh antrean lalu tarik perubahan server sampai habis.
+
+        Mengembalikan ringkasan (jumlah permintaan, diterima, duplikat,
+        ditolak, ditarik, dihapus). Kesalahan jaringan diteruskan; antrean
+        yang belum terkonfirmasi tetap ada dan aman dikirim ulang.
+        """
+        ringkasan = dict.fromkeys(("permintaan", "diterima", "duplikat", "ditolak", "ditarik", "dihapus"), 0)
+        while True:
+            antrean = self.lokal.execute(
+                "SELECT uuid, data FROM antrean WHERE alasan IS NULL ORDER BY dibuat, rowid LIMIT ?",
+                (self.batch,)).fetchall()
+            hasil = self._post("/sinkron", {"watermark": self.watermark(),
+                                            "kirim": [json.loads(data) for _, data in antrean]})
+            self._terapkan(antrean, hasil)
+            ringkasan["permintaan"] += 1
+            for kunci in ("diterima", "duplikat"):
+                ringkasan[kunci] += hasil[kunci]
+            ringkasan["ditolak"] += len(hasil["ditolak"])
+            ringkasan["ditarik"] += len(hasil["baru"])
+            ringkasan["dihapus"] += len(hasil["dihapus"])
+            if len(antrean) < self.batch and not hasil["lagi"]:
+                return ringkasan
+
+    def _terapkan(self, antrean, hasil):
+        # Satu transaksi lokal: antrean, salinan dan watermark selalu cocok.
+        ditolak = {d["uuid"]: d["alasan"] for d in hasil["ditolak"]}
+        lokal = self.lokal
+        lokal.execute("BEGIN")
+        try:
+            lokal.executemany("UPDATE antrean SET alasan = ? WHERE uuid = ?",
+                              [(alasan, kunci) for kunci, alasan in ditolak.items()])
+            lokal.executemany("DELETE FROM antrean WHERE uuid = ?",
+                              [(kunci,) for kunci, _ in antrean if kunci not in ditolak])
+            if hasil["ulang"]:
+                lokal.execute("DELETE FROM salinan")
+            lokal.executemany("DELETE FROM salinan WHERE id = ?", [(d["id"],) for d in hasil["dihapus"]])
+            lokal.executemany(
+                f"INSERT OR REPLACE INTO salinan VALUES ({', '.join('?' * len(KOLOM_SALINAN))})",
+                [tuple(row[k] for k in KOLOM_SALINAN) for row in hasil["baru"]])
+            lokal.execute("INSERT OR REPLACE INTO meta VALUES ('watermark', ?)", (hasil["watermark"],))
+        except BaseException:
+            lokal.execute("ROLLBACK")
+            raise
+        lokal.execute("COMMIT")
+
+    def tutup(self):
+        if self._conn is not None:
+            self._conn.close()
+        self.lokal.close()
+
+
+# === CLI ===
+
+def main():
+    parser = argparse.ArgumentParser(description="Klien sinkron offline-first untuk API kerupuk.")
+    parser.add_argument("--url", default="http://127.0.0.1:8502")
+    parser.add_argument("--user", required=True)
+    parser.add_argument("--password", default=os.environ.get("KERUPUK_PASSWORD", ""))
+    parser.add_argument("--lokal", default="kerupuk-klien.db", help="file SQLite lokal klien")
+    sub = parser.add_subparsers(dest="perintah", required=True)
+    catat = sub.add_parser("catat", help="simpan satu pengiriman ke antrean lokal")
+    catat.add_argument("warung")
+    catat.add_argument("jumlah_kirim", type=int)
+    catat.add_argument("jumlah_terjual", type=int)
+    catat.add_argument("harga_satuan", type=int)
+    catat.add_argument("--tanggal", type=date.fromisoformat, default=None)
+    sub.add_parser("sinkron", help="kirim antrean dan tarik perubahan server")
+    sub.add_parser("status", help="isi antrean, salinan dan watermark")
+    args = parser.parse_args()
+
+    klien = KlienSinkron(args.url, args.user, args.password, args.lokal)
+    try:
+        if args.perintah == "catat":
+            print(klien.catat(args.warung, args.jumlah_kirim, args.jumlah_terjual, args.harga_satuan,
+                              args.tanggal))
+        elif args.perintah == "sinkron":
+            try:
+                ringkasan = klien.sinkron()
+            except (OSError, http.client.HTTPException) as e:
+                print(f"Server tidak terjangkau ({e}); {klien.tertunda()} baris tetap di antrean.")
+                return
+            print(", ".join(f"{k} {v}" for k, v in ringkasan.items()))
+        print(f"antrean {klien.tertunda()}, ditolak {len(klien.ditolak())}, salinan {klien.salinan()}, "
+              f"watermark {klien.watermark()}")
+        for kunci, data, alasan in klien.ditolak():
+            print(f"  ditolak {kunci}: {alasan} {data}")
+    except GagalSinkron as e:
+        raise SystemExit(f"Sinkron ditolak server: {e}")
+    finally:
+        klien.tutup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+"""Ubah dan hapus pengiriman dengan log audit yang hanya ditambah.
+
+Baris kirim tidak pernah ditimpa. Ubah menyisipkan baris pengganti dan
+mengisi ``kirim.diganti`` baris lama dengan ID pengganti; hapus mengisinya
+dengan 0. Trigger rekap hanya menghitung baris aktif (diganti IS NULL) dan
+laporan membaca view ``kirim_aktif`` yang dilayani indeks parsial, jadi
+baris lama tidak ikut dipindai. Setiap koreksi dicatat di ``kirim_log``
+berikut diff kolom yang berubah saja.
+
+Log yang lebih tua dari SIMPAN_LOG_HARI dilipat oleh padatkan() ke
+``kirim_log_ringkas`` (jumlah koreksi per bulan, user dan aksi) dan baris
+kirim yang sudah diganti ikut dihapus.
+
+    python -m dhn.koreksi padatkan    # lipat log lama ke ringkasan
+    python -m dhn.koreksi riwayat 42  # riwayat koreksi pengiriman #42
+"""
+import argparse
+import json
+from datetime import date, datetime, timedelta
+
+from dhn import db, gaji, kinerja, master_warung, pengiriman
+
+SIMPAN_LOG_HARI = 90  # log koreksi sebelum ini dilipat ke kirim_log_ringkas
+KOLOM = ("tanggal", "warung", "jumlah_kirim", "jumlah_terjual", "harga_satuan")
+SQL_BARIS = """
+    SELECT id, tanggal, warung, jumlah_kirim, jumlah_terjual, harga_satuan, user, warung_id
+    FROM kirim WHERE id = ? AND diganti IS NULL
+"""
+SQL_LOG = "INSERT INTO kirim_log (waktu, user, aksi, kirim_id, baru_id, diff) VALUES (?, ?, ?, ?, ?, ?)"
+# Semua ID dalam satu rantai koreksi (maju lewat baru_id, mundur lewat kirim_id).
+SQL_RANTAI = """
+    WITH RECURSIVE rantai(id) AS (
+        SELECT ?
+        UNION
+        SELECT l.kirim_id FROM kirim_log AS l JOIN rantai AS r ON l.baru_id = r.id
+        UNION
+        SELECT l.baru_id FROM kirim_log AS l JOIN rantai AS r ON l.kirim_id = r.id
+        WHERE l.baru_id IS NOT NULL
+    )
+    SELECT id, waktu, user, aksi, kirim_id, baru_id, diff
+    FROM kirim_log WHERE kirim_id IN rantai ORDER BY id
+"""
+SQL_TERBARU = """
+    SELECT l.id, l.waktu, l.user, l.aksi, l.kirim_id, l.baru_id, l.diff
+    FROM kirim_log AS l LEFT JOIN kirim AS k ON k.id = l.kirim_id{filter_user}
+    ORDER BY l.id DESC LIMIT ?
+"""
+# ID log terakhir yang menyentuh setiap bulan (tanggal baris lama atau penggantinya).
+SQL_LOG_BULAN = """
+    SELECT substr(k.tanggal, 1, 7), MAX(l.id)
+    FROM kirim_log AS l JOIN kirim AS k ON k.id = l.kirim_id OR k.id = l.baru_id
+    GROUP BY 1
+"""
+
+TIDAK_ADA = "Pengiriman #{} tidak ditemukan atau sudah diubah/dihapus."
+BUKAN_PEMILIK = "Hanya pemilik pengiriman atau admin yang boleh mengubahnya."
+TIDAK_BERUBAH = "Tidak ada perubahan."
+
+
+def _sekarang():
+    return datetime.now().isoformat(" ", "seconds")
+
+
+def _json(data):
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+def _baris(conn, kirim_id):
+    row = conn.execute(SQL_BARIS, (kirim_id,)).fetchone()
+    if row is None:
+        return None
+    return dict(zip(("id", *KOLOM, "user", "warung_id"), row))
+
+
+def ambil(kirim_id):
+    """Baris kirim aktif sebagai dict, atau None."""
+    with db.get_pool().connection() as conn:
+        return _baris(conn, kirim_id)
+
+
+def izin(conn, baris, user, is_admin, tanggal_baru=None):
+    """Pesan kesalahan jika ``user`` tidak boleh mengoreksi ``baris``, atau None."""
+    if not is_admin and baris["user"] != user:
+        return BUKAN_PEMILIK
+    for tanggal in (baris["tanggal"], tanggal_baru):
+        pesan = tanggal is not None and gaji.cek_periode(tanggal, conn)
+        if pesan:
+            return pesan
+    return None
+
+
+@kinerja.ukur("koreksi.ubah")
+def ubah(kirim_id, perubahan, user, is_admin=False):
+    """Ganti pengiriman ``kirim_id`` dengan nilai di ``perubahan``.
+
+    ``perubahan`` berisi sebagian kolom KOLOM (tanggal boleh date atau teks
+    ISO). Mengembalikan (ID baris pengganti, None) atau (None, pesan).
+    Baris pengganti tetap milik user yang sama dengan baris lama.
+    """
+    with db.get_pool().transaction() as conn:
+        # Semua pemeriksaan sebelum menulis: keluar dari blok ini = COMMIT.
+        lama = _baris(conn, kirim_id)
+        if lama is None:
+            return None, TIDAK_ADA.format(kirim_id)
+        data = {**lama, **perubahan}
+        data["tanggal"] = str(data["tanggal"])
+        baru, pesan = pengiriman.validasi_baris(data)
+        if pesan:
+            return None, pesan
+        baru = dict(zip(KOLOM, baru))
+        baru["tanggal"] = baru["tanggal"].isoformat()
+        pesan = izin(conn, lama, user, is_admin, baru["tanggal"])
+        if pesan:
+            return None, pesan
+        if master_warung.normalisasi(baru["warung"]) == master_warung.normalisasi(lama["warung"] or ""):
+            baru["warung"], wid = lama["warung"], lama["warung_id"]
+        else:
+            wid, baru["warung"] = master_warung.id_untuk(conn, baru["warung"])
+        diff = {k: [lama[k], baru[k]] for k in KOLOM if baru[k] != lama[k]}
+        if not diff:
+            return None, TIDAK_BERUBAH
+
+        baru_id = conn.execute(pengiriman.SQL_INSERT, (
+            baru["tanggal"], baru["warung"], wid, baru["jumlah_kirim"], baru["jumlah_terjual"],
+            baru["harga_satuan"], lama["user"])).lastrowid
+        conn.execute("UPDATE kirim SET diganti = ? WHERE id = ?", (baru_id, kirim_id))
+        conn.execute(SQL_LOG, (_sekarang(), user, "ubah", kirim_id, baru_id, _json(diff)))
+    return baru_id, None
+
+
+@kinerja.ukur("koreksi.hapus")
+def hapus(kirim_id, user, is_admin=False):
+    """Tandai pengiriman ``kirim_id`` terhapus; pesan kesalahan atau None."""
+    with db.get_pool().transaction() as conn:
+        lama = _baris(conn, kirim_id)
+        if lama is None:
+            return TIDAK_ADA.format(kirim_id)
+        pesan = izin(conn, lama, user, is_admin)
+        if pesan:
+            return pesan
+        conn.execute("UPDATE kirim SET diganti = 0 WHERE id = ?", (kirim_id,))
+        conn.execute(SQL_LOG, (_sekarang(), user, "hapus", kirim_id, None,
+                               _json({k: lama[k] for k in KOLOM})))
+    return None
+
+
+# === RIWAYAT ===
+
+def uraian(aksi, diff):
+    """Teks singkat satu entri log, mis. "jumlah_terjual: 10 -> 8"."""
+    diff = json.loads(diff)
+    if aksi == "hapus":
+        return "dihapus (" + ", ".join(f"{k}: {v}" for k, v in diff.items()) + ")"
+    return "; ".join(f"{k}: {lama} -> {baru}" for k, (lama, baru) in diff.items())
+
+
+def _tabel(rows):
+    import pandas as pd
+
+    df = pd.DataFrame(rows, columns=["id", "waktu", "oleh", "aksi", "kirim_id", "baru_id", "diff"])
+    df["perubahan"] = [uraian(a, d) for a, d in zip(df["aksi"], df["diff"])]
+    return df.drop(columns="diff").astype({"baru_id": "Int64"})
+
+
+def riwayat(kirim_id):
+    """DataFrame log seluruh rantai koreksi yang memuat ``kirim_id``."""
+    return _tabel(db.fetchall(SQL_RANTAI, (kirim_id,)))
+
+
+def log_terbaru(user=None, batas=50):
+    """DataFrame log terbaru; ``user`` membatasi ke pengiriman miliknya atau koreksinya."""
+    filter_user, params = "", []
+    if user is not None:
+        filter_user, params = " WHERE k.user = ? OR l.user = ?", [user, user]
+    return _tabel(db.fetchall(SQL_TERBARU.format(filter_user=filter_user), params + [batas], cache=True))
+
+
+def log_per_bulan(cache=False):
+    """{bulan "YYYY-MM": ID kirim_log terakhir yang mengoreksi baris bulan itu}.
+
+    Dipakai sebagai penanda perubahan oleh arsip dan file laporan: koreksi
+    yang tidak mengubah jumlah baris atau pendapatan tetap terdeteksi.
+    """
+    return dict(db.fetchall(SQL_LOG_BULAN, cache=cache))
+
+
+# === PEMADATAN ===
+
+@kinerja.ukur("koreksi.padatkan")
+def padatkan(umur_hari=SIMPAN_LOG_HARI, hari_ini=None):
+    """Lipat log yang lebih tua dari ``umur_hari`` ke kirim_log_ringkas.
+
+    Baris kirim yang diganti/dihapus oleh log itu dihapus permanen (trigger
+    rekap tidak menyentuhnya karena sudah tidak aktif). Mengembalikan
+    (jumlah log dilipat, jumlah baris kirim dihapus).
+    """
+    batas = ((hari_ini or date.today()) - timedelta(days=umur_hari)).isoformat()
+    with db.get_pool().transaction() as conn:
+        # Entri terakhir tidak pernah dihapus supaya ID log tidak mulai lagi
+        # dari 1; Dashboard langsung dan watermark sinkron bergantung padanya.
+        log = conn.execute("SELECT id, substr(waktu, 1, 7), user, aksi, kirim_id, diff FROM kirim_log"
+                           " WHERE waktu < ? AND id < (SELECT MAX(id) FROM kirim_log)", (batas,)).fetchall()
+        if not log:
+            return 0, 0
+        ringkas = {}
+        for _, bulan, user, aksi, _, diff in log:
+            entri = ringkas.setdefault((bulan, user, aksi), [0, {}])
+            entri[0] += 1
+            if aksi == "ubah":
+                for k in json.loads(diff):
+                    entri[1][k] = entri[1].get(k, 0) + 1
+        for (bulan, user, aksi), (jumlah, kolom) in ringkas.items():
+            ada = conn.execute("SELECT jumlah, kolom FROM kirim_log_ringkas WHERE bulan = ? AND user = ?"
+                               " AND aksi = ?", (bulan, user, aksi)).fetchone()
+            if ada:
+                jumlah += ada[0]
+                for k, n in json.loads(ada[1]).items():
+                    kolom[k] = kolom.get(k, 0) + n
+            conn.execute("INSERT OR REPLACE INTO kirim_log_ringkas VALUES (?, ?, ?, ?, ?)",
+                         (bulan, user, aksi, jumlah, _json(kolom)))
+        dihapus = conn.executemany("DELETE FROM kirim WHERE id = ? AND diganti IS NOT NULL",
+                                   [(row[4],) for row in log]).rowcount
+        conn.executemany("DELETE FROM kirim_log WHERE id = ?", [(row[0],) for row in log])
+    return len(log), dihapus
+
+
+# === TAMPILAN ===
+
+def tampilkan(user, is_admin):
+    """Expander ubah/hapus pengiriman dan riwayat koreksi (menu Rekap Penjualan)."""
+    import streamlit as st
+
+    with st.expander("Ubah / Hapus Pengiriman"):
+        kirim_id = st.number_input("ID pengiriman", min_value=1, step=1, value=None, key="koreksi_id")
+        if kirim_id is not None:
+            kirim_id = int(kirim_id)
+            baris = ambil(kirim_id)
+            if baris is None:
+                st.warning(TIDAK_ADA.format(kirim_id))
+            else:
+                _formulir(st, baris, user, is_admin)
+            df = riwayat(kirim_id)
+            if len(df):
+                st.caption("Riwayat koreksi")
+                st.dataframe(df, hide_index=True)
+
+    with st.expander("Riwayat Koreksi Terbaru"):
+        df = log_terbaru(None if is_admin else user)
+        if len(df):
+            st.dataframe(df, hide_index=True)
+        else:
+            st.caption("Belum ada koreksi.")
+
+
+def _formulir(st, baris, user, is_admin):
+    kirim_id = baris["id"]
+    with st.form(f"koreksi_{kirim_id}"):
+        tanggal = st.date_input("Tanggal", date.fromisoformat(str(baris["tanggal"])[:10]))
+        warung = st.text_input("Nama Warung", baris["warung"] or "")
+        jumlah_kirim = st.number_input("Jumlah Dikirim", min_value=0, step=1, value=baris["jumlah_kirim"] or 0)
+        jumlah_terjual = st.number_input("Jumlah Terjual", min_value=0, step=1,
+                                         value=baris["jumlah_terjual"] or 0)
+        harga_satuan = st.number_input("Harga Satuan (Rp)", min_value=0, step=1,
+                                       value=baris["harga_satuan"] or 0)
+        simpan = st.form_submit_button("Simpan Perubahan")
+    if simpan:
+        baru_id, pesan = ubah(kirim_id, {
+            "tanggal": tanggal, "warung": warung, "jumlah_kirim": int(jumlah_kirim),
+            "jumlah_terjual": int(jumlah_terjual), "harga_satuan": int(harga_satuan),
+        }, user, is_admin)
+        if pesan:
+            st.error(pesan)
+        else:
+            st.success(f"Pengiriman #{kirim_id} diganti dengan #{baru_id}.")
+        return
+    yakin = st.checkbox("Saya yakin ingin menghapus pengiriman ini", key=f"koreksi_yakin_{kirim_id}")
+    if st.button("Hapus Pengiriman", disabled=not yakin, key=f"koreksi_hapus_{kirim_id}"):
+        pesan = hapus(kirim_id, user, is_admin)
+        if pesan:
+            st.error(pesan)
+        else:
+            st.success(f"Pengiriman #{kirim_id} dihapus.")
+
+
+# === CLI ===
+
+def main():
+    parser = argparse.ArgumentParser(description="Log koreksi pengiriman.")
+    parser.add_argument("perintah", choices=["padatkan", "riwayat"])
+    parser.add_argument("kirim_id", nargs="?", type=int)
+    parser.add_argument("--db", default=None, help="path database (default: kerupuk.db)")
+    parser.add_argument("--umur", type=int, default=SIMPAN_LOG_HARI, help="umur log (hari) yang dilipat")
+    args = parser.parse_args()
+
+    if args.db:
+        db.DB_PATH = args.db
+    if args.perintah == "padatkan":
+        dilipat, dihapus = padatkan(args.umur)
+        print(f"{dilipat} log dilipat ke ringkasan, {dihapus} baris kirim lama dihapus.")
+        return
+    if args.kirim_id is None:
+        parser.error("riwayat butuh ID pengiriman")
+    for row in riwayat(args.kirim_id).itertuples(index=False):
+        print(f"{row.waktu}  {row.oleh:<12} #{row.kirim_id} -> {row.baru_id}  {row.perubahan}")
+
+
+if __name__ == "__main__":
+    main()
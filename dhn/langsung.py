@@ -0,0 +1,147 @@
+"""Total harian per warung yang diperbarui bertahap untuk Dashboard langsung.
+
+Total awal diambil dari rekap_harian bersama MAX(id) kirim dalam satu
+transaksi baca. Setiap penyegaran berikutnya hanya membaca baris kirim
+dengan ``id > terakhir_id`` (rentang rowid, jadi biayanya sebanding dengan
+baris baru, bukan dengan isi satu hari) lalu menambahkannya ke total.
+Koreksi (dhn.koreksi) dibaca dengan cara yang sama dari ``kirim_log``
+(``id > terakhir_log``): baris yang diganti atau dihapus dikurangkan lagi,
+sedangkan baris penggantinya masuk lewat pembacaan kirim biasa.
+Objek TotalHarian dipakai bersama semua sesi dengan tanggal dan filter user
+yang sama.
+"""
+import threading
+from collections import deque
+
+from dhn import db, kinerja
+
+TERBARU = 20  # baris terbaru yang ditampilkan di Dashboard
+SQL_AWAL = """
+    SELECT warung_id, SUM(jumlah_kirim), SUM(jumlah_terjual), SUM(pendapatan), SUM(jumlah_baris)
+    FROM rekap_harian
+    WHERE tanggal = ?{filter_user}
+    GROUP BY warung_id
+"""
+SQL_TERBARU = """
+    SELECT id, COALESCE(warung_id, 0), warung, COALESCE(jumlah_kirim, 0), COALESCE(jumlah_terjual, 0),
+           COALESCE(jumlah_terjual, 0) * COALESCE(harga_satuan, 0), user
+    FROM kirim_aktif
+    WHERE tanggal = ?{filter_user}
+    ORDER BY id DESC LIMIT ?
+"""
+SQL_BARU = """
+    SELECT id, COALESCE(warung_id, 0), warung, COALESCE(jumlah_kirim, 0), COALESCE(jumlah_terjual, 0),
+           COALESCE(jumlah_terjual, 0) * COALESCE(harga_satuan, 0), user
+    FROM kirim
+    WHERE id > ? AND tanggal = ?{filter_user}
+    ORDER BY id
+"""
+# Baris yang diganti/dihapus sejak terakhir_log (termasuk baris yang baru
+# saja ditambahkan oleh SQL_BARU pada pembaruan yang sama).
+SQL_DIGANTI = """
+    SELECT k.id, COALESCE(k.warung_id, 0), COALESCE(k.jumlah_kirim, 0), COALESCE(k.jumlah_terjual, 0),
+           COALESCE(k.jumlah_terjual, 0) * COALESCE(k.harga_satuan, 0)
+    FROM kirim_log AS l JOIN kirim AS k ON k.id = l.kirim_id
+    WHERE l.id > ? AND k.tanggal = ?{filter_user}
+"""
+
+
+def _filter(user, alias=""):
+    return (f" AND {alias}user = ?", [user]) if user is not None else ("", [])
+
+
+class TotalHarian:
+    """Total per warung_id untuk satu tanggal (dan user), ditambah bertahap."""
+
+    def __init__(self, tanggal, user=None):
+        self.tanggal = tanggal
+        self.user = user
+        self.terakhir_id = 0
+        self.terakhir_log = 0
+        self.per_warung = {}  # warung_id -> [kirim, terjual, pendapatan, baris]
+        self.nama = {}
+        self.terbaru = deque(maxlen=TERBARU)
+        self._lock = threading.Lock()
+        self._muat()
+
+    @kinerja.ukur("langsung: muat awal")
+    def _muat(self):
+        filter_user, params = _filter(self.user)
+        with db.get_pool().connection() as conn:
+            # Satu transaksi baca supaya total, terakhir_id dan terakhir_log konsisten.
+            conn.execute("BEGIN")
+            self.terakhir_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM kirim").fetchone()[0]
+            self.terakhir_log = conn.execute("SELECT COALESCE(MAX(id), 0) FROM kirim_log").fetchone()[0]
+            self.per_warung = {wid: list(nilai) for wid, *nilai in conn.execute(
+                SQL_AWAL.format(filter_user=filter_user), [self.tanggal, *params])}
+            terbaru = conn.execute(SQL_TERBARU.format(filter_user=filter_user),
+                                   [self.tanggal, *params, TERBARU]).fetchall()
+            self.nama = dict(conn.execute("SELECT id, nama FROM warung"))
+            conn.execute("COMMIT")
+        self.terbaru = deque(reversed(terbaru), maxlen=TERBARU)
+
+    def perbarui(self):
+        """Tambahkan baris kirim baru dan kurangi baris yang dikoreksi; kembalikan jumlah perubahannya."""
+        filter_user, params = _filter(self.user)
+        filter_k, _ = _filter(self.user, "k.")
+        with self._lock, kinerja.ukur("langsung: perbarui"):
+            with db.get_pool().connection() as conn:
+                conn.execute("BEGIN")
+                # Baris tanggal/user lain tetap menggeser terakhir_id.
+                terakhir = conn.execute("SELECT COALESCE(MAX(id), 0) FROM kirim").fetchone()[0]
+                terakhir_log = conn.execute("SELECT COALESCE(MAX(id), 0) FROM kirim_log").fetchone()[0]
+                baru = conn.execute(SQL_BARU.format(filter_user=filter_user),
+                                    [self.terakhir_id, self.tanggal, *params]).fetchall()
+                diganti = conn.execute(SQL_DIGANTI.format(filter_user=filter_k),
+                                       [self.terakhir_log, self.tanggal, *params]).fetchall()
+                belum_dikenal = {row[1] for row in baru} - self.nama.keys()
+                if belum_dikenal:
+                    tanda = ", ".join("?" * len(belum_dikenal))
+                    self.nama.update(conn.execute(f"SELECT id, nama FROM warung WHERE id IN ({tanda})",
+                                                  list(belum_dikenal)))
+                conn.execute("COMMIT")
+            for row in baru:
+                total = self.per_warung.setdefault(row[1], [0, 0, 0, 0])
+                for i, nilai in enumerate((row[3], row[4], row[5], 1)):
+                    total[i] += nilai
+                self.terbaru.append(row)
+            for row in diganti:
+                total = self.per_warung.setdefault(row[1], [0, 0, 0, 0])
+                for i, nilai in enumerate((row[2], row[3], row[4], 1)):
+                    total[i] -= nilai
+                if not total[3]:
+                    del self.per_warung[row[1]]
+            if diganti:
+                hilang = {row[0] for row in diganti}
+                self.terbaru = deque((row for row in self.terbaru if row[0] not in hilang), maxlen=TERBARU)
+            self.terakhir_id = max(terakhir, self.terakhir_id)
+            self.terakhir_log = max(terakhir_log, self.terakhir_log)
+            return len(baru) + len(diganti)
+
+    def total(self):
+        """(kirim, terjual, pendapatan, baris) seluruh warung."""
+        with self._lock:
+            return tuple(sum(t[i] for t in self.per_warung.values()) for i in range(4))
+
+    def tabel(self):
+        """DataFrame per warung (warung, Pendapatan, Terjual, Tidak Laku) urut nama."""
+        import pandas as pd
+
+        with self._lock:
+            rows = [(self.nama.get(wid, ""), p, j, k - j) for wid, (k, j, p, _) in self.per_warung.items()]
+        df = pd.DataFrame(rows, columns=["warung", "Pendapatan", "Terjual", "Tidak Laku"])
+        return df.sort_values("warung", ignore_index=True)
+
+
+_aktif = {}
+_aktif_lock = threading.Lock()
+
+
+def total_harian(tanggal, user=None):
+    """TotalHarian bersama untuk (tanggal, user); tanggal lama dibuang."""
+    with _aktif_lock:
+        for kunci in [k for k in _aktif if k[0] != tanggal]:
+            del _aktif[kunci]
+        if (tanggal, user) not in _aktif:
+            _aktif[(tanggal, user)] = TotalHarian(tanggal, user)
+        return _aktif[(tanggal, user)]
@@ -0,0 +1,123 @@
+"""Master warung: normalisasi nama, ID integer dan pencarian autocomplete.
+
+Nama yang diketik dinormalisasi menjadi ``kunci`` (huruf kecil, tanpa tanda
+baca dan awalan "warung"/"wr") sehingga "Warung Bu Siti", "wr. bu siti" dan
+"Bu  Siti" menjadi satu baris di tabel warung. Pencarian memakai indeks
+awalan pada kunci, indeks FTS5 trigram untuk substring, lalu difflib untuk
+salah ketik.
+"""
+import difflib
+import re
+import unicodedata
+
+from dhn import db
+
+_AWALAN = re.compile(r"^(warung|wrg|wr)\b\s*")
+_BUKAN_HURUF = re.compile(r"[^\w\s]")
+_SPASI = re.compile(r"\s+")
+
+
+def normalisasi(nama):
+    """Kunci pembanding nama warung."""
+    teks = unicodedata.normalize("NFKC", str(nama or "")).lower()
+    teks = _SPASI.sub(" ", _BUKAN_HURUF.sub(" ", teks)).strip()
+    return _AWALAN.sub("", teks) or teks
+
+
+def rapikan(nama):
+    """Nama tampilan untuk warung baru: spasi berlebih dibuang."""
+    return _SPASI.sub(" ", str(nama or "")).strip()
+
+
+def isi_dari_kirim(conn):
+    """Migrasi: buat master dari nama di kirim dan gabungkan ejaan yang sama.
+
+    Nama baku tiap warung adalah ejaan yang paling sering dipakai (jika
+    seri: yang berhuruf kapital lalu yang terpanjang); kolom
+    kirim.warung ikut diseragamkan dan kirim.warung_id diisi.
+    """
+    ejaan = {}
+    for nama, jumlah in conn.execute(
+            "SELECT warung, COUNT(*) FROM kirim WHERE warung IS NOT NULL GROUP BY warung"):
+        kunci = normalisasi(nama)
+        if kunci:
+            ejaan.setdefault(kunci, {})[nama] = jumlah
+    for kunci, varian in ejaan.items():
+        nama_baku = rapikan(max(varian, key=lambda v: (varian[v], v[:1].isupper(), len(v), v)))
+        wid = conn.execute("INSERT INTO warung (nama, kunci) VALUES (?, ?)",
+                           (nama_baku, kunci)).lastrowid
+        conn.executemany("UPDATE kirim SET warung = ?, warung_id = ? WHERE warung = ?",
+                         [(nama_baku, wid, v) for v in varian])
+
+
+def id_untuk(conn, nama, cache=None):
+    """(id, nama baku) untuk nama warung; warung baru ditambahkan ke master.
+
+    Dipanggil di dalam transaksi tulis. ``cache`` (dict) opsional untuk
+    menghindari lookup berulang dalam satu batch.
+    """
+    kunci = normalisasi(nama)
+    if not kunci:
+        return None, nama
+    if cache is not None and kunci in cache:
+        return cache[kunci]
+    row = conn.execute("SELECT id, nama FROM warung WHERE kunci = ?", (kunci,)).fetchone()
+    if row is None:
+        nama_baku = rapikan(nama)
+        wid = conn.execute("INSERT INTO warung (nama, kunci) VALUES (?, ?)", (nama_baku, kunci)).lastrowid
+        row = (wid, nama_baku)
+    if cache is not None:
+        cache[kunci] = row
+    return tuple(row)
+
+
+def _frasa(teks):
+    # Teks pengguna sebagai satu frasa FTS5 (tanpa operator).
+    return '"' + teks.strip().replace('"', '""') + '"'
+
+
+def cari(teks, batas=8):
+    """Saran [(id, nama)]: awalan, substring (trigram), awalan kata, mirip."""
+    kunci = normalisasi(teks)
+    if not kunci:
+        return []
+    hasil = dict(db.fetchall(
+        "SELECT id, nama FROM warung WHERE kunci >= ? AND kunci < ? ORDER BY kunci LIMIT ?",
+        (kunci, kunci + "\U0010ffff", batas), cache=True))
+    if len(hasil) < batas and len(teks.strip()) >= 3:
+        for wid, nama in db.fetchall(
+                "SELECT rowid, nama FROM warung_cari WHERE warung_cari MATCH ? ORDER BY rank LIMIT ?",
+                (_frasa(teks), batas), cache=True):
+            hasil.setdefault(wid, nama)
+    if len(hasil) < batas:
+        per_kunci = {k: (wid, nama) for wid, nama, k in db.fetchall("SELECT id, nama, kunci FROM warung", cache=True)}
+        cocok = [k for k in per_kunci if any(kata.startswith(kunci) for kata in k.split())]
+        cocok += difflib.get_close_matches(kunci, per_kunci, n=batas, cutoff=0.75)
+        for k in cocok:
+            hasil.setdefault(*per_kunci[k])
+    return list(hasil.items())[:batas]
+
+
+def filter_sql(teks, kolom="warung_id"):
+    """Fragmen WHERE + parameter untuk filter "nama warung mengandung teks"."""
+    teks = (teks or "").strip()
+    if len(teks) >= 3:
+        return f"{kolom} IN (SELECT rowid FROM warung_cari WHERE warung_cari MATCH ?)", [_frasa(teks)]
+    # Trigram butuh minimal 3 huruf; tabel warung kecil jadi LIKE cukup.
+    return f"{kolom} IN (SELECT id FROM warung WHERE nama LIKE ?)", [f"%{teks}%"]
+
+
+def input_nama(label="Nama Warung", key="nama_warung"):
+    """Text input nama warung dengan saran dari master warung."""
+    import streamlit as st
+
+    teks = st.text_input(label, key=key)
+    saran = cari(teks) if teks.strip() else []
+    if saran and normalisasi(teks) not in {normalisasi(nama) for _, nama in saran}:
+        return st.selectbox(
+            "Warung terdaftar yang mirip",
+            [teks] + [nama for _, nama in saran],
+            format_func=lambda n: f"{n} (warung baru)" if n == teks else n,
+            key=f"{key}_saran",
+        )
+    return teks
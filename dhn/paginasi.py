@@ -0,0 +1,95 @@
+"""Paginasi keyset untuk tabel Rekap Penjualan.
+
+Hanya baris pada halaman yang tampil yang diambil dari SQLite; jumlah baris
+dan total pendapatan dibaca dari tabel rekap, jadi memori tetap kecil
+berapa pun panjang riwayat kirim.
+"""
+from dhn import db, master_warung, rekap
+
+# Ekspresi urut per kolom. NULL diganti supaya perbandingan kursor
+# (kolom, id) tetap benar; tanggal dan id dilayani indeks langsung.
+KOLOM_URUT = {
+    "tanggal": "tanggal",
+    "id": "id",
+    "warung": "COALESCE(warung, '')",
+    "user": "COALESCE(user, '')",
+    "jumlah_kirim": "COALESCE(jumlah_kirim, 0)",
+    "jumlah_terjual": "COALESCE(jumlah_terjual, 0)",
+    "harga_satuan": "COALESCE(harga_satuan, 0)",
+}
+UKURAN_HALAMAN = (25, 50, 100, 250)
+
+
+def filter_kirim(user=None, warung=None):
+    """Klausa WHERE (boleh kosong) dan parameternya untuk filter Rekap."""
+    kondisi, params = [], []
+    if user is not None:
+        kondisi.append("user = ?")
+        params.append(user)
+    if warung:
+        sql, p = master_warung.filter_sql(warung)
+        kondisi.append(sql)
+        params += p
+    return (" WHERE " + " AND ".join(kondisi)) if kondisi else "", params
+
+
+def ambil_halaman(user=None, warung=None, urut="tanggal", turun=True, kursor=None, ukuran=50):
+    """Satu halaman kirim dan kursor halaman berikutnya (None jika habis)."""
+    expr = KOLOM_URUT[urut]
+    where, params = filter_kirim(user, warung)
+    if kursor is not None:
+        where += (" AND " if where else " WHERE ") + f"({expr}, id) {'<' if turun else '>'} (?, ?)"
+        params += list(kursor)
+    arah = "DESC" if turun else "ASC"
+    df = db.read_sql(
+        f"SELECT *, {expr} AS _kunci FROM kirim_aktif{where} ORDER BY {expr} {arah}, id {arah} LIMIT ?",
+        params + [ukuran + 1], cache=True)
+    berikut = None
+    if len(df) > ukuran:
+        df = df.iloc[:ukuran]
+        kunci = df["_kunci"].iloc[-1]
+        berikut = (kunci.item() if hasattr(kunci, "item") else kunci, int(df["id"].iloc[-1]))
+    return df.drop(columns="_kunci"), berikut
+
+
+def tampilkan(user=None, warung=None, format_tanggal=None):
+    """Tabel Rekap Penjualan berhalaman.
+
+    Mengembalikan total pendapatan untuk filter, atau None jika kosong.
+    """
+    import streamlit as st
+
+    jumlah, pendapatan = rekap.ringkasan(user, warung)
+    if not jumlah:
+        st.info("Tidak ada data.")
+        return None
+
+    kol_urut, kol_arah, kol_ukuran = st.columns(3)
+    urut = kol_urut.selectbox("Urutkan", list(KOLOM_URUT))
+    turun = kol_arah.selectbox("Arah", ["Menurun", "Menaik"]) == "Menurun"
+    ukuran = kol_ukuran.selectbox("Baris per halaman", UKURAN_HALAMAN, index=1)
+
+    # Tumpukan kursor awal tiap halaman; diulang jika filter/urutan berubah.
+    state = st.session_state
+    kunci = (user, warung, urut, turun, ukuran)
+    if state.get("rekap_kunci") != kunci:
+        state.rekap_kunci = kunci
+        state.rekap_kursor = [None]
+    tumpukan = state.rekap_kursor
+
+    df, berikut = ambil_halaman(user, warung, urut, turun, tumpukan[-1], ukuran)
+    df["Pendapatan"] = df["jumlah_terjual"] * df["harga_satuan"]
+    if format_tanggal:
+        import pandas as pd
+
+        df["tanggal"] = pd.to_datetime(df["tanggal"]).dt.strftime(format_tanggal)
+    st.dataframe(df)
+
+    halaman = len(tumpukan)
+    total_halaman = -(-jumlah // ukuran)
+    kol_prev, kol_info, kol_next = st.columns([1, 2, 1])
+    kol_prev.button("« Sebelumnya", disabled=halaman == 1, on_click=tumpukan.pop)
+    kol_info.caption(f"Halaman {halaman} dari {total_halaman} · {jumlah:,} baris")
+    kol_next.button("Berikutnya »", disabled=berikut is None,
+                    on_click=tumpukan.append, args=(berikut,))
+    return pendapatan
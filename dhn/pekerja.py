@@ -0,0 +1,348 @@
+"""Pekerja latar untuk tugas terjadwal yang tidak perlu menunggu rerun halaman.
+
+    python -m dhn.pekerja                      # jalan terus, cek antrean tiap 30 detik
+    python -m dhn.pekerja --sekali             # kerjakan yang jatuh tempo lalu keluar
+    python -m dhn.pekerja --antrekan backup    # antrekan satu tugas untuk sekarang
+
+Tugas disimpan di tabel ``tugas``, jadi jadwal dan riwayat tetap ada ketika
+pekerja dimatikan. Admin juga bisa mengantrekan tugas dari menu "Tugas Latar".
+Cukup jalankan satu pekerja per database.
+
+Jadwal (jam lokal):
+    00:15         ramalan  fit inkremental model saran kirim (dhn.ramalan)
+    00:30         arsip    snapshot Parquet bulan yang sudah lewat (dhn.arsip)
+    00:45         laporan  file ekspor Laporan Bulanan bulan lalu dan bulan ini
+    01:30         backup   salinan online database lewat API backup sqlite3
+    02:00         analyze  ANALYZE untuk statistik query planner
+    Minggu 02:30  padatkan lipat log koreksi lama ke ringkasan (dhn.koreksi)
+    Minggu 03:00  vacuum   VACUUM lalu checkpoint WAL
+
+Jadwal yang terlewat ketika pekerja mati dikerjakan sekali saat pekerja
+hidup lagi.
+
+Dashboard sengaja tidak punya tugas pra-hitung. Totalnya dibaca dari
+rekap_harian yang sudah dijaga trigger (dhn.langsung; muat awal ~1 ms untuk
+300 warung), dan cache query serta TotalHarian hidup di proses Streamlit,
+jadi pekerja tidak bisa menghangatkannya dari proses ini.
+"""
+import argparse
+import glob
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from datetime import time as jam
+
+from dhn import db, ekspor, kinerja
+
+INTERVAL = 30  # detik antar pengecekan antrean
+SIMPAN_BACKUP = 7  # file backup terbaru yang disimpan
+SIMPAN_RIWAYAT = 1000  # baris tugas selesai/gagal yang disimpan
+# jenis: (jam, hari dalam minggu atau None untuk setiap hari)
+JADWAL = {
+    "ramalan": (jam(0, 15), None),
+    "arsip": (jam(0, 30), None),
+    "laporan": (jam(0, 45), None),
+    "backup": (jam(1, 30), None),
+    "analyze": (jam(2, 0), None),
+    "padatkan": (jam(2, 30), 6),
+    "vacuum": (jam(3, 0), 6),
+}
+SQL_AMBIL = """
+    UPDATE tugas SET status = 'jalan', mulai = ?
+    WHERE id = (SELECT id FROM tugas WHERE status = 'antre' AND jadwal <= ?
+                ORDER BY jadwal, id LIMIT 1)
+    RETURNING id, jenis
+"""
+WHERE_BULAN = " WHERE tanggal >= ? AND tanggal < ?"  # sama dengan menu Laporan Bulanan
+
+
+def _sekarang():
+    return datetime.now().replace(microsecond=0)
+
+
+def _folder(db_path, akhiran):
+    return os.path.splitext(db_path)[0] + akhiran
+
+
+# === TUGAS ===
+
+def _ramalan():
+    from dhn import ramalan
+
+    return f"{ramalan.fit()} hari diproses"
+
+
+def _arsip():
+    from dhn import arsip
+
+    try:
+        ditulis, dihapus = arsip.snapshot()
+    except ImportError:
+        return "dilewati: pyarrow tidak terpasang"
+    return f"{len(ditulis)} bulan ditulis, {len(dihapus)} dihapus"
+
+
+def _ringkas_bulan(bulan, cache=False):
+    """[jumlah baris, pendapatan, ID log koreksi terakhir] untuk ``bulan``.
+
+    ID log ikut dibandingkan supaya koreksi warung atau jumlah kirim, yang
+    tidak mengubah jumlah baris maupun pendapatan, tetap membuat file basi.
+    """
+    from dhn import koreksi
+
+    n, p = db.fetchone("SELECT SUM(jumlah_baris), SUM(pendapatan) FROM rekap_bulanan WHERE bulan = ?",
+                       (bulan,), cache=cache)
+    return [n, p, koreksi.log_per_bulan(cache=cache).get(bulan, 0)]
+
+
+def render_laporan(bulan, folder=None):
+    """Tulis file ekspor Laporan Bulanan (semua user) untuk ``bulan`` "YYYY-MM".
+
+    Dilewati jika file yang ada masih cocok dengan data. Mengembalikan
+    daftar format yang ditulis.
+    """
+    folder = folder or _folder(db.get_pool().path, "-laporan")
+    # Ringkasan dibaca sebelum baris: jika data berubah di tengah jalan,
+    # file dianggap basi dan tidak dipakai halaman.
+    ringkas = _ringkas_bulan(bulan)
+    meta_path = os.path.join(folder, f"laporan_bulanan-{bulan}.json")
+    if not ringkas[0] or _baca_meta(meta_path).get("ringkas") == ringkas:
+        return []
+    os.makedirs(folder, exist_ok=True)
+    awal, akhir = db.month_range(int(bulan[:4]), int(bulan[5:]))
+    ditulis = {}
+    for format, (akhiran, _) in ekspor.FORMAT.items():
+        path = os.path.join(folder, f"laporan_bulanan-{bulan}{akhiran}")
+        try:
+            ekspor.PENULIS[format](ekspor.iter_chunks(ekspor.SQL_KIRIM + WHERE_BULAN, (awal, akhir)),
+                                   path + ".baru")
+        except RuntimeError:
+            continue  # paket opsional (openpyxl/pyarrow) tidak terpasang
+        os.replace(path + ".baru", path)
+        ditulis[format] = os.path.basename(path)
+    with open(meta_path + ".baru", "w", encoding="utf-8") as f:
+        json.dump({"ringkas": ringkas, "file": ditulis, "dibuat": _sekarang().isoformat(" ")}, f)
+    os.replace(meta_path + ".baru", meta_path)
+    return list(ditulis)
+
+
+def _baca_meta(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def laporan_siap(bulan, folder=None):
+    """{format: path} file Laporan Bulanan yang masih cocok dengan data."""
+    folder = folder or _folder(db.get_pool().path, "-laporan")
+    meta = _baca_meta(os.path.join(folder, f"laporan_bulanan-{bulan}.json"))
+    if not meta:
+        return {}
+    if meta["ringkas"] != _ringkas_bulan(bulan, cache=True):
+        return {}
+    return {format: os.path.join(folder, nama) for format, nama in meta["file"].items()
+            if os.path.exists(os.path.join(folder, nama))}
+
+
+def _laporan():
+    bulan_ini = _sekarang().date().replace(day=1)
+    bulan_lalu = bulan_ini - timedelta(days=1)
+    hasil = [f"{b}: {', '.join(f) or 'tetap'}"
+             for b in (bulan_lalu.isoformat()[:7], bulan_ini.isoformat()[:7])
+             for f in [render_laporan(b)]]
+    return "; ".join(hasil)
+
+
+def _backup():
+    pool = db.get_pool()
+    folder = _folder(pool.path, "-backup")
+    os.makedirs(folder, exist_ok=True)
+    nama = os.path.splitext(os.path.basename(pool.path))[0]
+    tujuan = os.path.join(folder, f"{nama}-{_sekarang():%Y%m%d-%H%M%S}.db")
+    # Backup sekaligus (pages=-1): di mode WAL pembaca tidak menahan
+    # penulis, sedangkan backup bertahap diulang dari awal setiap kali
+    # proses lain menulis.
+    salinan = sqlite3.connect(tujuan + ".baru")
+    try:
+        with pool.connection() as conn:
+            conn.backup(salinan)
+        cek = salinan.execute("PRAGMA quick_check").fetchone()[0]
+    finally:
+        salinan.close()
+    if cek != "ok":
+        os.remove(tujuan + ".baru")
+        raise RuntimeError(f"backup rusak: {cek}")
+    os.replace(tujuan + ".baru", tujuan)
+    for lama in sorted(glob.glob(os.path.join(folder, f"{nama}-*.db")))[:-SIMPAN_BACKUP]:
+        os.remove(lama)
+    return f"{os.path.getsize(tujuan) / 1e6:.1f} MB -> {os.path.basename(tujuan)}"
+
+
+def _analyze():
+    with db.get_pool().connection() as conn:
+        conn.execute("ANALYZE")
+    return "statistik diperbarui"
+
+
+def _padatkan():
+    from dhn import koreksi
+
+    dilipat, dihapus = koreksi.padatkan()
+    return f"{dilipat} log dilipat, {dihapus} baris kirim lama dihapus"
+
+
+def _vacuum():
+    path = db.get_pool().path
+    sebelum = os.path.getsize(path)
+    with db.get_pool().connection() as conn:
+        conn.execute("VACUUM")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    return f"{sebelum / 1e6:.1f} MB -> {os.path.getsize(path) / 1e6:.1f} MB"
+
+
+TUGAS = {
+    "ramalan": _ramalan,
+    "arsip": _arsip,
+    "laporan": _laporan,
+    "backup": _backup,
+    "analyze": _analyze,
+    "padatkan": _padatkan,
+    "vacuum": _vacuum,
+}
+
+
+# === ANTREAN ===
+
+def berikut(jenis, setelah):
+    """Waktu jadwal ``jenis`` berikutnya sesudah ``setelah``."""
+    pukul, hari = JADWAL[jenis]
+    kandidat = datetime.combine(setelah.date(), pukul)
+    while kandidat <= setelah or (hari is not None and kandidat.weekday() != hari):
+        kandidat += timedelta(days=1)
+    return kandidat
+
+
+def antrekan(jenis, jadwal=None):
+    """Masukkan tugas ke antrean (default: sekarang); kembalikan id-nya.
+
+    Jika tugas yang sama sudah antre dan jatuh tempo, id itu yang dipakai.
+    """
+    if jenis not in TUGAS:
+        raise ValueError(f"Jenis tugas tidak dikenal: {jenis}")
+    jadwal = jadwal or _sekarang()
+    with db.get_pool().transaction() as conn:
+        row = conn.execute("SELECT id FROM tugas WHERE jenis = ? AND status = 'antre' AND jadwal <= ?",
+                           (jenis, jadwal)).fetchone()
+        if row:
+            return row[0]
+        return conn.execute("INSERT INTO tugas (jenis, jadwal, dibuat) VALUES (?, ?, ?)",
+                            (jenis, jadwal, _sekarang())).lastrowid
+
+
+def _jadwalkan(conn, sekarang):
+    # Satu tugas antre per jenis terjadwal; yang terlewat dikejar sekali saja.
+    for jenis in JADWAL:
+        if conn.execute("SELECT 1 FROM tugas WHERE jenis = ? AND status IN ('antre', 'jalan')",
+                        (jenis,)).fetchone():
+            continue
+        terakhir = conn.execute("SELECT MAX(jadwal) FROM tugas WHERE jenis = ?", (jenis,)).fetchone()[0]
+        dasar = sekarang - timedelta(days=1)
+        if terakhir is not None:
+            dasar = max(dasar, datetime.fromisoformat(terakhir))
+        conn.execute("INSERT INTO tugas (jenis, jadwal, dibuat) VALUES (?, ?, ?)",
+                     (jenis, berikut(jenis, dasar), sekarang))
+    conn.execute("DELETE FROM tugas WHERE status IN ('selesai', 'gagal')"
+                 " AND id <= (SELECT MAX(id) FROM tugas) - ?", (SIMPAN_RIWAYAT,))
+
+
+def _selesai(id_, status, mulai, pesan):
+    with db.get_pool().transaction() as conn:
+        conn.execute("UPDATE tugas SET status = ?, durasi_ms = ?, pesan = ? WHERE id = ?",
+                     (status, round((time.perf_counter() - mulai) * 1000, 1), pesan, id_))
+
+
+def kerjakan_jatuh_tempo():
+    """Kerjakan semua tugas yang sudah jatuh tempo; kembalikan jumlahnya."""
+    jumlah = 0
+    while True:
+        sekarang = _sekarang()
+        with db.get_pool().transaction() as conn:
+            _jadwalkan(conn, sekarang)
+            row = conn.execute(SQL_AMBIL, (sekarang, sekarang)).fetchone()
+        if row is None:
+            return jumlah
+        id_, jenis = row
+        mulai = time.perf_counter()
+        try:
+            with kinerja.ukur(f"tugas: {jenis}"):
+                pesan = TUGAS[jenis]()
+        except Exception as e:
+            _selesai(id_, "gagal", mulai, f"{type(e).__name__}: {e}")
+        else:
+            _selesai(id_, "selesai", mulai, pesan)
+        jumlah += 1
+
+
+# === STATUS PEKERJA ===
+
+def path_detak(db_path):
+    return os.path.splitext(db_path)[0] + "-pekerja.json"
+
+
+def _detak(db_path):
+    # File terpisah, bukan tabel: detak tiap INTERVAL tidak boleh mengubah
+    # versi data dan mengosongkan cache query halaman.
+    with open(path_detak(db_path), "w", encoding="utf-8") as f:
+        json.dump({"pid": os.getpid(), "waktu": _sekarang().isoformat(" ")}, f)
+
+
+def status_pekerja(db_path):
+    """(hidup, info detak terakhir atau None)."""
+    path = path_detak(db_path)
+    info = _baca_meta(path)
+    if not info:
+        return False, None
+    return time.time() - os.path.getmtime(path) < 3 * INTERVAL, info
+
+
+def jalan(interval=INTERVAL):
+    pool = db.get_pool()
+    with pool.transaction() as conn:
+        # Tugas "jalan" dari pekerja sebelumnya tidak akan pernah selesai.
+        conn.execute("UPDATE tugas SET status = 'gagal', pesan = 'pekerja berhenti di tengah tugas'"
+                     " WHERE status = 'jalan'")
+    print(f"pekerja latar untuk {pool.path} (cek tiap {interval} detik)")
+    while True:
+        _detak(pool.path)
+        kerjakan_jatuh_tempo()
+        time.sleep(interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pekerja latar tugas terjadwal.")
+    parser.add_argument("--db", default=None, help="path database (default: kerupuk.db)")
+    parser.add_argument("--sekali", action="store_true", help="kerjakan yang jatuh tempo lalu keluar")
+    parser.add_argument("--antrekan", choices=list(TUGAS), help="antrekan satu tugas untuk sekarang")
+    parser.add_argument("--interval", type=int, default=INTERVAL)
+    args = parser.parse_args()
+
+    if args.db:
+        db.DB_PATH = args.db
+    if args.antrekan:
+        print(f"tugas {args.antrekan} diantrekan (id {antrekan(args.antrekan)})")
+        return
+    if args.sekali:
+        print(f"{kerjakan_jatuh_tempo()} tugas dikerjakan")
+        return
+    try:
+        jalan(args.interval)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
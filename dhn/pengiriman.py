@@ -0,0 +1,199 @@
+"""Validasi dan penyimpanan data pengiriman (tabel kirim).
+
+Aturan validasi yang dulu ditulis langsung di menu "Kirim ke Warung" ada di
+sini supaya input satu per satu, input batch (grid/unggah CSV/XLSX) dan
+API memakai aturan yang sama.
+"""
+from datetime import date
+
+from dhn import db, gaji, kinerja, master_warung
+
+KOLOM = ["tanggal", "warung", "jumlah_kirim", "jumlah_terjual", "harga_satuan"]
+SQL_INSERT = (
+    "INSERT INTO kirim (tanggal, warung, warung_id, jumlah_kirim, jumlah_terjual, harga_satuan, user)"
+    " VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+SALAH_TANGGAL = "Tanggal tidak valid."
+SALAH_WARUNG = "Nama warung wajib diisi."
+SALAH_ANGKA = "Jumlah dan harga harus bilangan bulat tidak negatif."
+SALAH_TERJUAL = "Jumlah terjual tidak boleh lebih besar dari jumlah kirim."
+SALAH_BESAR = "Jumlah dan harga terlalu besar."
+MAKS_INTEGER = 2**63 - 1  # batas INTEGER SQLite
+
+
+def validasi(warung, jumlah_kirim, jumlah_terjual):
+    """Pesan kesalahan untuk satu baris, atau None jika valid."""
+    if not warung or not str(warung).strip():
+        return SALAH_WARUNG
+    if jumlah_terjual > jumlah_kirim:
+        return SALAH_TERJUAL
+    return None
+
+
+def validasi_baris(data, tanggal_default=None):
+    """Validasi satu baris berbentuk dict (mis. dari JSON).
+
+    Mengembalikan (baris, None) dengan baris berurutan seperti KOLOM, atau
+    (None, pesan kesalahan). Tanggal berformat ISO; kosong berarti
+    ``tanggal_default`` (hari ini).
+    """
+    if not isinstance(data, dict):
+        return None, "Baris harus berupa objek."
+    try:
+        tanggal = date.fromisoformat(data["tanggal"]) if data.get("tanggal") else tanggal_default or date.today()
+    except (TypeError, ValueError):
+        return None, SALAH_TANGGAL
+    pesan = gaji.cek_periode(tanggal)
+    if pesan:
+        return None, pesan
+    warung = data.get("warung")
+    if not isinstance(warung, str) or not warung.strip():
+        return None, SALAH_WARUNG
+    angka = [data.get(k) for k in KOLOM[2:]]
+    # bool adalah subclass int; True/False bukan jumlah yang sah.
+    if any(isinstance(v, bool) or not isinstance(v, int) or v < 0 for v in angka):
+        return None, SALAH_ANGKA
+    if any(v > MAKS_INTEGER for v in angka):
+        return None, SALAH_BESAR
+    pesan = validasi(warung, angka[0], angka[1])
+    if pesan:
+        return None, pesan
+    return (tanggal, warung.strip(), *angka), None
+
+
+def simpan(tanggal, warung, jumlah_kirim, jumlah_terjual, harga_satuan, user):
+    simpan_banyak([(tanggal, warung, jumlah_kirim, jumlah_terjual, harga_satuan, user)])
+
+
+@kinerja.ukur("pengiriman.simpan_banyak")
+def simpan_banyak(rows):
+    """Simpan banyak baris dalam satu transaksi.
+
+    Setiap baris berurutan (tanggal, warung, jumlah_kirim, jumlah_terjual,
+    harga_satuan, user); nama warung dipetakan ke master warung.
+    """
+    cache = {}
+    with db.get_pool().transaction() as conn:
+        baris = []
+        for tanggal, warung, *sisa in rows:
+            wid, nama = master_warung.id_untuk(conn, warung, cache)
+            baris.append((tanggal, nama, wid, *sisa))
+        conn.executemany(SQL_INSERT, baris)
+    return len(rows)
+
+
+# === INPUT BATCH ===
+
+def validasi_batch(df, tanggal_default=None):
+    """Validasi DataFrame input batch secara vektor.
+
+    Mengembalikan (valid, ditolak); ``ditolak`` punya kolom tambahan
+    ``alasan``. Tanggal kosong diisi ``tanggal_default`` (hari ini).
+    """
+    import numpy as np
+    import pandas as pd
+
+    df = df.reindex(columns=KOLOM).dropna(how="all").copy()
+    tanggal = pd.to_datetime(df["tanggal"], errors="coerce")
+    tanggal = tanggal.where(df["tanggal"].notna(), pd.Timestamp(tanggal_default or date.today()))
+    warung = df["warung"].fillna("").astype(str).str.strip()
+    angka = df[KOLOM[2:]].apply(pd.to_numeric, errors="coerce")
+
+    angka_salah = angka.isna().any(axis=1) | (angka < 0).any(axis=1) | (angka % 1 != 0).any(axis=1)
+    # Periode gaji yang sudah ditutup tidak menerima pengiriman baru.
+    awal = gaji.awal_periode_terbuka()
+    tutup = tanggal < pd.Timestamp(awal) if awal else pd.Series(False, index=df.index)
+    pesan_tutup = tanggal.dt.strftime("%Y-%m").map(gaji.PERIODE_TUTUP.format, na_action="ignore")
+    alasan = np.select(
+        [tanggal.isna(),
+         tutup,
+         warung == "",
+         angka_salah,
+         (angka >= MAKS_INTEGER).any(axis=1),
+         angka["jumlah_terjual"] > angka["jumlah_kirim"]],
+        [SALAH_TANGGAL, pesan_tutup, SALAH_WARUNG, SALAH_ANGKA, SALAH_BESAR, SALAH_TERJUAL],
+        default="")
+
+    df["tanggal"] = tanggal.dt.date
+    df["warung"] = warung
+    df[KOLOM[2:]] = angka
+    ok = alasan == ""
+    valid = df[ok].astype({k: "int64" for k in KOLOM[2:]})
+    ditolak = df[~ok].assign(alasan=alasan[~ok])
+    return valid, ditolak
+
+
+def simpan_batch(valid, user):
+    """Simpan hasil validasi_batch dengan executemany dalam satu transaksi."""
+    rows = list(zip(
+        valid["tanggal"].tolist(),
+        valid["warung"].tolist(),
+        valid["jumlah_kirim"].tolist(),
+        valid["jumlah_terjual"].tolist(),
+        valid["harga_satuan"].tolist(),
+        [user] * len(valid),
+    ))
+    return simpan_banyak(rows) if rows else 0
+
+
+def baca_unggahan(file):
+    """DataFrame dari file CSV/XLSX yang diunggah (kolom seperti KOLOM)."""
+    import pandas as pd
+
+    if file.name.lower().endswith(".xlsx"):
+        df = pd.read_excel(file)
+    else:
+        df = pd.read_csv(file)
+    df.columns = [str(k).strip().lower().replace(" ", "_") for k in df.columns]
+    return df
+
+
+def tampilkan_batch(user):
+    """Mode batch menu "Kirim ke Warung": grid + unggah CSV/XLSX."""
+    import pandas as pd
+    import streamlit as st
+
+    tgl = st.date_input("Tanggal (untuk baris tanpa tanggal)", date.today(), key="batch_tanggal")
+    unggahan = st.file_uploader("Unggah daftar (CSV/XLSX)", type=["csv", "xlsx"])
+    if unggahan is not None:
+        try:
+            awal = baca_unggahan(unggahan).reindex(columns=KOLOM)
+        except Exception as e:
+            st.error(f"File tidak bisa dibaca: {e}")
+            return
+    else:
+        awal = pd.DataFrame(columns=KOLOM)
+    # Samakan tipe kolom dengan column_config grid di bawah.
+    awal["tanggal"] = pd.to_datetime(awal["tanggal"], errors="coerce").dt.date
+    awal["warung"] = awal["warung"].astype("string")
+    awal[KOLOM[2:]] = awal[KOLOM[2:]].apply(pd.to_numeric, errors="coerce")
+
+    data = st.data_editor(
+        awal,
+        num_rows="dynamic",
+        width="stretch",
+        key=f"batch_grid_{unggahan.file_id if unggahan is not None else 'kosong'}_"
+            f"{st.session_state.get('batch_versi', 0)}",
+        column_config={
+            "tanggal": st.column_config.DateColumn("Tanggal"),
+            "warung": st.column_config.TextColumn("Nama Warung"),
+            "jumlah_kirim": st.column_config.NumberColumn("Jumlah Dikirim", min_value=0, step=1),
+            "jumlah_terjual": st.column_config.NumberColumn("Jumlah Terjual", min_value=0, step=1),
+            "harga_satuan": st.column_config.NumberColumn("Harga Satuan (Rp)", min_value=0, step=1),
+        },
+    )
+    if st.button("Simpan Semua"):
+        valid, ditolak = validasi_batch(data, tgl)
+        if not len(valid) and not len(ditolak):
+            st.warning("Belum ada baris untuk disimpan.")
+            return
+        jumlah = simpan_batch(valid, user)
+        if jumlah:
+            # Kosongkan grid pada rerun berikutnya agar tidak tersimpan dua kali.
+            st.session_state.batch_versi = st.session_state.get("batch_versi", 0) + 1
+            st.success(f"{jumlah} baris disimpan!")
+        if len(ditolak):
+            st.warning(f"{len(ditolak)} baris ditolak:")
+            st.dataframe(ditolak)
@@ -0,0 +1,257 @@
+"""Ramalan permintaan per warung dan saran jumlah kirim.
+
+Model tiap warung: level permintaan per kunjungan x faktor hari (Senin ..
+Minggu), diperbarui dengan exponential smoothing pada setiap hari kunjungan,
+plus rata-rata galat absolut untuk stok pengaman. Semua warung diperbarui
+bersama sebagai array numpy; loop hanya berjalan per hari, bukan per warung.
+Kunjungan yang habis terjual (terjual == kirim) berarti permintaan bisa lebih
+besar, jadi observasinya tidak boleh menurunkan ramalan.
+
+Status model disimpan di tabel ``ramalan`` dan ``ramalan_status.sampai``
+mencatat hari terakhir yang sudah masuk. fit() hanya memproses hari sesudah
+itu, dan halaman hanya membaca status tersimpan (fit inkremental untuk hari
+yang tertinggal, tidak pernah fit penuh). ``ramalan_status`` juga mencatat
+ID kirim dan kirim_log terakhir yang sudah dibaca; baris baru atau koreksi
+untuk hari yang sudah masuk (sinkron terlambat, entri mundur tanggal, ubah
+atau hapus) membuat warung yang tersentuh dihitung ulang dari seluruh
+riwayatnya. Model tiap warung saling lepas, jadi warung lain tetap inkremental.
+
+    python -m dhn.ramalan fit            # tambahkan hari yang belum diproses
+    python -m dhn.ramalan fit --penuh    # hitung ulang dari seluruh riwayat
+    python -m dhn.ramalan saran --tanggal 2025-01-06
+"""
+import argparse
+import json
+import math
+import threading
+from datetime import date, datetime, timedelta
+
+from dhn import db, kinerja, master_warung
+
+ALFA = 0.2  # bobot level
+GAMMA = 0.1  # bobot faktor hari
+BETA = 0.1  # bobot galat
+Z_LAYANAN = 0.67  # stok pengaman: ~75% kunjungan tidak kehabisan
+KELIPATAN = 5  # kerupuk dikirim per bal isi 5
+MIN_KUNJUNGAN = 4  # kunjungan minimal sebelum saran ditampilkan
+
+SQL_HARIAN = """
+    SELECT tanggal, warung_id, SUM(jumlah_kirim) AS kirim, SUM(jumlah_terjual) AS terjual
+    FROM rekap_harian
+    WHERE tanggal > ? AND tanggal < ? AND warung_id != 0{filter_warung}
+    GROUP BY tanggal, warung_id
+    ORDER BY tanggal
+"""
+# Warung dengan baris (atau koreksi) sesudah watermark pada hari yang sudah di-fit.
+SQL_TERSENTUH = """
+    SELECT warung_id FROM kirim WHERE id > ? AND tanggal <= ?
+    UNION
+    SELECT k.warung_id FROM kirim_log AS l JOIN kirim AS k ON k.id = l.kirim_id
+    WHERE l.id > ? AND k.tanggal <= ?
+"""
+SQL_SIMPAN = "INSERT OR REPLACE INTO ramalan (warung_id, level, galat, musim, n, terakhir) VALUES (?, ?, ?, ?, ?, ?)"
+
+_lock_fit = threading.Lock()
+
+
+def _status(conn):
+    """(sampai, id kirim, id kirim_log) yang sudah masuk model."""
+    return conn.execute("SELECT sampai, kirim_id, log_id FROM ramalan_status").fetchone()
+
+
+def _hari_berikut(tanggal):
+    return (date.fromisoformat(tanggal) + timedelta(days=1)).isoformat()
+
+
+def _muat(conn):
+    """Status tersimpan sebagai {warung_id: (level, galat, musim, n, terakhir)}."""
+    return {wid: (level, galat, json.loads(musim), n, terakhir)
+            for wid, level, galat, musim, n, terakhir in conn.execute("SELECT * FROM ramalan")}
+
+
+def perbarui(status, harian):
+    """Terapkan observasi harian ke status; kembalikan status baru.
+
+    ``harian``: DataFrame (tanggal, warung_id, kirim, terjual) urut tanggal.
+    """
+    import numpy as np
+    import pandas as pd
+
+    ids = sorted(set(status) | set(harian["warung_id"]))
+    n = len(ids)
+    L = np.full(n, np.nan)
+    G = np.zeros(n)
+    S = np.ones((n, 7))
+    N = np.zeros(n, dtype=np.int64)
+    T = np.empty(n, dtype=object)
+    for i, wid in enumerate(ids):
+        if wid in status:
+            L[i], G[i], S[i], N[i], T[i] = status[wid]
+
+    kirim = harian.pivot(index="tanggal", columns="warung_id", values="kirim").reindex(columns=ids)
+    terjual = harian.pivot(index="tanggal", columns="warung_id", values="terjual").reindex(columns=ids)
+    hari = pd.to_datetime(kirim.index, format="ISO8601").dayofweek
+    K, Y = kirim.to_numpy(float), terjual.to_numpy(float)
+    for t, tanggal in enumerate(kirim.index):
+        ada = ~np.isnan(Y[t])
+        d = hari[t]
+        baru = ada & np.isnan(L)
+        L[baru] = Y[t, baru]
+        G[baru] = 0.25 * Y[t, baru]
+        lama = ada & ~baru
+        s = S[lama, d]
+        ramal = L[lama] * s
+        y = Y[t, lama]
+        y = np.where(y >= K[t, lama], np.maximum(y, ramal), y)  # habis: permintaan >= kirim
+        G[lama] = BETA * np.abs(y - ramal) + (1 - BETA) * G[lama]
+        level = ALFA * y / s + (1 - ALFA) * L[lama]
+        s = np.where(level > 0, GAMMA * y / np.where(level > 0, level, 1) + (1 - GAMMA) * s, s)
+        musim = S[lama]
+        musim[:, d] = s
+        # Faktor hari dijaga rata-rata 1; level menampung skalanya.
+        rata = musim.mean(axis=1)
+        S[lama] = musim / rata[:, None]
+        L[lama] = level * rata
+        N[ada] += 1
+        T[ada] = tanggal
+    return {wid: (float(L[i]), float(G[i]), S[i].tolist(), int(N[i]), T[i])
+            for i, wid in enumerate(ids) if N[i]}
+
+
+@kinerja.ukur("ramalan.fit")
+def fit(penuh=False, hari_ini=None):
+    """Masukkan hari lengkap (sebelum ``hari_ini``) yang belum diproses.
+
+    Warung yang datanya berubah pada hari yang sudah masuk dihitung ulang
+    dari awal. Mengembalikan jumlah hari kunjungan yang diproses. Data
+    dibaca dan dihitung di luar transaksi tulis; jika proses lain sudah
+    memperbarui status lebih dulu, hasil ini dibuang.
+    """
+    import pandas as pd
+
+    hari_ini = hari_ini or date.today()
+    kemarin = (hari_ini - timedelta(days=1)).isoformat()
+    pool = db.get_pool()
+    with pool.connection() as conn:
+        conn.execute("BEGIN")
+        awal = _status(conn)
+        dari, id_kirim, id_log = awal
+        penuh = penuh or dari is None
+        maks_kirim = conn.execute("SELECT COALESCE(MAX(id), 0) FROM kirim").fetchone()[0]
+        maks_log = conn.execute("SELECT COALESCE(MAX(id), 0) FROM kirim_log").fetchone()[0]
+        ulang = set() if penuh else {wid for (wid,) in conn.execute(
+            SQL_TERSENTUH, (id_kirim, dari, id_log, dari)) if wid}
+        if not penuh and not ulang and dari >= kemarin:
+            return 0
+        sampai = kemarin if penuh else max(kemarin, dari)
+        status = {} if penuh else {wid: s for wid, s in _muat(conn).items() if wid not in ulang}
+        harian = pd.read_sql_query(SQL_HARIAN.format(filter_warung=""), conn,
+                                   params=("" if penuh else dari, hari_ini))
+        if ulang:
+            filter_warung = f" AND warung_id IN ({', '.join('?' * len(ulang))})"
+            riwayat = pd.read_sql_query(SQL_HARIAN.format(filter_warung=filter_warung), conn,
+                                        params=("", _hari_berikut(sampai), *ulang))
+            harian = pd.concat([riwayat, harian[~harian["warung_id"].isin(ulang)]], ignore_index=True)
+            harian = harian.sort_values("tanggal", kind="stable", ignore_index=True)
+        conn.execute("COMMIT")
+    baru = perbarui(status, harian)
+    with pool.transaction() as conn:
+        if not penuh and _status(conn) != awal:
+            return 0
+        if penuh:
+            conn.execute("DELETE FROM ramalan")
+        # Warung yang dihitung ulang bisa tidak punya kunjungan lagi (semua dihapus).
+        conn.executemany("DELETE FROM ramalan WHERE warung_id = ?", [(wid,) for wid in ulang])
+        conn.executemany(SQL_SIMPAN, [(wid, level, galat, json.dumps(musim), n, terakhir)
+                                      for wid, (level, galat, musim, n, terakhir) in baru.items()
+                                      if penuh or status.get(wid, (0,) * 5)[3] != n])
+        conn.execute("UPDATE ramalan_status SET sampai = ?, kirim_id = ?, log_id = ?, diperbarui = ?",
+                     (sampai, maks_kirim, maks_log, datetime.now().isoformat(" ", "seconds")))
+    return harian["tanggal"].nunique()
+
+
+def fit_jika_perlu():
+    """Fit inkremental bila status tertinggal; tidak pernah fit penuh.
+
+    Mengembalikan False jika model belum pernah dilatih (jalankan
+    ``python -m dhn.ramalan fit``).
+    """
+    sampai = db.fetchone("SELECT sampai FROM ramalan_status", cache=True)[0]
+    if sampai is None:
+        return False
+    kemarin = (date.today() - timedelta(days=1)).isoformat()
+    if sampai < kemarin and _lock_fit.acquire(blocking=False):
+        try:
+            fit()
+        finally:
+            _lock_fit.release()
+    return True
+
+
+# === SARAN ===
+
+def _normal(z):
+    return math.exp(-z * z / 2) / math.sqrt(2 * math.pi), (1 + math.erf(z / math.sqrt(2))) / 2
+
+
+def tidak_laku(kirim, perkiraan, sigma):
+    """Perkiraan sisa tidak laku E[max(kirim - permintaan, 0)], permintaan ~ Normal."""
+    if sigma <= 0:
+        return max(kirim - perkiraan, 0.0)
+    z = (kirim - perkiraan) / sigma
+    pdf, cdf = _normal(z)
+    return sigma * (z * cdf + pdf)
+
+
+def saran(warung_id, tanggal):
+    """Saran kirim untuk satu warung, atau None bila data kunjungan kurang.
+
+    Dict berisi ``perkiraan`` (terjual), ``sigma``, ``kirim`` (dibulatkan ke
+    atas ke KELIPATAN) dan ``tidak_laku`` untuk jumlah saran itu.
+    """
+    row = db.fetchone("SELECT level, galat, musim, n FROM ramalan WHERE warung_id = ?", (warung_id,),
+                      cache=True)
+    if row is None or row[3] < MIN_KUNJUNGAN:
+        return None
+    level, galat, musim, _ = row
+    perkiraan = level * json.loads(musim)[tanggal.weekday()]
+    sigma = max(1.25 * galat, 1.0)  # galat absolut rata-rata -> simpangan baku
+    kirim = KELIPATAN * math.ceil((perkiraan + Z_LAYANAN * sigma) / KELIPATAN)
+    return {"perkiraan": perkiraan, "sigma": sigma, "kirim": kirim,
+            "tidak_laku": tidak_laku(kirim, perkiraan, sigma)}
+
+
+def saran_untuk_nama(nama, tanggal):
+    """saran() untuk nama warung yang sudah ada di master; None jika tidak ada."""
+    kunci = master_warung.normalisasi(nama or "")
+    if not kunci:
+        return None
+    row = db.fetchone("SELECT id FROM warung WHERE kunci = ?", (kunci,), cache=True)
+    return saran(row[0], tanggal) if row else None
+
+
+# === CLI ===
+
+def main():
+    parser = argparse.ArgumentParser(description="Ramalan permintaan dan saran kirim per warung.")
+    parser.add_argument("perintah", choices=["fit", "saran"])
+    parser.add_argument("--db", default=None, help="path database (default: kerupuk.db)")
+    parser.add_argument("--penuh", action="store_true", help="fit ulang dari seluruh riwayat")
+    parser.add_argument("--tanggal", type=date.fromisoformat, default=date.today())
+    args = parser.parse_args()
+
+    if args.db:
+        db.DB_PATH = args.db
+    if args.perintah == "fit":
+        hari = fit(penuh=args.penuh)
+        print(f"{hari} hari diproses; model sampai {db.fetchone('SELECT sampai FROM ramalan_status')[0]}")
+        return
+    print(f"{'warung':<28} {'perkiraan':>9} {'saran':>6} {'tidak laku':>10}")
+    for wid, nama in db.fetchall("SELECT id, nama FROM warung ORDER BY nama"):
+        s = saran(wid, args.tanggal)
+        if s:
+            print(f"{nama:<28} {s['perkiraan']:>9.1f} {s['kirim']:>6} {s['tidak_laku']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
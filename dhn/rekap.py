@@ -0,0 +1,139 @@
+"""Tabel rekap (rollup) pendapatan yang dijaga trigger pada tabel kirim.
+
+``rekap_harian`` berkunci (tanggal, user, warung_id) dan ``rekap_bulanan``
+berkunci (bulan, user). Trigger di migrasi dhn.db memperbaruinya di dalam
+transaksi yang sama dengan setiap INSERT/UPDATE/DELETE pada kirim, jadi
+halaman cukup membaca total dari sini tanpa SUM atas seluruh riwayat.
+
+    python -m dhn.rekap verify    # bandingkan rekap dengan hitung ulang penuh
+    python -m dhn.rekap rebuild   # hitung ulang rekap dari tabel kirim
+"""
+import argparse
+import sys
+
+from dhn import db, master_warung
+
+# User NULL (data lama dari kerupuk.py) disimpan sebagai '' dan warung
+# tanpa ID sebagai 0 di kunci rekap.
+_HITUNG_HARIAN = """
+    SELECT tanggal, COALESCE(user, '') AS user, COALESCE(warung_id, 0) AS warung_id,
+           SUM(COALESCE(jumlah_kirim, 0)) AS jumlah_kirim,
+           SUM(COALESCE(jumlah_terjual, 0)) AS jumlah_terjual,
+           SUM(COALESCE(jumlah_terjual, 0) * COALESCE(harga_satuan, 0)) AS pendapatan,
+           COUNT(*) AS jumlah_baris
+    FROM {sumber}
+    GROUP BY 1, 2, 3
+"""
+_HITUNG_BULANAN = """
+    SELECT substr(tanggal, 1, 7) AS bulan, user,
+           SUM(jumlah_kirim), SUM(jumlah_terjual), SUM(pendapatan), SUM(jumlah_baris)
+    FROM rekap_harian
+    GROUP BY 1, 2
+"""
+
+
+def rebuild(conn, sumber="kirim_aktif"):
+    """Isi ulang kedua tabel rekap dari kirim (dipanggil di dalam transaksi).
+
+    ``sumber`` hanya diganti oleh migrasi yang berjalan sebelum view
+    kirim_aktif ada.
+    """
+    conn.execute("DELETE FROM rekap_harian")
+    conn.execute("DELETE FROM rekap_bulanan")
+    conn.execute("INSERT INTO rekap_harian " + _HITUNG_HARIAN.format(sumber=sumber))
+    conn.execute("INSERT INTO rekap_bulanan " + _HITUNG_BULANAN)
+
+
+def verify(conn):
+    """Daftar selisih antara rekap tersimpan dan hitung ulang penuh."""
+    selisih = []
+    harian = _HITUNG_HARIAN.format(sumber="kirim_aktif")
+    for tabel, hitung, kunci in (
+        ("rekap_harian", harian, "tanggal, user, warung_id"),
+        ("rekap_bulanan", _HITUNG_BULANAN.replace("FROM rekap_harian", f"FROM ({harian})"),
+         "bulan, user"),
+    ):
+        kolom = kunci + ", jumlah_kirim, jumlah_terjual, pendapatan, jumlah_baris"
+        for arah, sql in (
+            ("hilang", f"SELECT * FROM ({hitung}) EXCEPT SELECT {kolom} FROM {tabel}"),
+            ("lebih", f"SELECT {kolom} FROM {tabel} EXCEPT SELECT * FROM ({hitung})"),
+        ):
+            selisih += [(tabel, arah, row) for row in conn.execute(sql)]
+    return selisih
+
+
+# === BACA TOTAL DARI REKAP ===
+
+def ringkasan(user=None, warung=None):
+    """(jumlah baris kirim, total pendapatan) untuk filter Rekap Penjualan."""
+    query = "SELECT COALESCE(SUM(jumlah_baris), 0), COALESCE(SUM(pendapatan), 0) FROM rekap_harian"
+    kondisi, params = [], []
+    if user is not None:
+        kondisi.append("user = ?")
+        params.append(user)
+    if warung:
+        sql, p = master_warung.filter_sql(warung)
+        kondisi.append(sql)
+        params += p
+    if kondisi:
+        query += " WHERE " + " AND ".join(kondisi)
+    return db.fetchone(query, params, cache=True)
+
+
+def total_pendapatan(user=None, warung=None):
+    return ringkasan(user, warung)[1]
+
+
+def daftar_user():
+    return [row[0] for row in db.fetchall(
+        "SELECT DISTINCT user FROM rekap_bulanan WHERE user != '' ORDER BY user", cache=True)]
+
+
+def pendapatan_per_warung(tanggal, user=None):
+    # Dikelompokkan per warung_id; nama hanya digabung untuk label grafik.
+    query = """
+        SELECT COALESCE(w.nama, '') AS warung, r.Pendapatan
+        FROM (SELECT warung_id, SUM(pendapatan) AS Pendapatan
+              FROM rekap_harian WHERE tanggal = ?{filter_user}
+              GROUP BY warung_id) AS r
+        LEFT JOIN warung AS w ON w.id = r.warung_id
+        ORDER BY warung
+    """
+    params = [tanggal]
+    if user is not None:
+        params.append(user)
+    return db.read_sql(query.format(filter_user=" AND user = ?" if user is not None else ""), params,
+                       cache=True)
+
+
+def total_bulanan(tahun, bulan, user=None):
+    query = "SELECT COALESCE(SUM(pendapatan), 0) FROM rekap_bulanan WHERE bulan = ?"
+    params = [f"{int(tahun):04}-{int(bulan):02}"]
+    if user is not None:
+        query += " AND user = ?"
+        params.append(user)
+    return db.fetchone(query, params, cache=True)[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild/verifikasi tabel rekap pendapatan.")
+    parser.add_argument("perintah", choices=["verify", "rebuild"])
+    parser.add_argument("--db", default=None, help="path database (default: kerupuk.db)")
+    args = parser.parse_args()
+
+    pool = db.get_pool(args.db)
+    if args.perintah == "rebuild":
+        with pool.transaction() as conn:
+            rebuild(conn)
+        print("Rekap dihitung ulang.")
+        return
+    with pool.connection() as conn:
+        selisih = verify(conn)
+    for tabel, arah, row in selisih[:50]:
+        print(f"{tabel} {arah}: {row}")
+    print("Rekap cocok dengan tabel kirim." if not selisih else f"{len(selisih)} selisih ditemukan.")
+    sys.exit(1 if selisih else 0)
+
+
+if __name__ == "__main__":
+    main()
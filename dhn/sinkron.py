@@ -0,0 +1,136 @@
+"""Sinkron offline-first untuk sopir yang mencatat pengiriman di lapangan.
+
+Klien (lihat dhn.klien_sinkron) menyimpan pengiriman di antrean lokal dengan
+UUID buatan klien, lalu mengirimnya per batch ke ``POST /sinkron`` (dhn.api).
+terapkan() menyimpan satu batch dalam satu transaksi; UUID yang sudah ada
+dilewati, jadi batch yang dikirim ulang setelah koneksi putus tidak pernah
+tersimpan dua kali. Kiriman ulang tidak mengubah baris yang sudah ada;
+perubahan tetap lewat dhn.koreksi supaya tercatat di log audit. Baris yang
+tanggalnya jatuh di periode gaji yang sudah ditutup ditolak, sama seperti
+input lain (gajinya sudah dibekukan).
+
+Setiap balasan membawa watermark server ``"<id kirim>:<id kirim_log>"``.
+tarik() hanya mengembalikan baris aktif milik user dengan ID di atas
+watermark dan baris yang diganti/dihapus sejak entri log di atas watermark,
+jadi klien cukup mengunduh perubahannya saja. Watermark yang lebih tua dari
+log yang sudah dipadatkan (dhn.koreksi.padatkan) tidak bisa dilanjutkan;
+balasan lalu bertanda ``ulang`` dan berisi tarikan penuh.
+"""
+import uuid as uuidlib
+
+from dhn import db, gaji, kinerja, master_warung, pengiriman
+
+MAKS_TARIK = 2000  # baris baru per balasan; sisanya ditandai "lagi"
+SQL_UPSERT = (
+    "INSERT INTO kirim (uuid, tanggal, warung, warung_id, jumlah_kirim, jumlah_terjual, harga_satuan, user)"
+    " VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (uuid) DO NOTHING"
+)
+SQL_TARIK = """
+    SELECT id, uuid, tanggal, warung, jumlah_kirim, jumlah_terjual, harga_satuan
+    FROM kirim
+    WHERE id > ? AND diganti IS NULL AND user = ?
+    ORDER BY id LIMIT ?
+"""
+SQL_DIHAPUS = """
+    SELECT k.id, k.uuid
+    FROM kirim_log AS l JOIN kirim AS k ON k.id = l.kirim_id
+    WHERE l.id > ? AND k.user = ?
+"""
+KOLOM_TARIK = ("id", "uuid", *pengiriman.KOLOM)
+SALAH_UUID = "uuid tidak valid."
+SALAH_WATERMARK = "Watermark tidak valid."
+
+
+def validasi(data):
+    """Validasi satu baris sinkron; (uuid, baris KOLOM atau None, pesan atau None).
+
+    ``uuid`` dinormalkan ke bentuk kanonik (huruf kecil dengan tanda hubung).
+    """
+    mentah = data.get("uuid") if isinstance(data, dict) else None
+    try:
+        kunci = str(uuidlib.UUID(mentah))
+    except (TypeError, ValueError, AttributeError):
+        return mentah, None, SALAH_UUID
+    row, pesan = pengiriman.validasi_baris(data)
+    return kunci, row, pesan
+
+
+def baca_watermark(teks):
+    """(id kirim, id log) dari watermark; None/"" berarti dari awal."""
+    if not teks:
+        return 0, 0
+    try:
+        kirim, log = (int(bagian) for bagian in str(teks).split(":"))
+    except ValueError:
+        raise ValueError(SALAH_WATERMARK) from None
+    if kirim < 0 or log < 0:
+        raise ValueError(SALAH_WATERMARK)
+    return kirim, log
+
+
+@kinerja.ukur("sinkron.terapkan")
+def terapkan(rows, user):
+    """Simpan baris ``(uuid, tanggal, warung, kirim, terjual, harga)`` dalam satu transaksi.
+
+    Mengembalikan (UUID yang sudah ada sebelumnya, [(uuid, pesan)] yang
+    ditolak karena periode gajinya sudah ditutup); sisanya tersimpan. UUID
+    yang sama dua kali dalam satu batch dihitung duplikat.
+    """
+    cache, baris, duplikat, ditolak, dilihat = {}, [], [], [], set()
+    with db.get_pool().transaction() as conn:
+        ada = set()
+        kunci = [row[0] for row in rows]
+        for awal in range(0, len(kunci), 500):
+            potong = kunci[awal:awal + 500]
+            ada.update(r[0] for r in conn.execute(
+                f"SELECT uuid FROM kirim WHERE uuid IN ({', '.join('?' * len(potong))})", potong))
+        for uuid, tanggal, warung, *sisa in rows:
+            if uuid in ada or uuid in dilihat:
+                duplikat.append(uuid)
+                continue
+            dilihat.add(uuid)
+            # Dicek lagi di dalam transaksi: periode bisa ditutup sesudah validasi.
+            pesan = gaji.cek_periode(tanggal, conn)
+            if pesan:
+                ditolak.append((uuid, pesan))
+                continue
+            wid, nama = master_warung.id_untuk(conn, warung, cache)
+            baris.append((uuid, tanggal, nama, wid, *sisa, user))
+        conn.executemany(SQL_UPSERT, baris)
+    return duplikat, ditolak
+
+
+@kinerja.ukur("sinkron.tarik")
+def tarik(user, watermark=None, batas=MAKS_TARIK):
+    """Perubahan baris milik ``user`` sesudah ``watermark``.
+
+    Dict berisi ``baru`` (baris aktif sebagai dict KOLOM_TARIK), ``dihapus``
+    ([{id, uuid}] yang sudah diganti atau dihapus), ``watermark`` baru,
+    ``lagi`` (masih ada baris baru; tarik lagi dengan watermark ini) dan
+    ``ulang`` (watermark kedaluwarsa; klien harus mengosongkan salinannya).
+    """
+    id_kirim, id_log = baca_watermark(watermark)
+    with db.get_pool().connection() as conn:
+        # Satu transaksi baca supaya MAX(id) cocok dengan baris yang dibaca.
+        conn.execute("BEGIN")
+        maks_kirim = conn.execute("SELECT COALESCE(MAX(id), 0) FROM kirim").fetchone()[0]
+        min_log, maks_log = conn.execute("SELECT MIN(id), COALESCE(MAX(id), 0) FROM kirim_log").fetchone()
+        # Entri log di bawah min_log sudah dipadatkan; penghapusan di sana
+        # tidak bisa dikirim lagi, jadi ulang dari awal.
+        ulang = bool(id_kirim or id_log) and min_log is not None and id_log < min_log - 1
+        if ulang:
+            id_kirim = id_log = 0
+        baru = conn.execute(SQL_TARIK, (id_kirim, user, batas + 1)).fetchall()
+        dihapus = [] if ulang else conn.execute(SQL_DIHAPUS, (id_log, user)).fetchall()
+        conn.execute("COMMIT")
+    lagi = len(baru) > batas
+    if lagi:
+        baru = baru[:batas]
+        maks_kirim = baru[-1][0]
+    return {
+        "baru": [dict(zip(KOLOM_TARIK, row)) for row in baru],
+        "dihapus": [{"id": id_, "uuid": uuid} for id_, uuid in dihapus],
+        "watermark": f"{maks_kirim}:{maks_log}",
+        "lagi": lagi,
+        "ulang": ulang,
+    }
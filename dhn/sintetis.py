@@ -0,0 +1,127 @@
+"""Pembuat kerupuk.db sintetis untuk uji skala dan benchmark.
+
+    python -m dhn.sintetis --db /tmp/kerupuk-uji.db --users 40 --warung 600 --tahun 3
+
+Pola datanya dibuat mendekati lapangan:
+- tiap warung dipegang satu sales, dan luas rute antar sales timpang (Pareto);
+- permintaan dasar warung lognormal;
+- warung dikunjungi tiap 1-3 hari;
+- penjualan naik di akhir pekan, bergelombang musiman dan tumbuh per tahun;
+- jumlah kirim dibulatkan ke kelipatan 5;
+- rasio terjual mengikuti Beta(8, 2);
+- harga satuan naik Rp500 setiap pergantian tahun.
+
+Semua user bisa login dengan password ``kerupuk``; ``admin`` adalah admin.
+Data dibuat sampai hari ini, jadi Dashboard dan laporan bulan berjalan terisi.
+"""
+import argparse
+import math
+import os
+import random
+import time
+from datetime import date, timedelta
+
+from dhn import auth, db, master_warung
+
+PASSWORD = "kerupuk"
+HARGA_AKHIR = 5000
+EFEK_HARI = (0.9, 0.95, 1.0, 1.0, 1.1, 1.25, 1.2)  # Senin .. Minggu
+_POLA = ("Warung {}", "Warung Bu {}", "Toko {}", "Kios Pak {}", "Warung Mak {}")
+_NAMA = ("Siti", "Ijah", "Aceng", "Dedi", "Euis", "Asep", "Yati", "Ujang", "Neneng", "Kokom",
+         "Dadang", "Imas", "Cucu", "Enok", "Odah", "Maman", "Iis", "Tati", "Ade", "Nining")
+
+
+def _warung(jumlah, users, rnd):
+    """[(nama, sales, permintaan dasar, selang kunjungan, hari mulai)]."""
+    bobot = [rnd.paretovariate(1.5) for _ in users]
+    hasil, kunci = [], set()
+    for i in range(jumlah):
+        nama = rnd.choice(_POLA).format(rnd.choice(_NAMA))
+        if master_warung.normalisasi(nama) in kunci:
+            nama = f"{nama} {i}"
+        kunci.add(master_warung.normalisasi(nama))
+        selang = rnd.choice((1, 1, 1, 2, 2, 3))
+        hasil.append((nama, rnd.choices(users, bobot)[0], rnd.lognormvariate(math.log(35), 0.5),
+                      selang, rnd.randrange(selang)))
+    return hasil
+
+
+def _baris_hari(tanggal, hari_ke, total_hari, warung, rnd):
+    sisa_tahun = (total_hari - 1 - hari_ke) // 365
+    harga = HARGA_AKHIR - 500 * sisa_tahun
+    faktor = (EFEK_HARI[tanggal.weekday()]
+              * (1 + 0.15 * math.sin(2 * math.pi * tanggal.timetuple().tm_yday / 365.25))
+              * 1.08 ** (-(total_hari - 1 - hari_ke) / 365))
+    for wid, (nama, user, dasar, selang, geser) in enumerate(warung, start=1):
+        if (hari_ke + geser) % selang:
+            continue
+        kirim = max(5, 5 * round(dasar * selang ** 0.5 * faktor * rnd.gauss(1, 0.15) / 5))
+        terjual = min(kirim, round(kirim * rnd.betavariate(8, 2)))
+        yield tanggal, nama, wid, kirim, terjual, harga, user
+
+
+def buat(path, users=20, warung=300, tahun=2, seed=42, sampai=None):
+    """Isi database baru di ``path``; kembalikan ringkasan jumlah data."""
+    rnd = random.Random(seed)
+    sampai = sampai or date.today()
+    total_hari = int(tahun * 365)
+    mulai = sampai - timedelta(days=total_hari - 1)
+    nama_user = [f"sales{i:02}" for i in range(1, users + 1)]
+    daftar_warung = _warung(warung, nama_user, rnd)
+
+    pool = db.Pool(path, size=1)
+    hashed = auth.hash_password(PASSWORD)  # satu hash dipakai semua user uji
+    baris = 0
+    try:
+        with pool.transaction() as conn:
+            conn.executemany("INSERT INTO users (username, password, is_admin) VALUES (?, ?, ?)",
+                             [("admin", hashed, 1)] + [(u, hashed, 0) for u in nama_user])
+            conn.executemany("INSERT INTO warung (id, nama, kunci) VALUES (?, ?, ?)",
+                             [(i, w[0], master_warung.normalisasi(w[0]))
+                              for i, w in enumerate(daftar_warung, start=1)])
+        # Satu transaksi per bulan data supaya WAL tidak membengkak.
+        hari_ke = 0
+        while hari_ke < total_hari:
+            bulan = (mulai + timedelta(days=hari_ke)).month
+            rows = []
+            while hari_ke < total_hari and (tanggal := mulai + timedelta(days=hari_ke)).month == bulan:
+                rows.extend(_baris_hari(tanggal, hari_ke, total_hari, daftar_warung, rnd))
+                hari_ke += 1
+            with pool.transaction() as conn:
+                conn.executemany(
+                    "INSERT INTO kirim (tanggal, warung, warung_id, jumlah_kirim, jumlah_terjual,"
+                    " harga_satuan, user) VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            baris += len(rows)
+        with pool.connection() as conn:
+            conn.execute("ANALYZE")
+    finally:
+        pool.close()
+    return {"users": users, "warung": warung, "hari": total_hari, "mulai": mulai.isoformat(),
+            "sampai": sampai.isoformat(), "baris": baris, "seed": seed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Buat kerupuk.db sintetis.")
+    parser.add_argument("--db", required=True, help="path database yang akan dibuat")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--warung", type=int, default=300)
+    parser.add_argument("--tahun", type=float, default=2)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--timpa", action="store_true", help="hapus database lama di path yang sama")
+    args = parser.parse_args()
+
+    if os.path.exists(args.db):
+        if not args.timpa:
+            parser.error(f"{args.db} sudah ada (pakai --timpa untuk mengganti)")
+        for akhiran in ("", "-wal", "-shm"):
+            if os.path.exists(args.db + akhiran):
+                os.remove(args.db + akhiran)
+    mulai = time.perf_counter()
+    info = buat(args.db, args.users, args.warung, args.tahun, args.seed)
+    print(f"{info['baris']:,} baris kirim ({info['mulai']} s/d {info['sampai']}), "
+          f"{info['users']} sales, {info['warung']} warung "
+          f"dalam {time.perf_counter() - mulai:.1f} detik -> {args.db}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Balasan API untuk body/header tidak valid (tidak boleh menggantung) dan sinkron ulang."""
+import http.client
+import json
+import threading
+
+import pytest
+
+from dhn import api, auth, db
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "kerupuk.db"))
+    auth.daftar("sales1", "rahasia", is_admin=False)
+    srv = api.Server(("127.0.0.1", 0))
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def kirim(server, path, body=b"", header=None):
+    """(status, json) untuk satu POST dengan header mentah."""
+    conn = http.client.HTTPConnection(*server.server_address, timeout=5)
+    conn.putrequest("POST", path)
+    for kunci, nilai in {"Content-Length": str(len(body)), **(header or {})}.items():
+        conn.putheader(kunci, nilai)
+    conn.endheaders(body)
+    resp = conn.getresponse()
+    hasil = resp.status, json.loads(resp.read())
+    conn.close()
+    return hasil
+
+
+def token(server):
+    return kirim(server, "/login", json.dumps({"username": "sales1", "password": "rahasia"}).encode())[1]["token"]
+
+
+@pytest.mark.parametrize("path", ["/login", "/kirim"])
+@pytest.mark.parametrize("body", [b"", b"null"])
+def test_body_kosong_atau_null(server, path, body):
+    status, hasil = kirim(server, path, body, {"Authorization": f"Bearer {token(server)}"})
+    assert status == 400 and hasil["error"]
+
+
+@pytest.mark.parametrize("panjang", ["abc", "-1"])
+def test_content_length_tidak_valid(server, panjang):
+    assert kirim(server, "/login", header={"Content-Length": panjang})[0] == 400
+
+
+def test_angka_di_luar_integer_sqlite(server):
+    body = json.dumps({"warung": "Warung Bu Sri", "jumlah_kirim": 10**30, "jumlah_terjual": 1,
+                       "harga_satuan": 5000}).encode()
+    status, hasil = kirim(server, "/kirim", body, {"Authorization": f"Bearer {token(server)}"})
+    assert status == 422
+    assert hasil["ditolak"][0]["alasan"] == "Jumlah dan harga terlalu besar."
+
+
+# === /sinkron ===
+
+def test_sinkron_ulang_tidak_menyimpan_dua_kali(server):
+    header = {"Authorization": f"Bearer {token(server)}"}
+    body = json.dumps({"watermark": None, "kirim": [
+        {"uuid": "8c1f0d8e-0000-4000-8000-000000000001", "tanggal": "2025-01-06", "warung": "Warung Bu Sri",
+         "jumlah_kirim": 50, "jumlah_terjual": 40, "harga_satuan": 5000}]}).encode()
+    status, pertama = kirim(server, "/sinkron", body, header)
+    assert status == 200 and (pertama["diterima"], pertama["duplikat"]) == (1, 0)
+    status, kedua = kirim(server, "/sinkron", body, header)
+    assert status == 200 and (kedua["diterima"], kedua["duplikat"]) == (0, 1)
+    assert db.fetchone("SELECT COUNT(*) FROM kirim")[0] == 1
+
+
+@pytest.mark.parametrize("body", [b"", b"null"])
+def test_sinkron_body_kosong_atau_null(server, body):
+    status, hasil = kirim(server, "/sinkron", body, {"Authorization": f"Bearer {token(server)}"})
+    assert status == 400 and hasil["error"]
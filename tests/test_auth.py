@@ -0,0 +1,17 @@
+"""Ganti password memakai aturan yang sama dengan daftar."""
+import pytest
+
+from dhn import auth, db
+
+
+@pytest.fixture(autouse=True)
+def db_sementara(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "kerupuk.db"))
+
+
+def test_password_baru_kosong_ditolak():
+    assert auth.daftar("sales1", "rahasia") is None
+    assert auth.ganti_password("sales1", "rahasia", "") == "Password baru wajib diisi."
+    assert auth.login("sales1", "rahasia")[0]
+    assert auth.ganti_password("sales1", "rahasia", "baru") is None
+    assert auth.login("sales1", "baru")[0]
@@ -0,0 +1,27 @@
+"""Ekspor Parquet bertahap dan pembersihan file ekspor lama."""
+import os
+import time
+
+import pytest
+
+from dhn import ekspor
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+def test_parquet_kolom_null_di_potongan_pertama(tmp_path):
+    # Data lama: user NULL di seluruh potongan pertama, terisi sesudahnya.
+    chunks = iter([["id", "user"], [(1, None), (2, None)], [(3, "sales1")]])
+    path = tmp_path / "kirim.parquet"
+    ekspor.tulis_parquet(chunks, path)
+    assert pq.read_table(path).to_pydict() == {"id": [1, 2, 3], "user": [None, None, "sales1"]}
+
+
+def test_file_lama_dihapus_saat_ekspor_baru(tmp_path, monkeypatch):
+    monkeypatch.setattr(ekspor, "EKSPOR_DIR", str(tmp_path))
+    lama, baru = tmp_path / "lama.csv", tmp_path / "baru.csv"
+    lama.write_text("x")
+    baru.write_text("x")
+    os.utime(lama, (time.time() - ekspor.UMUR_FILE - 1,) * 2)
+    path = ekspor._tulis_file(iter([["a"], [(1,)]]), "CSV")
+    assert not lama.exists() and baru.exists() and os.path.exists(path)
@@ -0,0 +1,61 @@
+"""Gaji Karyawan pada database kosong, periode tanpa penjualan dan periode tertutup."""
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+from dhn import db, gaji, pengiriman, sinkron
+
+
+@pytest.fixture(autouse=True)
+def db_sementara(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "kerupuk.db"))
+
+
+def _bulan_lalu(n):
+    awal = date.today().replace(day=1)
+    for _ in range(n):
+        awal = (awal - timedelta(days=1)).replace(day=1)
+    return awal
+
+
+def test_database_kosong():
+    ringkasan, harian = gaji.rekap_gaji()
+    assert ringkasan.empty and harian.empty
+    assert {"margin", "gaji"} <= set(harian.columns)
+    assert gaji.tutup_periode(gaji.periode_dari(_bulan_lalu(1))) is None
+
+
+def test_periode_terbuka_tanpa_penjualan():
+    dua_bulan_lalu = _bulan_lalu(2)
+    pengiriman.simpan(dua_bulan_lalu, "Warung Bu Sri", 50, 40, 5000, "sales1")
+    assert gaji.tutup_periode(gaji.periode_dari(dua_bulan_lalu)) is None
+
+    # Periode terbuka (bulan lalu dan bulan ini) belum ada penjualan.
+    ringkasan, harian = gaji.rekap_gaji()
+    assert harian.empty
+    assert ringkasan[["periode", "user", "total_terjual", "gaji", "status"]].values.tolist() == [
+        [gaji.periode_dari(dua_bulan_lalu), "sales1", 40, 40_000, "Ditutup"]]
+
+    # Bulan tanpa penjualan tetap bisa ditutup.
+    assert gaji.tutup_periode(gaji.periode_dari(_bulan_lalu(1))) is None
+    assert len(gaji.rekap_gaji()[0]) == 1
+
+
+def test_periode_tertutup_tidak_menerima_pengiriman_baru():
+    dua_bulan_lalu = _bulan_lalu(2)
+    pengiriman.simpan(dua_bulan_lalu, "Warung Bu Sri", 50, 40, 5000, "sales1")
+    assert gaji.tutup_periode(gaji.periode_dari(dua_bulan_lalu)) is None
+    pesan = gaji.PERIODE_TUTUP.format(gaji.periode_dari(dua_bulan_lalu))
+
+    baris = {"tanggal": dua_bulan_lalu.isoformat(), "warung": "Warung Bu Sri", "jumlah_kirim": 10,
+             "jumlah_terjual": 10, "harga_satuan": 5000}
+    assert pengiriman.validasi_baris(baris) == (None, pesan)
+    assert pengiriman.validasi_baris({**baris, "tanggal": _bulan_lalu(1).isoformat()})[1] is None
+
+    valid, ditolak = pengiriman.validasi_batch(pd.DataFrame([baris, {**baris, "tanggal": None}]))
+    assert ditolak["alasan"].tolist() == [pesan] and len(valid) == 1
+
+    uuid = "8c1f0d8e-0000-4000-8000-000000000001"
+    assert sinkron.terapkan([(uuid, *baris.values())], "sales1") == ([], [(uuid, pesan)])
+    assert db.fetchone("SELECT COUNT(*) FROM kirim")[0] == 1
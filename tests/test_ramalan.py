@@ -0,0 +1,63 @@
+"""Fit inkremental ramalan sesudah data hari yang sudah masuk berubah."""
+from datetime import date, timedelta
+
+import pytest
+
+from dhn import db, koreksi, pengiriman, ramalan
+
+HARI_INI = date(2025, 3, 1)
+
+
+@pytest.fixture(autouse=True)
+def db_sementara(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "kerupuk.db"))
+
+
+def _isi(hari=40):
+    mulai = HARI_INI - timedelta(days=hari)
+    pengiriman.simpan_banyak([
+        ((mulai + timedelta(days=i)).isoformat(), warung, 50, 20 + (i * 7 + j * 3) % 30, 5000, "sales1")
+        for i in range(hari) for j, warung in enumerate(["Warung Bu Sri", "Warung Pak Budi"])])
+
+
+def _model():
+    return db.fetchall("SELECT * FROM ramalan ORDER BY warung_id")
+
+
+def _sama_dengan_fit_penuh():
+    inkremental = _model()
+    ramalan.fit(penuh=True, hari_ini=HARI_INI)
+    return inkremental == _model()
+
+
+def test_tanpa_perubahan_tidak_diproses_lagi():
+    _isi()
+    assert ramalan.fit(hari_ini=HARI_INI) == 40
+    assert ramalan.fit(hari_ini=HARI_INI) == 0
+
+
+def test_baris_terlambat_dan_koreksi_ikut_masuk():
+    _isi()
+    ramalan.fit(hari_ini=HARI_INI)
+    lama = _model()
+
+    # Sinkron terlambat untuk hari yang sudah di-fit, lalu ubah dan hapus.
+    pengiriman.simpan_banyak([((HARI_INI - timedelta(days=10)).isoformat(), "Warung Bu Sri", 50, 50,
+                               5000, "sales1")])
+    ubah, hapus = (row[0] for row in db.fetchall(
+        "SELECT id FROM kirim_aktif WHERE warung = 'Warung Pak Budi' ORDER BY id LIMIT 2"))
+    koreksi.ubah(ubah, {"jumlah_terjual": 0}, "admin", is_admin=True)
+    koreksi.hapus(hapus, "admin", is_admin=True)
+
+    assert ramalan.fit(hari_ini=HARI_INI) > 0
+    assert _model() != lama
+    assert _sama_dengan_fit_penuh()
+
+
+def test_semua_kunjungan_warung_dihapus():
+    _isi(hari=3)
+    ramalan.fit(hari_ini=HARI_INI)
+    for (kirim_id,) in db.fetchall("SELECT id FROM kirim_aktif WHERE warung = 'Warung Pak Budi'"):
+        koreksi.hapus(kirim_id, "admin", is_admin=True)
+    ramalan.fit(hari_ini=HARI_INI)
+    assert [row[0] for row in _model()] == [db.fetchone("SELECT id FROM warung WHERE nama = 'Warung Bu Sri'")[0]]
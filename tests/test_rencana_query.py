@@ -0,0 +1,43 @@
+"""Query tanggal pada kirim_aktif harus memakai indeks idx_kirim_*, bukan full scan.
+
+Versi cepat dari ``benchmarks/bench_tanggal.py --check`` yang ikut jalan di
+test suite, pada database baru dan sesudah ANALYZE (tugas malam dhn.pekerja).
+"""
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from dhn import db, ekspor, pekerja, pengiriman
+
+AWAL, AKHIR = db.month_range(2024, 6)
+QUERY = {
+    "laporan bulanan (admin)": (ekspor.SQL_KIRIM + pekerja.WHERE_BULAN, (AWAL, AKHIR)),
+    "laporan bulanan (user)": (ekspor.SQL_KIRIM + pekerja.WHERE_BULAN + " AND user = ?",
+                               (AWAL, AKHIR, "sales1")),
+    "rentang tanggal": ("SELECT * FROM kirim_aktif WHERE tanggal >= ? AND tanggal < ?", (AWAL, AKHIR)),
+    "dashboard (user)": ("SELECT * FROM kirim_aktif WHERE tanggal = ? AND user = ?", (AWAL, "sales1")),
+    "rekap per warung": ("SELECT * FROM kirim_aktif WHERE warung_id = ? AND tanggal >= ?", (1, AWAL)),
+}
+
+
+@pytest.fixture(params=["baru", "analyze"])
+def conn(request, tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "kerupuk.db"))
+    if request.param == "analyze":
+        rnd = random.Random(0)
+        pengiriman.simpan_banyak([
+            ((date(2022, 1, 1) + timedelta(days=i // 20)).isoformat(), f"Warung {rnd.randrange(100)}",
+             50, rnd.randrange(51), 5000, f"sales{rnd.randrange(10)}") for i in range(20_000)])
+    with db.get_pool().connection() as conn:
+        if request.param == "analyze":
+            conn.execute("ANALYZE")
+        yield conn
+
+
+@pytest.mark.parametrize("nama", QUERY)
+def test_query_tanggal_memakai_indeks(conn, nama):
+    sql, params = QUERY[nama]
+    rencana = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+    assert any("INDEX idx_kirim_" in langkah for langkah in rencana), rencana
+    assert not any(langkah.startswith("SCAN kirim") for langkah in rencana), rencana